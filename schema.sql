@@ -116,10 +116,47 @@ CREATE TABLE IF NOT EXISTS email_notifications (
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Grant discovery metadata (one row per grant, written by the discovery integration)
+CREATE TABLE IF NOT EXISTS grant_metadata (
+    id BIGSERIAL PRIMARY KEY,
+    grant_id BIGINT REFERENCES grants(id) ON DELETE CASCADE,
+    tags JSONB,
+    relevance_score INTEGER,
+    urgency TEXT,
+    grant_type TEXT,
+    eligibility_text TEXT,
+    pdf_url TEXT,
+    estimated_eligibility TEXT,
+    recurrence TEXT,
+    discovery_date TIMESTAMP WITH TIME ZONE,
+    notes TEXT,
+    -- Hash of the normalized grant and metadata content last written; NULL once the grant is closed
+    content_hash TEXT,
+    -- Set when the grant disappears from its source, cleared if it comes back
+    closed_at TIMESTAMP WITH TIME ZONE,
+    UNIQUE (grant_id)
+);
+
+-- Grant discovery run summaries (one row per run, written by the discovery integration)
+CREATE TABLE IF NOT EXISTS discovery_reports (
+    id BIGSERIAL PRIMARY KEY,
+    discovery_date TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    total_grants INTEGER,
+    high_relevance_grants INTEGER,
+    urgent_grants INTEGER,
+    sources JSONB,
+    top_tags JSONB,
+    top_grants JSONB,
+    database_changes JSONB,
+    metrics JSONB
+);
+
 -- Create indexes for better query performance
 CREATE INDEX IF NOT EXISTS idx_grants_status ON grants(status);
 CREATE INDEX IF NOT EXISTS idx_grants_due_date ON grants(due_date);
 CREATE INDEX IF NOT EXISTS idx_grants_created_at ON grants(created_at);
+-- Natural key used as the conflict target for bulk discovery upserts
+CREATE UNIQUE INDEX IF NOT EXISTS idx_grants_name_funder ON grants(name, funder);
 CREATE INDEX IF NOT EXISTS idx_organization_profiles_user_id ON organization_profiles(user_id);
 CREATE INDEX IF NOT EXISTS idx_ai_responses_grant_id ON ai_responses(grant_id);
 CREATE INDEX IF NOT EXISTS idx_ai_responses_user_id ON ai_responses(user_id);
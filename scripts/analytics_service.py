@@ -2,22 +2,22 @@ import os
 import json
 from datetime import datetime, timedelta
 import asyncio
-from supabase import create_client, Client
 import pandas as pd
 import numpy as np
+from async_storage import AsyncStorage
+from storage_backends import create_storage
 
-# Initialize Supabase client
-supabase: Client = create_client(
-    os.getenv('SUPABASE_URL', ''),
-    os.getenv('SUPABASE_KEY', '')
-)
+# Initialize the storage client (Supabase, or the local SQLite database when GRANT_STORAGE=local)
+supabase = create_storage('SUPABASE_URL', 'SUPABASE_KEY')
+# The client is synchronous; requests run on a bounded thread pool so the metrics can be computed concurrently
+storage = AsyncStorage(supabase, int(os.getenv('ANALYTICS_DB_CONCURRENCY', '4')))
 
 class AnalyticsService:
     async def calculate_success_metrics(self):
         """Calculate success metrics for grants."""
         try:
             # Get all grants
-            response = await supabase.table('grants').select('*').execute()
+            response = await storage.execute(supabase.table('grants').select('*'))
             grants = response.data
 
             if not grants:
@@ -66,12 +66,12 @@ class AnalyticsService:
             valid_until = (datetime.utcnow() + timedelta(hours=24)).isoformat()
 
             # Update or insert metrics
-            await supabase.table('analytics_cache').upsert({
+            await storage.execute(supabase.table('analytics_cache').upsert({
                 'metric_name': 'grant_success_metrics',
                 'metric_value': metrics,
                 'calculation_date': datetime.utcnow().isoformat(),
                 'valid_until': valid_until
-            }).execute()
+            }, on_conflict='metric_name'))
 
         except Exception as e:
             print(f"Error calculating success metrics: {str(e)}")
@@ -81,10 +81,11 @@ class AnalyticsService:
         try:
             # Get activity logs for the past 30 days
             thirty_days_ago = (datetime.utcnow() - timedelta(days=30)).isoformat()
-            response = await supabase.table('activity_log') \
-                .select('*') \
-                .gte('created_at', thirty_days_ago) \
-                .execute()
+            response = await storage.execute(
+                supabase.table('activity_log')
+                .select('*')
+                .gte('created_at', thirty_days_ago)
+            )
 
             activities = response.data
 
@@ -115,12 +116,12 @@ class AnalyticsService:
 
             valid_until = (datetime.utcnow() + timedelta(hours=24)).isoformat()
 
-            await supabase.table('analytics_cache').upsert({
+            await storage.execute(supabase.table('analytics_cache').upsert({
                 'metric_name': 'activity_metrics',
                 'metric_value': metrics,
                 'calculation_date': datetime.utcnow().isoformat(),
                 'valid_until': valid_until
-            }).execute()
+            }, on_conflict='metric_name'))
 
         except Exception as e:
             print(f"Error calculating activity metrics: {str(e)}")
@@ -129,7 +130,7 @@ class AnalyticsService:
         """Calculate task-related metrics."""
         try:
             # Get all tasks
-            response = await supabase.table('tasks').select('*').execute()
+            response = await storage.execute(supabase.table('tasks').select('*'))
             tasks = response.data
 
             if not tasks:
@@ -171,12 +172,12 @@ class AnalyticsService:
 
             valid_until = (datetime.utcnow() + timedelta(hours=24)).isoformat()
 
-            await supabase.table('analytics_cache').upsert({
+            await storage.execute(supabase.table('analytics_cache').upsert({
                 'metric_name': 'task_metrics',
                 'metric_value': metrics,
                 'calculation_date': datetime.utcnow().isoformat(),
                 'valid_until': valid_until
-            }).execute()
+            }, on_conflict='metric_name'))
 
         except Exception as e:
             print(f"Error calculating task metrics: {str(e)}")
@@ -185,7 +186,7 @@ class AnalyticsService:
         """Calculate document-related metrics."""
         try:
             # Get all documents
-            response = await supabase.table('documents').select('*').execute()
+            response = await storage.execute(supabase.table('documents').select('*'))
             documents = response.data
 
             if not documents:
@@ -224,12 +225,12 @@ class AnalyticsService:
 
             valid_until = (datetime.utcnow() + timedelta(hours=24)).isoformat()
 
-            await supabase.table('analytics_cache').upsert({
+            await storage.execute(supabase.table('analytics_cache').upsert({
                 'metric_name': 'document_metrics',
                 'metric_value': metrics,
                 'calculation_date': datetime.utcnow().isoformat(),
                 'valid_until': valid_until
-            }).execute()
+            }, on_conflict='metric_name'))
 
         except Exception as e:
             print(f"Error calculating document metrics: {str(e)}")
@@ -240,11 +241,13 @@ async def main():
     
     while True:
         try:
-            # Calculate all metrics
-            await analytics_service.calculate_success_metrics()
-            await analytics_service.calculate_activity_metrics()
-            await analytics_service.calculate_task_metrics()
-            await analytics_service.calculate_document_metrics()
+            # Calculate all metrics; they read different tables, so their queries overlap
+            await asyncio.gather(
+                analytics_service.calculate_success_metrics(),
+                analytics_service.calculate_activity_metrics(),
+                analytics_service.calculate_task_metrics(),
+                analytics_service.calculate_document_metrics()
+            )
             
             # Wait for 1 hour before next calculation
             await asyncio.sleep(3600)
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Async Storage Access
+Runs blocking Supabase calls on a bounded thread pool so async services keep their event loop free and can
+overlap several database requests
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar('T')
+
+class AsyncStorage:
+    """Awaitable wrapper around the synchronous Supabase client, at most max_concurrency requests in flight.
+
+    Query builders do no I/O until .execute(), so build them as usual and await storage.execute(query):
+
+        grants = (await storage.execute(storage.table('grants').select('*'))).data
+    """
+
+    def __init__(self, client: Any, max_concurrency: int = 8, executor: Optional[ThreadPoolExecutor] = None):
+        self.client = client
+        self.max_concurrency = max(1, max_concurrency)
+        # One thread per permitted request, so a request never waits for a thread once it holds the semaphore
+        self.executor = executor or ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                                       thread_name_prefix="storage")
+        self.owns_executor = executor is None
+        self.semaphore: Optional[asyncio.Semaphore] = None
+
+    def table(self, name: str):
+        return self.client.table(name)
+
+    async def execute(self, query) -> Any:
+        """Execute a query builder off the event loop and return its response"""
+        return await self.run(query.execute)
+
+    async def run(self, function: Callable[..., T], *args) -> T:
+        """Run any blocking storage work (e.g. a multi-request batch write) in the pool"""
+        if self.semaphore is None:
+            # Created lazily so the semaphore binds to the loop that uses it (Python 3.8/3.9)
+            self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self.semaphore:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+
+    def close(self):
+        if self.owns_executor:
+            self.executor.shutdown(wait=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+Extraction Benchmark
+Times the extraction pipeline offline over the recorded fixture pages and synthetic large listings, and fails
+when extracted grants or peak memory differ from the stored baseline (timings too with --check-timing)
+"""
+
+import argparse
+import functools
+import gc
+import hashlib
+import json
+import logging
+import platform
+import random
+import re
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from check_parser_backends import FIXTURE_DIR, load_fixtures
+from crawl_frontier import CrawlRequest
+from grant_discovery_scraper import READ_CHUNK_BYTES, GrantDiscoveryScraper
+from grant_model import GRANT_FIELDS, Grant
+from html_backends import DEFAULT_BACKEND
+from streaming_extraction import etree
+
+BASELINE_PATH = FIXTURE_DIR.parent / "benchmark_baseline.json"
+DEFAULT_TOLERANCE = 0.25
+# Per-function means are only compared once a function has run often enough to be stable
+MIN_CALLS_COMPARED = 200
+# Urgency depends on today's date, so it is left out of the output digest
+DIGEST_FIELDS = [name for name in GRANT_FIELDS if name != "urgency"]
+
+# Scraper and parser-backend methods timed individually (inclusive of the calls they make)
+TIMED_SCRAPER_METHODS = [
+    "process_page", "extract_grants_from_grants_gov_au", "extract_grants_from_creative_gov_au",
+    "extract_grants_generic", "extract_fields", "extract_url", "extract_title_generic", "generate_tags",
+    "calculate_relevance_score", "calculate_urgency", "extract_links",
+]
+TIMED_PARSER_METHODS = ["parse", "find_all", "find", "get_text"]
+
+TOPICS = ["Documentary", "Screen Production", "Community Arts", "First Nations Storytelling", "Digital Games",
+          "Youth Media", "Regional Festivals", "Climate Resilience", "Social Enterprise", "Creative Industries"]
+STREAMS = ["Development Fund", "Production Grant", "Funding Round", "Program", "Fellowship", "Initiative"]
+ELIGIBILITY = ["Applicants must be Australian companies with a documentary credit.",
+               "Eligibility: not-for-profit organisations and community groups.",
+               "Who can apply: independent artists, collectives and First Nations storytellers.",
+               "Eligibility criteria: registered Australian business with fewer than 20 staff."]
+MONTHS = ["January", "March", "April", "June", "August", "September", "November"]
+
+def synthetic_item(rng: random.Random, index: int) -> Dict[str, str]:
+    """Deterministic listing content shared by the synthetic page layouts"""
+    return {
+        "title": f"{rng.choice(TOPICS)} {rng.choice(STREAMS)} {2025 + index % 3} #{index}",
+        "slug": f"opportunity-{index}",
+        "amount": f"${rng.randrange(5, 500) * 1000:,}",
+        "date": rng.choice([f"{rng.randint(1, 28)} {rng.choice(MONTHS)} 2025",
+                            f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/2025", "Rolling"]),
+        "summary": (f"Support for {rng.choice(TOPICS).lower()} projects with social impact and innovation. "
+                    f"Grants of up to {rng.choice(['$20,000', '$75,000', '$150,000'])} are available."),
+        "eligibility": rng.choice(ELIGIBILITY),
+    }
+
+def page_shell(title: str, body: str) -> str:
+    return (f'<!DOCTYPE html>\n<html lang="en">\n<head><meta charset="utf-8"><title>{title}</title></head>\n'
+            f'<body>\n<main>\n<h1>{title}</h1>\n{body}</main>\n</body>\n</html>\n')
+
+def grants_gov_listing(items: int, seed: int = 18) -> str:
+    rng = random.Random(seed)
+    cards = []
+    for index in range(items):
+        item = synthetic_item(rng, index)
+        cards.append(
+            f'<article class="opportunity-card">\n'
+            f'  <h3 class="go-title"><a href="/Go/Show?GoUuid={item["slug"]}">{item["title"]}</a></h3>\n'
+            f'  <p class="meta">GO ID: GO{7000 + index}</p>\n'
+            f'  <p>{item["summary"]} Total funding {item["amount"]}.</p>\n'
+            f'  <p>Close Date &amp; Time: {item["date"]}</p>\n'
+            f'  <p>{item["eligibility"]}</p>\n'
+            f'</article>\n')
+    return page_shell("Current Grant Opportunity List", '<div class="search-results">\n' + "".join(cards) + '</div>\n')
+
+def creative_listing(items: int, seed: int = 19) -> str:
+    rng = random.Random(seed)
+    cards = []
+    for index in range(items):
+        item = synthetic_item(rng, index)
+        cards.append(
+            f'<div class="funding-card">\n'
+            f'  <h2 class="card-title">{item["title"]}</h2>\n'
+            f'  <p>{item["summary"]}</p>\n'
+            f'  <p>Amount: {item["amount"]}. Closes {item["date"]}.</p>\n'
+            f'  <a class="card-link" href="/funding-opportunities/{item["slug"]}">Learn more</a>\n'
+            f'</div>\n')
+    return page_shell("Funding opportunities", '<div class="funding-grid">\n' + "".join(cards) + '</div>\n')
+
+def generic_listing(items: int, seed: int = 20) -> str:
+    rng = random.Random(seed)
+    rows = []
+    for index in range(items):
+        item = synthetic_item(rng, index)
+        rows.append(
+            f'<div class="list-item"><div><a href="/grants-and-funding/{item["slug"]}">{item["title"]} grant</a></div>\n'
+            f'  <p>{item["summary"]} {item["eligibility"]} Closes {item["date"]}.</p></div>\n')
+    return page_shell("Grants and funding", '<div class="list-items">\n' + "".join(rows) + '</div>\n')
+
+# Synthetic pages: name -> (source URL that routes to the extractor, builder, listing count)
+SYNTHETIC_PAGES: Dict[str, Tuple[str, Callable[[int], str], int]] = {
+    "synthetic_grants_gov_au_large": ("https://www.grants.gov.au/Go/List", grants_gov_listing, 1500),
+    "synthetic_creative_gov_au_large": ("https://creative.gov.au/funding-opportunities", creative_listing, 1500),
+    "synthetic_generic_large": ("https://nsw.gov.au/grants-and-funding", generic_listing, 2000),
+}
+
+def load_pages(include_synthetic: bool = True) -> List[Tuple[str, str, str, str]]:
+    """(name, suite, source URL, html) for every recorded fixture and synthetic page"""
+    pages = [(filename, "fixtures", url, (FIXTURE_DIR / filename).read_text(encoding='utf-8'))
+             for filename, url in load_fixtures().items()]
+    if include_synthetic:
+        for name, (url, builder, items) in SYNTHETIC_PAGES.items():
+            pages.append((name, "synthetic", url, builder(items)))
+    return pages
+
+def calibrate(rounds: int = 9) -> float:
+    """Seconds for a fixed pure-Python workload, used to normalise timings across machines"""
+    pattern = re.compile(r'\$[\d,]+|\d{1,2} \w+ \d{4}')
+    text = " ".join(f"Grant {i} worth ${i * 1000:,} closes {i % 28 + 1} March 2025" for i in range(2000))
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        counts: Dict[str, int] = {}
+        for match in pattern.findall(text * 5):
+            counts[match] = counts.get(match, 0) + 1
+        sorted(counts.items(), key=lambda kv: (kv[1], kv[0]))
+        "".join(word.lower() for word in text.split())
+        best = min(best, time.perf_counter() - start)
+    return best
+
+class FunctionTimer:
+    """Wraps methods on an object so each call's wall time is accumulated under its name"""
+
+    def __init__(self):
+        self.calls: Dict[str, int] = {}
+        self.seconds: Dict[str, float] = {}
+
+    def install(self, target, names: List[str], prefix: str = ""):
+        for name in names:
+            method = getattr(target, name, None)
+            if method is not None:
+                setattr(target, name, self.wrap(prefix + name, method))
+
+    def wrap(self, name: str, method: Callable) -> Callable:
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.seconds[name] = self.seconds.get(name, 0.0) + time.perf_counter() - start
+                self.calls[name] = self.calls.get(name, 0) + 1
+        return timed
+
+def extract_tree(scraper: GrantDiscoveryScraper, html: str, url: str) -> List[Grant]:
+    grants, _ = scraper.process_page(html, url, is_listing=True, collect_links=True)
+    return grants
+
+def extract_streamed(scraper: GrantDiscoveryScraper, html: str, url: str) -> List[Grant]:
+    """Feed the page through the incremental parser the way fetch_page does for very large bodies"""
+    streamer = scraper.page_streamer(CrawlRequest(url, depth=0))
+    for offset in range(0, len(html), READ_CHUNK_BYTES):
+        streamer.feed(html[offset:offset + READ_CHUNK_BYTES])
+    return streamer.finish().grants
+
+def output_digest(grants: List[Grant]) -> str:
+    """Hash of the extracted grants in order, so any change to extracted output is caught"""
+    # Tags come from a set, so their order varies between processes
+    rows = [[sorted(grant.tags) if name == "tags" else getattr(grant, name) for name in DIGEST_FIELDS]
+            for grant in grants]
+    return hashlib.sha256(json.dumps(rows, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+def time_page(extract: Callable, scraper: GrantDiscoveryScraper, html: str, url: str,
+              repeat: int) -> Tuple[List[Grant], float]:
+    """Extracted grants and best-of-repeat seconds for one page"""
+    best = float('inf')
+    grants: List[Grant] = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        grants = extract(scraper, html, url)
+        best = min(best, time.perf_counter() - start)
+    return grants, best
+
+def peak_memory(extract: Callable, scraper: GrantDiscoveryScraper, html: str, url: str) -> int:
+    """Peak bytes allocated by Python while extracting one page"""
+    tracemalloc.start()
+    try:
+        extract(scraper, html, url)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def run_benchmark(backend: str = DEFAULT_BACKEND, repeat: int = 3, include_synthetic: bool = True) -> Dict:
+    """Measure every page; timings are also reported divided by the calibration time"""
+    calibration = calibrate()
+    scraper = GrantDiscoveryScraper(parser_backend=backend)
+    modes = [("tree", extract_tree)]
+    if etree is not None:
+        modes.append(("stream", extract_streamed))
+
+    pages = {}
+    suites: Dict[str, Dict] = {}
+    for name, suite, url, html in load_pages(include_synthetic):
+        for mode, extract in modes:
+            if mode == "stream" and suite != "synthetic":
+                continue  # Only pages past stream_min_bytes are streamed in a real crawl
+            key = name if mode == "tree" else f"{name} [stream]"
+            grants, seconds = time_page(extract, scraper, html, url, repeat)
+            pages[key] = {
+                "suite": suite,
+                "bytes": len(html.encode('utf-8')),
+                "grants": len(grants),
+                "output_digest": output_digest(grants),
+                "seconds": round(seconds, 6),
+                "normalized": round(seconds / calibration, 4),
+                "peak_memory_bytes": peak_memory(extract, scraper, html, url),
+            }
+            totals = suites.setdefault(f"{suite}/{mode}", {"pages": 0, "grants": 0, "seconds": 0.0})
+            totals["pages"] += 1
+            totals["grants"] += len(grants)
+            totals["seconds"] += seconds
+
+    for totals in suites.values():
+        totals["pages_per_second"] = round(totals["pages"] / totals["seconds"], 2)
+        totals["grants_per_second"] = round(totals["grants"] / totals["seconds"], 2)
+        # Throughput per unit of calibration work, comparable between machines
+        totals["normalized_pages_per_second"] = round(totals["pages_per_second"] * calibration, 4)
+        totals["normalized_grants_per_second"] = round(totals["grants_per_second"] * calibration, 4)
+        totals["seconds"] = round(totals["seconds"], 6)
+
+    # Instrumented passes for per-function costs, kept apart from the throughput timings above;
+    # each function keeps its best total over the passes
+    calls: Dict[str, int] = {}
+    seconds: Dict[str, float] = {}
+    for _ in range(repeat):
+        timer = FunctionTimer()
+        instrumented = GrantDiscoveryScraper(parser_backend=backend)
+        timer.install(instrumented, TIMED_SCRAPER_METHODS)
+        timer.install(instrumented.parser, TIMED_PARSER_METHODS, prefix="parser.")
+        for name, suite, url, html in load_pages(include_synthetic):
+            extract_tree(instrumented, html, url)
+        calls = timer.calls
+        for name, total in timer.seconds.items():
+            seconds[name] = min(seconds.get(name, total), total)
+    functions = {
+        name: {
+            "calls": calls[name],
+            "total_seconds": round(seconds[name], 6),
+            "mean_microseconds": round(seconds[name] / calls[name] * 1e6, 3),
+            "normalized_mean": round(seconds[name] / calls[name] / calibration, 8),
+        }
+        for name in sorted(calls, key=lambda n: -seconds[n])
+    }
+
+    try:
+        import resource
+        max_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except ImportError:  # Not available on Windows
+        max_rss_kb = None
+
+    return {
+        "backend": backend,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "calibration_seconds": round(calibration, 6),
+        "suites": suites,
+        "pages": pages,
+        "functions": functions,
+        "max_rss_kb": max_rss_kb,
+    }
+
+def compare_output(result: Dict, baseline: Dict, tolerance: float = DEFAULT_TOLERANCE) -> Dict[str, str]:
+    """Grant count, output and peak memory differences against the baseline, keyed by check; empty when all pass.
+
+    These do not depend on machine load, so any difference is a real change.
+    """
+    differences = {}
+
+    for name, page in baseline.get("pages", {}).items():
+        current = result["pages"].get(name)
+        if current is None:
+            if any(suite.startswith(page["suite"] + "/") for suite in result["suites"]):
+                differences[f"{name}/missing"] = f"{name}: page missing from this run"
+            continue
+        if current["grants"] != page["grants"]:
+            differences[f"{name}/grants"] = f"{name}: extracted {current['grants']} grants, baseline {page['grants']}"
+        elif "output_digest" in page and current["output_digest"] != page["output_digest"]:
+            differences[f"{name}/output"] = f"{name}: extracted grants differ from the baseline output"
+        # tracemalloc counts Python allocations only, so this is stable between runs of the same Python
+        if current["peak_memory_bytes"] > page["peak_memory_bytes"] * (1 + tolerance):
+            differences[f"{name}/memory"] = (f"{name}: peak memory {current['peak_memory_bytes']:,} B, "
+                                              f"baseline {page['peak_memory_bytes']:,} B")
+
+    return differences
+
+def compare_timing(result: Dict, baseline: Dict, tolerance: float = DEFAULT_TOLERANCE) -> Dict[str, str]:
+    """Slowdowns beyond tolerance against the baseline, keyed by check; empty when all pass"""
+    regressions = {}
+
+    for name, page in baseline.get("pages", {}).items():
+        current = result["pages"].get(name)
+        if current is None:
+            continue
+        if page["bytes"] >= 100_000 and current["normalized"] > page["normalized"] * (1 + tolerance):
+            regressions[f"{name}/time"] = f"{name}: normalized time {current['normalized']}, baseline {page['normalized']}"
+
+    for name, suite in baseline.get("suites", {}).items():
+        current = result["suites"].get(name)
+        if current is None:
+            continue
+        for metric in ("normalized_pages_per_second", "normalized_grants_per_second"):
+            if current[metric] < suite[metric] * (1 - tolerance):
+                regressions[f"{name}/{metric}"] = f"{name}: {metric} {current[metric]}, baseline {suite[metric]}"
+
+    for name, function in baseline.get("functions", {}).items():
+        current = result["functions"].get(name)
+        if current is None or min(current["calls"], function["calls"]) < MIN_CALLS_COMPARED:
+            continue
+        if current["normalized_mean"] > function["normalized_mean"] * (1 + tolerance):
+            regressions[f"{name}/mean"] = (f"{name}: {current['mean_microseconds']} µs/call, "
+                                           f"baseline {function['mean_microseconds']} µs/call (normalized "
+                                           f"{current['normalized_mean']} vs {function['normalized_mean']})")
+
+    return regressions
+
+def print_report(result: Dict):
+    print(f"Extraction benchmark ({result['backend']}, Python {result['python']}, "
+          f"calibration {result['calibration_seconds'] * 1000:.1f} ms)")
+    print("\nSuites:")
+    for name, suite in result["suites"].items():
+        print(f"  {name:<20} {suite['pages']:>3} pages {suite['grants']:>5} grants  "
+              f"{suite['pages_per_second']:>9.2f} pages/s {suite['grants_per_second']:>10.2f} grants/s")
+    print("\nPages:")
+    for name, page in result["pages"].items():
+        print(f"  {name:<42} {page['bytes'] / 1024:>8.1f} KB {page['grants']:>5} grants "
+              f"{page['seconds'] * 1000:>9.2f} ms  peak {page['peak_memory_bytes'] / 1048576:>7.2f} MB")
+    print("\nFunctions (inclusive):")
+    for name, function in result["functions"].items():
+        print(f"  {name:<36} {function['calls']:>7} calls {function['total_seconds'] * 1000:>10.2f} ms "
+              f"{function['mean_microseconds']:>10.2f} µs/call")
+    if result["max_rss_kb"]:
+        print(f"\nMax RSS: {result['max_rss_kb'] / 1024:.1f} MB")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline extraction benchmark with baseline regression check")
+    parser.add_argument("--backend", default=DEFAULT_BACKEND, help="HTML parser backend to benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per page (best is kept)")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed fractional slowdown or memory growth before failing")
+    parser.add_argument("--check-timing", action="store_true",
+                        help="Also fail on slowdowns; only meaningful against a baseline recorded on this machine")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="Baseline JSON file")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Store this run as the baseline for the backend instead of comparing")
+    parser.add_argument("--no-synthetic", action="store_true", help="Only benchmark the recorded fixtures")
+    parser.add_argument("--output", type=Path, help="Also write the full results as JSON")
+    args = parser.parse_args(argv)
+
+    logging.getLogger().setLevel(logging.WARNING)  # Per-page extraction logs would swamp the report
+    result = run_benchmark(args.backend, args.repeat, include_synthetic=not args.no_synthetic)
+    print_report(result)
+
+    if args.output:
+        args.output.write_text(json.dumps(result, indent=2) + "\n", encoding='utf-8')
+
+    baselines = json.loads(args.baseline.read_text(encoding='utf-8')) if args.baseline.exists() else {}
+    if args.update_baseline:
+        baselines[args.backend] = result
+        args.baseline.write_text(json.dumps(baselines, indent=2) + "\n", encoding='utf-8')
+        print(f"\n📝 Baseline for {args.backend} written to {args.baseline}")
+        return 0
+
+    if args.backend not in baselines:
+        print(f"\n⚠️  No baseline for {args.backend} in {args.baseline}; run with --update-baseline to record one")
+        return 0
+
+    baseline = baselines[args.backend]
+    differences = compare_output(result, baseline, args.tolerance)
+    regressions = compare_timing(result, baseline, args.tolerance)
+    if regressions and args.check_timing:
+        # Timing noise rarely repeats; only checks that fail a second run count as regressions
+        print(f"\n⏱️  {len(regressions)} timing check(s) outside tolerance, re-running to confirm...")
+        rerun = run_benchmark(args.backend, args.repeat, include_synthetic=not args.no_synthetic)
+        confirmed = compare_timing(rerun, baseline, args.tolerance)
+        regressions = {key: confirmed[key] for key in regressions if key in confirmed}
+
+    if regressions:
+        heading = "PERFORMANCE REGRESSION" if args.check_timing else "Timings outside tolerance (not checked)"
+        print(f"\n{'❌' if args.check_timing else '⚠️ '} {heading} against {args.baseline} "
+              f"(tolerance {args.tolerance:.0%}):")
+        for regression in regressions.values():
+            print(f"   {regression}")
+    if differences:
+        print(f"\n❌ OUTPUT OR MEMORY CHANGED against {args.baseline}:")
+        for difference in differences.values():
+            print(f"   {difference}")
+    if differences or (regressions and args.check_timing):
+        return 1
+    print(f"\n✅ Output and memory match the {args.backend} baseline")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Exporter Round-Trip Check
+Streams the fixture pages' grants to every columnar export format and verifies they read back unchanged
+"""
+
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+from typing import List
+
+from check_parser_backends import FIXTURE_DIR, load_fixtures
+from grant_discovery_scraper import GrantDiscoveryScraper
+from grant_exporters import pa
+from grant_model import Grant
+
+COLUMNS = ["title", "source", "tags", "score"]
+COLUMNAR_SUFFIXES = [".parquet", ".arrow"]
+
+def fixture_grants(scraper: GrantDiscoveryScraper, fixture_dir: Path = FIXTURE_DIR) -> List[Grant]:
+    grants = []
+    for filename, source_url in load_fixtures(fixture_dir).items():
+        grants.extend(scraper.extract_page((fixture_dir / filename).read_text(encoding='utf-8'), source_url))
+    return grants
+
+async def stream(grants: List[Grant]):
+    for grant in grants:
+        yield grant
+
+def check_round_trip(fixture_dir: Path = FIXTURE_DIR) -> bool:
+    """Export through export_stream and load_grants for each format; returns True when all match"""
+    if pa is None:
+        print("⚠️  pyarrow is not installed; skipping columnar exports")
+        return True
+
+    scraper = GrantDiscoveryScraper()
+    grants = fixture_grants(scraper, fixture_dir)
+    expected = [[grant.title, grant.source, sorted(grant.tags), grant.score] for grant in grants]
+    all_match = True
+
+    with tempfile.TemporaryDirectory() as directory:
+        for suffix in COLUMNAR_SUFFIXES:
+            filename = str(Path(directory) / f"grants{suffix}")
+            written = asyncio.run(scraper.export_stream(stream(grants), filename))
+            frame = scraper.load_grants(filename, columns=COLUMNS)
+            actual = [[row.title, row.source, sorted(row.tags), row.score] for row in frame.itertuples()]
+            if written == len(grants) and list(frame.columns) == COLUMNS and actual == expected:
+                print(f"✅ {suffix}: {written} grants read back unchanged")
+            else:
+                all_match = False
+                print(f"❌ {suffix}: wrote {written} of {len(grants)} grants, read back {len(actual)} "
+                      f"with columns {list(frame.columns)}")
+
+    return all_match
+
+if __name__ == "__main__":
+    sys.exit(0 if check_round_trip() else 1)
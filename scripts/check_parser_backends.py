@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Parser Backend Parity Check
+Runs every extractor on the recorded fixture pages with each parser backend and verifies the Grant lists match
+"""
+
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+from grant_discovery_scraper import GrantDiscoveryScraper
+from html_backends import DEFAULT_BACKEND
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures" / "pages"
+BACKENDS = [DEFAULT_BACKEND, "lxml", "selectolax"]
+
+def load_fixtures(fixture_dir: Path = FIXTURE_DIR) -> Dict[str, str]:
+    """Map fixture file name to the source URL it was recorded from"""
+    with open(fixture_dir / "manifest.json", encoding='utf-8') as f:
+        return json.load(f)
+
+def extract_with_backend(backend: str, html: str, source_url: str) -> List[dict]:
+    scraper = GrantDiscoveryScraper(parser_backend=backend)
+    return [grant.to_dict() for grant in scraper.extract_page(html, source_url)]
+
+def check_parity(fixture_dir: Path = FIXTURE_DIR) -> bool:
+    """Compare each backend against html.parser on every fixture; returns True when all match"""
+    all_match = True
+
+    for filename, source_url in load_fixtures(fixture_dir).items():
+        html = (fixture_dir / filename).read_text(encoding='utf-8')
+        expected = extract_with_backend(DEFAULT_BACKEND, html, source_url)
+
+        for backend in BACKENDS[1:]:
+            actual = extract_with_backend(backend, html, source_url)
+            if actual == expected:
+                print(f"✅ {filename}: {backend} matches ({len(expected)} grants)")
+            else:
+                all_match = False
+                print(f"❌ {filename}: {backend} returned {len(actual)} grants, expected {len(expected)}")
+                for want, got in zip(expected, actual):
+                    for key in want:
+                        if want[key] != got[key]:
+                            print(f"   {key}: {got[key]!r} != {want[key]!r}")
+
+    return all_match
+
+if __name__ == "__main__":
+    sys.exit(0 if check_parity() else 1)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Crawl Frontier
+Priority queue of pages to fetch, with Bloom-filter URL dedup and per-domain depth/page budgets
+"""
+
+import hashlib
+import heapq
+import math
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+from urllib.parse import urldefrag, urlparse, urlunparse
+
+PAGINATION_URL = re.compile(r'[?&](?:page|p|pg|start|offset)=\d+|/page/\d+', re.I)
+PAGINATION_TEXT = re.compile(r'^(?:next|next page|more|older|load more|\d+|›|»|>)$', re.I)
+GRANT_LINK = re.compile(r'grant|fund|program|opportunit|scheme|initiative|support|round', re.I)
+
+class BloomFilter:
+    """Fixed-size probabilistic set: no false negatives, false positives at about error_rate"""
+
+    def __init__(self, capacity: int = 100000, error_rate: float = 0.001):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+@dataclass
+class CrawlBudget:
+    max_depth: int = 0
+    max_pages: int = 50
+
+@dataclass(order=True)
+class CrawlRequest:
+    sort_key: tuple = field(init=False, repr=False)
+    url: str = field(compare=False)
+    depth: int = field(compare=False, default=0)
+    priority: float = field(compare=False, default=0.0)
+    seed_index: int = field(compare=False, default=0)
+    sequence: int = field(compare=False, default=0)
+    is_listing: bool = field(compare=False, default=True)
+
+    def __post_init__(self):
+        # Highest predicted relevance first, then shallower pages, then discovery order
+        self.sort_key = (-self.priority, self.depth, self.sequence)
+
+def normalize_url(url: str) -> str:
+    """Drop fragments and lower-case scheme/host so trivially different URLs dedupe"""
+    url, _ = urldefrag(url)
+    parts = urlparse(url)
+    return urlunparse((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/', parts.params,
+                       parts.query, ''))
+
+def is_pagination_link(url: str, anchor_text: str) -> bool:
+    return bool(PAGINATION_URL.search(url) or PAGINATION_TEXT.match(anchor_text.strip()))
+
+def is_candidate_link(url: str, anchor_text: str) -> bool:
+    """Whether a link looks like a grant detail page or another page of the listing"""
+    return is_pagination_link(url, anchor_text) or bool(GRANT_LINK.search(urlparse(url).path + " " + anchor_text))
+
+class CrawlFrontier:
+    """Pages still to fetch, ordered by predicted relevance and depth, never repeating a URL"""
+
+    def __init__(self, default_budget: Optional[CrawlBudget] = None,
+                 domain_budgets: Optional[Dict[str, CrawlBudget]] = None, seen_capacity: int = 100000):
+        self.default_budget = default_budget or CrawlBudget()
+        self.domain_budgets = domain_budgets or {}
+        self.seen = BloomFilter(seen_capacity)
+        self.heap: List[CrawlRequest] = []
+        self.pages_per_domain: Dict[str, int] = {}
+        self.sequence = 0
+        # Seeds that had an unseen page refused because its domain's page budget was spent
+        self.truncated_seeds: Set[int] = set()
+
+    def budget_for(self, host: str) -> CrawlBudget:
+        return self.domain_budgets.get(host, self.default_budget)
+
+    def push(self, url: str, depth: int = 0, priority: float = 0.0, seed_index: int = 0,
+             is_listing: bool = True) -> bool:
+        """Queue a URL unless it was seen before or its domain's depth/page budget is spent"""
+        key = normalize_url(url)
+        host = urlparse(key).netloc
+        budget = self.budget_for(host)
+
+        if depth > budget.max_depth or key in self.seen:
+            return False
+        if self.pages_per_domain.get(host, 0) >= budget.max_pages:
+            self.truncated_seeds.add(seed_index)
+            return False
+
+        self.seen.add(key)
+        self.pages_per_domain[host] = self.pages_per_domain.get(host, 0) + 1
+        self.sequence += 1
+        heapq.heappush(self.heap, CrawlRequest(url=url, depth=depth, priority=priority, seed_index=seed_index,
+                                               sequence=self.sequence, is_listing=is_listing))
+        return True
+
+    def pop(self) -> CrawlRequest:
+        return heapq.heappop(self.heap)
+
+    def __len__(self) -> int:
+        return len(self.heap)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Date Normalization
+Parses the free-text dates found on grant listings (single dates, ranges, rolling deadlines)
+into ISO dates, with a bounded cache so re-scoring large historical sets stays cheap
+"""
+
+import re
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+from typing import Optional
+
+DATE_CACHE_SIZE = 16384
+HOT_WITHIN_DAYS = 14
+
+MONTHS = {name: number for number, name in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], 1)}
+MONTH = r'(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?'
+RANGE_SEPARATOR = r'\s*(?:-|–|—|to|until|till)\s*'
+
+# Same shapes extract_date finds (day-first numeric, as used in Australia), plus ranges
+DATE_TOKEN = re.compile(
+    rf'(?P<dmy>(?P<dmy_d>\d{{1,2}})[/-](?P<dmy_m>\d{{1,2}})[/-](?P<dmy_y>\d{{4}}))'
+    rf'|(?P<ymd>(?P<ymd_y>\d{{4}})[/-](?P<ymd_m>\d{{1,2}})[/-](?P<ymd_d>\d{{1,2}}))'
+    rf'|(?P<day_month>(?P<dm_d>\d{{1,2}})(?:st|nd|rd|th)?\s+(?P<dm_m>{MONTH})(?:,?\s+(?P<dm_y>\d{{4}}))?)'
+    rf'|(?P<month_day>(?P<md_m>{MONTH})\s+(?P<md_d>\d{{1,2}})(?:st|nd|rd|th)?(?:,?\s+(?P<md_y>\d{{4}}))?)',
+    re.I
+)
+# "1-15 March 2025": the first day borrows the month and year of the second
+DAY_RANGE = re.compile(rf'\b(\d{{1,2}}){RANGE_SEPARATOR}(\d{{1,2}})(?:st|nd|rd|th)?\s+({MONTH})\s+(\d{{4}})', re.I)
+ROLLING = re.compile(r'rolling|ongoing|open all year|any ?time|until (?:funds|budget)|no (?:closing|deadline)'
+                     r'|year[- ]round|continuous', re.I)
+URGENT_WORDS = re.compile(r'urgent|soon|asap|this month|next week', re.I)
+
+@dataclass(frozen=True)
+class ParsedDate:
+    start: Optional[date] = None
+    end: Optional[date] = None
+    rolling: bool = False
+
+    @property
+    def deadline(self) -> Optional[date]:
+        return self.end or self.start
+
+def _make_date(year: Optional[str], month: int, day: str) -> Optional[date]:
+    try:
+        return date(int(year), month, int(day)) if year else None
+    except ValueError:
+        return None
+
+def _month_number(name: str) -> int:
+    return MONTHS[name[:3].lower()]
+
+def _dates_in(text: str) -> list:
+    """Every complete date in the text, in order; a year after a yearless date is borrowed ("1 March to 15 April 2025")"""
+    found = []
+    pending = []  # (month, day) still waiting for a year
+    for match in DATE_TOKEN.finditer(text):
+        if match.group('dmy'):
+            parsed = _make_date(match.group('dmy_y'), int(match.group('dmy_m')), match.group('dmy_d'))
+        elif match.group('ymd'):
+            parsed = _make_date(match.group('ymd_y'), int(match.group('ymd_m')), match.group('ymd_d'))
+        elif match.group('day_month'):
+            month, day, year = _month_number(match.group('dm_m')), match.group('dm_d'), match.group('dm_y')
+            if not year:
+                pending.append((month, day))
+                continue
+            parsed = _make_date(year, month, day)
+        else:
+            month, day, year = _month_number(match.group('md_m')), match.group('md_d'), match.group('md_y')
+            if not year:
+                pending.append((month, day))
+                continue
+            parsed = _make_date(year, month, day)
+
+        if parsed is None:
+            continue
+        for month, day in pending:
+            earlier = _make_date(str(parsed.year), month, day)
+            if earlier is not None:
+                found.append(earlier)
+        pending = []
+        found.append(parsed)
+    return found
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def parse_date_text(text: str) -> ParsedDate:
+    """Parse a listing date string; ranges give start and end, rolling deadlines have no end"""
+    text = " ".join((text or "").split())
+    if not text or "not specified" in text.lower():
+        return ParsedDate()
+
+    dates = []
+    day_range = DAY_RANGE.search(text)
+    if day_range:
+        month = _month_number(day_range.group(3))
+        dates = [_make_date(day_range.group(4), month, day_range.group(1)),
+                 _make_date(day_range.group(4), month, day_range.group(2))]
+        dates = [d for d in dates if d is not None]
+    if not dates:
+        dates = _dates_in(text)
+
+    rolling = bool(ROLLING.search(text))
+    if not dates:
+        return ParsedDate(rolling=rolling)
+    return ParsedDate(start=min(dates), end=max(dates) if len(dates) > 1 else None, rolling=rolling)
+
+def normalize_date(text: str) -> Optional[str]:
+    """ISO deadline (end of a range) for a listing date string, or None if there is none"""
+    deadline = parse_date_text(text).deadline
+    return deadline.isoformat() if deadline else None
+
+def days_until(text: str, today: Optional[date] = None) -> Optional[int]:
+    """Days from today to the deadline; negative once it has passed"""
+    deadline = parse_date_text(text).deadline
+    if deadline is None:
+        return None
+    return (deadline - (today or date.today())).days
+
+def deadline_urgency(text: str, today: Optional[date] = None, hot_within_days: int = HOT_WITHIN_DAYS) -> str:
+    """Hot within hot_within_days of the deadline, Closed after it, Normal otherwise or when rolling"""
+    parsed = parse_date_text(text)
+    if parsed.deadline is not None:
+        remaining = (parsed.deadline - (today or date.today())).days
+        if remaining < 0:
+            return "Closed"
+        return "Hot" if remaining <= hot_within_days else "Normal"
+    if parsed.rolling:
+        return "Normal"
+    if text and URGENT_WORDS.search(text):
+        return "Hot"
+    return "Unknown"
@@ -4,31 +4,12 @@ Demo Australian Grant Discovery
 Generates realistic grant data for Shadow Goose Entertainment without actual web scraping
 """
 
-import json
-import csv
 from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
-from typing import List
+from typing import AsyncIterator, Iterable, List
 import random
-
-@dataclass
-class Grant:
-    title: str
-    source: str
-    amount: str
-    due_date: str
-    summary: str
-    eligibility: str
-    tags: List[str]
-    url: str
-    pdf_url: str = ""
-    score: int = 0
-    notes: str = ""
-    grant_type: str = ""
-    open_date: str = ""
-    recurrence: str = ""
-    urgency: str = ""
-    estimated_eligibility: str = ""
+from grant_exporters import export_grants, export_grants_async, load_grants_columnar
+from date_normalization import deadline_urgency
+from grant_model import GRANT_FIELDS, Grant
 
 class DemoGrantDiscovery:
     def __init__(self):
@@ -305,39 +286,41 @@ class DemoGrantDiscovery:
         return grants
     
     def calculate_urgency(self, due_date: str) -> str:
-        """Calculate urgency based on due date"""
-        try:
-            # Parse due date (simplified for demo)
-            if "February" in due_date or "March" in due_date:
-                return "Hot" if "February" in due_date else "Normal"
-            return "Normal"
-        except:
-            return "Normal"
+        """Calculate urgency from the days left until the due date"""
+        return deadline_urgency(due_date)
     
-    def export_to_csv(self, grants: List[Grant], filename: str = "australian_grants_demo.csv"):
-        """Export grants to CSV"""
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = ['title', 'source', 'amount', 'due_date', 'summary', 
-                         'eligibility', 'tags', 'url', 'pdf_url', 'score', 'notes',
-                         'grant_type', 'urgency', 'estimated_eligibility', 'open_date', 'recurrence']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            
-            writer.writeheader()
-            for grant in grants:
-                row = asdict(grant)
-                row['tags'] = ', '.join(row['tags'])  # Convert list to string
-                writer.writerow(row)
-        
-        print(f"✅ Exported {len(grants)} grants to {filename}")
+    CSV_FIELDS = ['title', 'source', 'amount', 'due_date', 'summary', 
+                  'eligibility', 'tags', 'url', 'pdf_url', 'score', 'notes',
+                  'grant_type', 'urgency', 'estimated_eligibility', 'open_date', 'recurrence']
+
+    def export_to_csv(self, grants: Iterable[Grant], filename: str = "australian_grants_demo.csv"):
+        """Export grants to CSV (gzip/zstd compressed for .csv.gz / .csv.zst)"""
+        count = export_grants(grants, filename, fieldnames=self.CSV_FIELDS, output_format="csv")
+        print(f"✅ Exported {count} grants to {filename}")
     
-    def export_to_json(self, grants: List[Grant], filename: str = "australian_grants_demo.json"):
+    def export_to_json(self, grants: Iterable[Grant], filename: str = "australian_grants_demo.json"):
         """Export grants to JSON"""
-        grants_data = [asdict(grant) for grant in grants]
-        
-        with open(filename, 'w', encoding='utf-8') as jsonfile:
-            json.dump(grants_data, jsonfile, indent=2, ensure_ascii=False)
-        
-        print(f"✅ Exported {len(grants)} grants to {filename}")
+        count = export_grants(grants, filename, output_format="json")
+        print(f"✅ Exported {count} grants to {filename}")
+    
+    def export_to_ndjson(self, grants: Iterable[Grant], filename: str = "australian_grants_demo.ndjson.gz"):
+        """Export grants as newline-delimited JSON, one grant per line"""
+        count = export_grants(grants, filename, output_format="ndjson")
+        print(f"✅ Exported {count} grants to {filename}")
+    
+    def export_to_parquet(self, grants: Iterable[Grant], filename: str = "australian_grants_demo.parquet"):
+        """Export grants to a typed Parquet (or .arrow/.feather) file"""
+        count = export_grants(grants, filename, fieldnames=list(GRANT_FIELDS))
+        print(f"✅ Exported {count} grants to {filename}")
+    
+    def load_grants(self, filename: str = "australian_grants_demo.parquet", columns: List[str] = None):
+        """Load a Parquet/Arrow export into a DataFrame, optionally only some columns"""
+        return load_grants_columnar(filename, columns)
+    
+    async def export_stream(self, grants: AsyncIterator[Grant], filename: str):
+        """Export grants from an async iterator as they arrive; format follows the filename suffix"""
+        count = await export_grants_async(grants, filename, fieldnames=self.CSV_FIELDS)
+        print(f"✅ Exported {count} grants to {filename}")
     
     def generate_discovery_report(self, grants: List[Grant]):
         """Generate a comprehensive discovery report"""
@@ -416,7 +399,7 @@ class DemoGrantDiscovery:
             'urgent_count': len(urgent_grants),
             'sources': sources,
             'top_tags': dict(sorted(tag_counts.items(), key=lambda x: x[1], reverse=True)[:10]),
-            'top_grants': [asdict(g) for g in sorted_grants]
+            'top_grants': [g.to_dict() for g in sorted_grants]
         }
 
 def main():
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Domain Health Tracking
+Per-domain latency history, adaptive timeouts, retry backoff and a circuit breaker,
+persisted between runs so a failing portal is skipped instead of timing out every crawl
+"""
+
+import json
+import random
+import sqlite3
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Deque, Dict, Optional
+from urllib.parse import urlparse
+
+# Responses worth retrying: throttling and transient server/gateway errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_BACKOFF = 30.0
+# A longer Retry-After opens the circuit for that long instead of sleeping through it
+MAX_RETRY_AFTER = 60.0
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = MAX_BACKOFF) -> float:
+    """Exponential backoff with full jitter: uniform in [0, min(cap, base * 2^attempt)]"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+class DomainHealth:
+    def __init__(self, latencies=(), consecutive_failures: int = 0, open_until: float = 0.0, max_samples: int = 50):
+        self.latencies: Deque[float] = deque(latencies, maxlen=max_samples)
+        self.consecutive_failures = consecutive_failures
+        self.open_until = open_until  # Wall-clock time, so it survives restarts
+
+class DomainHealthTracker:
+    """SQLite-backed health record per host.
+
+    Timeouts follow the host's observed latency (percentile x multiplier, clamped). After
+    failure_threshold consecutive failed fetches the circuit opens for cooldown seconds; the first
+    fetch after the cooldown is a trial, and another failure reopens it straight away.
+    """
+
+    def __init__(self, path: str = ".http_cache/domain_health.sqlite", failure_threshold: int = 3,
+                 cooldown: float = 900.0, min_timeout: float = 5.0, max_timeout: float = 30.0,
+                 timeout_percentile: float = 0.95, timeout_multiplier: float = 3.0, min_samples: int = 5):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.timeout_percentile = timeout_percentile
+        self.timeout_multiplier = timeout_multiplier
+        self.min_samples = min_samples
+        self.stats = {"retries": 0, "failures": 0, "skipped": 0, "circuits_opened": 0}
+
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS domain_health (
+                host TEXT PRIMARY KEY,
+                latencies TEXT NOT NULL,
+                consecutive_failures INTEGER NOT NULL,
+                open_until REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+        self.domains: Dict[str, DomainHealth] = {
+            host: DomainHealth(json.loads(latencies), failures, open_until)
+            for host, latencies, failures, open_until in self.conn.execute(
+                "SELECT host, latencies, consecutive_failures, open_until FROM domain_health")
+        }
+
+    def health_for(self, url: str) -> DomainHealth:
+        host = urlparse(url).netloc.lower()
+        if host not in self.domains:
+            self.domains[host] = DomainHealth()
+        return self.domains[host]
+
+    def timeout_for(self, url: str) -> float:
+        """Request timeout from the host's latency percentile; max_timeout until enough samples exist"""
+        latencies = sorted(self.health_for(url).latencies)
+        if len(latencies) < self.min_samples:
+            return self.max_timeout
+        observed = latencies[int(self.timeout_percentile * (len(latencies) - 1))]
+        return min(self.max_timeout, max(self.min_timeout, observed * self.timeout_multiplier))
+
+    def is_open(self, url: str) -> bool:
+        """Whether the host's circuit is open and requests to it should be skipped"""
+        if self.health_for(url).open_until > time.time():
+            self.stats["skipped"] += 1
+            return True
+        return False
+
+    def record_success(self, url: str, latency: float):
+        health = self.health_for(url)
+        health.latencies.append(latency)
+        health.consecutive_failures = 0
+        health.open_until = 0.0
+
+    def record_failure(self, url: str):
+        """Count a fetch that failed after all retries, opening the circuit at the threshold"""
+        health = self.health_for(url)
+        health.consecutive_failures += 1
+        self.stats["failures"] += 1
+        if health.consecutive_failures >= self.failure_threshold:
+            self.open_circuit(url, self.cooldown)
+
+    def open_circuit(self, url: str, seconds: float):
+        health = self.health_for(url)
+        health.open_until = max(health.open_until, time.time() + seconds)
+        self.stats["circuits_opened"] += 1
+
+    def save(self):
+        now = time.time()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO domain_health (host, latencies, consecutive_failures, open_until, updated_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [(host, json.dumps(list(health.latencies)), health.consecutive_failures, health.open_until, now)
+             for host, health in self.domains.items()]
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.save()
+        self.conn.close()
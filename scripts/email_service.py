@@ -4,13 +4,14 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime, timedelta
 import asyncio
-from supabase import create_client, Client
+from concurrent.futures import ThreadPoolExecutor
+from async_storage import AsyncStorage
+from storage_backends import create_storage
 
-# Initialize Supabase client
-supabase: Client = create_client(
-    os.getenv('SUPABASE_URL', ''),
-    os.getenv('SUPABASE_KEY', '')
-)
+# Initialize the storage client (Supabase, or the local SQLite database when GRANT_STORAGE=local)
+supabase = create_storage('SUPABASE_URL', 'SUPABASE_KEY')
+# The client is synchronous; requests run on a bounded thread pool so notifications are handled concurrently
+storage = AsyncStorage(supabase, int(os.getenv('EMAIL_DB_CONCURRENCY', '4')))
 
 # Email configuration
 SMTP_SERVER = os.getenv('SMTP_SERVER', 'smtp.gmail.com')
@@ -18,6 +19,10 @@ SMTP_PORT = int(os.getenv('SMTP_PORT', '587'))
 SMTP_USERNAME = os.getenv('SMTP_USERNAME', '')
 SMTP_PASSWORD = os.getenv('SMTP_PASSWORD', '')
 FROM_EMAIL = os.getenv('FROM_EMAIL', SMTP_USERNAME)
+# smtplib blocks, so sends run on their own small pool; its size caps open SMTP connections, which
+# providers rate-limit
+SMTP_CONCURRENCY = max(1, int(os.getenv('SMTP_CONCURRENCY', '2')))
+smtp_executor = ThreadPoolExecutor(max_workers=SMTP_CONCURRENCY, thread_name_prefix="smtp")
 
 class EmailService:
     def __init__(self):
@@ -56,44 +61,56 @@ class NotificationService:
         """Process pending notifications."""
         try:
             # Get pending notifications
-            response = await supabase.table('email_notifications') \
-                .select('*') \
-                .eq('status', 'pending') \
-                .lte('scheduled_for', datetime.utcnow().isoformat()) \
-                .execute()
+            response = await storage.execute(
+                supabase.table('email_notifications')
+                .select('*')
+                .eq('status', 'pending')
+                .lte('scheduled_for', datetime.utcnow().isoformat())
+            )
 
             notifications = response.data
 
-            for notification in notifications:
-                success = await self.send_notification(notification)
-                
-                # Update notification status
-                status = 'sent' if success else 'failed'
-                await supabase.table('email_notifications') \
-                    .update({'status': status, 'sent_at': datetime.utcnow().isoformat()}) \
-                    .eq('id', notification['id']) \
-                    .execute()
+            # Each notification waits on the database and SMTP, so handle them concurrently
+            await asyncio.gather(*(self.deliver_notification(notification) for notification in notifications))
 
         except Exception as e:
             print(f"Error processing notifications: {str(e)}")
 
+    async def deliver_notification(self, notification):
+        """Send a notification and record whether it was sent."""
+        try:
+            success = await self.send_notification(notification)
+
+            # Update notification status
+            status = 'sent' if success else 'failed'
+            await storage.execute(
+                supabase.table('email_notifications')
+                .update({'status': status, 'sent_at': datetime.utcnow().isoformat()})
+                .eq('id', notification['id'])
+            )
+        except Exception as e:
+            print(f"Error updating notification {notification.get('id')}: {str(e)}")
+
     async def send_notification(self, notification):
         """Send a single notification."""
         try:
             # Get grant details
-            grant_response = await supabase.table('grants') \
-                .select('*') \
-                .eq('id', notification['grant_id']) \
-                .single() \
-                .execute()
+            grant_response = await storage.execute(
+                supabase.table('grants')
+                .select('*')
+                .eq('id', notification['grant_id'])
+                .single()
+            )
 
             grant = grant_response.data
 
             # Generate email content based on notification type
             subject, content = self.generate_email_content(notification['notification_type'], grant, notification['template_data'])
 
-            # Send email
-            success = self.email_service.send_email(
+            # Send email on the SMTP pool, at most SMTP_CONCURRENCY at a time
+            success = await asyncio.get_running_loop().run_in_executor(
+                smtp_executor,
+                self.email_service.send_email,
                 notification['recipient_email'],
                 subject,
                 content
@@ -157,13 +174,15 @@ async def schedule_deadline_reminders():
     """Schedule deadline reminders for upcoming grants."""
     try:
         # Get grants with upcoming deadlines
-        response = await supabase.table('grants') \
-            .select('*') \
-            .not_('due_date', 'is', null) \
-            .execute()
+        response = await storage.execute(
+            supabase.table('grants')
+            .select('*')
+            .not_.is_('due_date', 'null')
+        )
 
         grants = response.data
         now = datetime.utcnow()
+        reminders = []
 
         for grant in grants:
             due_date = datetime.fromisoformat(grant['due_date'].replace('Z', '+00:00'))
@@ -179,7 +198,7 @@ async def schedule_deadline_reminders():
                     
                     # Schedule notification for each team member
                     for email in team_members:
-                        await supabase.table('email_notifications').insert({
+                        reminders.append({
                             'grant_id': grant['id'],
                             'recipient_email': email,
                             'notification_type': 'deadline_reminder',
@@ -187,7 +206,11 @@ async def schedule_deadline_reminders():
                             'template_data': {
                                 'days_until': days
                             }
-                        }).execute()
+                        })
+
+        # One insert for every reminder instead of a round trip each
+        if reminders:
+            await storage.execute(supabase.table('email_notifications').insert(reminders))
 
     except Exception as e:
         print(f"Error scheduling deadline reminders: {str(e)}")
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Grant Field Extraction
+Single-pass extraction of amount, due date, summary and eligibility from a listing item's text
+"""
+
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, List, Optional, Tuple
+
+# Patterns are listed in priority order: the first pattern with any match wins,
+# exactly as if each one were searched separately.
+AMOUNT_PATTERNS = [
+    r'\$[\d,]+(?:\.\d{2})?(?:\s*(?:million|mil|k|thousand))?',
+    r'(?:up to|maximum of|max)\s*\$[\d,]+',
+    r'[\d,]+\s*(?:dollars|AUD)',
+]
+
+DATE_PATTERNS = [
+    r'\d{1,2}[/-]\d{1,2}[/-]\d{4}',
+    r'\d{4}[/-]\d{1,2}[/-]\d{1,2}',
+    r'\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4}',
+    r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{1,2},?\s+\d{4}',
+]
+
+ELIGIBILITY_KEYWORDS = [
+    "eligible", "eligibility", "criteria", "requirements",
+    "must be", "applicants", "who can apply"
+]
+
+AMOUNT_NOT_SPECIFIED = "Amount not specified"
+DATE_NOT_SPECIFIED = "Date not specified"
+ELIGIBILITY_NOT_SPECIFIED = "Eligibility criteria not specified"
+
+# No amount pattern can match at the same position as a date pattern, so one alternation
+# over both finds every candidate; at a shared start the earlier (higher-priority) pattern wins.
+@lru_cache(maxsize=None)
+def _field_scanner(amount_rank: int, date_rank: int):
+    """Combined scanner for the patterns that could still beat the best matches found so far"""
+    alternatives = [f"(?P<amount{i}>{p})" for i, p in enumerate(AMOUNT_PATTERNS[:amount_rank])]
+    alternatives += [f"(?P<date{i}>{p})" for i, p in enumerate(DATE_PATTERNS[:date_rank])]
+    return re.compile("|".join(alternatives), re.IGNORECASE)
+
+SENTENCE_SPLIT = re.compile(r'[.!?]+')
+WHITESPACE = re.compile(r'\s+')
+ELIGIBILITY_MATCH = re.compile("|".join(re.escape(keyword) for keyword in ELIGIBILITY_KEYWORDS))
+
+@dataclass
+class ExtractedFields:
+    amount: str
+    due_date: str
+    summary: str
+    eligibility: str
+    tags: List[str] = field(default_factory=list)
+
+def scan_amount_and_date(text: str) -> Tuple[str, str]:
+    """Find the amount and due date in one left-to-right scan"""
+    best = {"amount": (len(AMOUNT_PATTERNS), None), "date": (len(DATE_PATTERNS), None)}
+    pos = 0
+
+    while best["amount"][0] or best["date"][0]:
+        match = _field_scanner(best["amount"][0], best["date"][0]).search(text, pos)
+        if not match:
+            break
+
+        kind, index = match.lastgroup[:-1], int(match.lastgroup[-1])
+        if index < best[kind][0]:
+            best[kind] = (index, match.group())
+
+        # Restart just past the match start so overlapping candidates are still seen
+        pos = match.start() + 1
+
+    amount = best["amount"][1]
+    due_date = best["date"][1]
+    return (
+        amount.strip() if amount is not None else AMOUNT_NOT_SPECIFIED,
+        due_date.strip() if due_date is not None else DATE_NOT_SPECIFIED,
+    )
+
+def split_sentences(text: str) -> List[str]:
+    return SENTENCE_SPLIT.split(text)
+
+def summarize(text: str, sentences: List[str], max_length: int = 200) -> str:
+    """Build a summary from raw sentences as if the text had been whitespace-normalised first"""
+    summary = ""
+    last = len(sentences) - 1
+
+    for index, sentence in enumerate(sentences):
+        sentence = WHITESPACE.sub(' ', sentence)
+        if index == 0:
+            sentence = sentence.lstrip()
+        if index == last:
+            sentence = sentence.rstrip()
+
+        if len(summary + sentence) <= max_length:
+            summary += sentence.strip() + ". "
+        else:
+            break
+
+    return summary.strip() or WHITESPACE.sub(' ', text).strip()[:max_length] + "..."
+
+def eligibility_from(sentences: List[str]) -> str:
+    """Join the first three sentences that mention eligibility terms"""
+    eligibility_sentences = []
+
+    for sentence in sentences:
+        if ELIGIBILITY_MATCH.search(sentence.lower()):
+            eligibility_sentences.append(sentence.strip())
+            if len(eligibility_sentences) == 3:
+                break
+
+    return ". ".join(eligibility_sentences) if eligibility_sentences else ELIGIBILITY_NOT_SPECIFIED
+
+def extract_fields(text: str, title: str, tag_fn: Optional[Callable[[str], List[str]]] = None,
+                   tags_from_summary: bool = False) -> ExtractedFields:
+    """Extract every grant field from an item's text, splitting it into sentences only once"""
+    amount, due_date = scan_amount_and_date(text)
+    sentences = split_sentences(text)
+    summary = summarize(text, sentences)
+
+    fields = ExtractedFields(
+        amount=amount,
+        due_date=due_date,
+        summary=summary,
+        eligibility=eligibility_from(sentences),
+    )
+    if tag_fn:
+        fields.tags = tag_fn(title + " " + (summary if tags_from_summary else text))
+    return fields
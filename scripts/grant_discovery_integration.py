@@ -4,90 +4,421 @@ Grant Discovery Integration
 Connects the web scraper to the Supabase database and updates the grant discovery dashboard
 """
 
+import argparse
 import asyncio
+import hashlib
 import json
-import os
+import re
+import threading
+from collections import Counter
 from datetime import datetime
-from typing import List, Dict
-from supabase import create_client, Client
-from grant_discovery_scraper import GrantDiscoveryScraper, Grant
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
+from grant_discovery_scraper import CrawlSummary, GrantDiscoveryScraper
+from grant_model import Grant
+from page_fingerprints import PageFingerprintStore
+from domain_health import DomainHealthTracker
+from guideline_pdfs import PDFTextCache
+from date_normalization import normalize_date
+from pipeline_metrics import MetricsRegistry, timed
+from async_storage import AsyncStorage
+from storage_backends import StorageBackend, create_storage
+from run_journal import RunJournal
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+WHITESPACE = re.compile(r'\s+')
+
 class GrantDiscoveryIntegration:
-    def __init__(self):
-        # Initialize Supabase client
-        supabase_url = os.getenv('SUPABASE_URL')
-        supabase_key = os.getenv('SUPABASE_SERVICE_KEY')  # Use service key for server-side operations
+    def __init__(self, persist_concurrency: int = 4, persist_queue_size: int = 1000,
+                 metrics: Optional[MetricsRegistry] = None, metrics_path: Optional[str] = "discovery_metrics.json",
+                 batch_size: int = 500, close_removed: bool = True, db_concurrency: int = 8,
+                 storage: Optional[StorageBackend] = None, run_journal: Optional[RunJournal] = None):
+        # Supabase with the service key for server-side operations, or the local SQLite database when
+        # GRANT_STORAGE=local
+        self.supabase = storage if storage is not None else create_storage('SUPABASE_URL', 'SUPABASE_SERVICE_KEY')
+        # The client is synchronous; every database call from async code goes through this bounded pool
+        self.storage = AsyncStorage(self.supabase, max(db_concurrency, persist_concurrency))
         
-        if not supabase_url or not supabase_key:
-            raise ValueError("Missing Supabase credentials. Set SUPABASE_URL and SUPABASE_SERVICE_KEY environment variables.")
+        # Grants are written in batches of batch_size by persist_concurrency workers, fed through a queue
+        # holding about persist_queue_size grants while the crawl runs. Existing (name, funder) -> id keys
+        # are read up front, so a batch costs one grants upsert (two when it mixes new and existing
+        # grants) and one grant_metadata upsert instead of four or five requests per grant
+        self.persist_concurrency = max(1, persist_concurrency)
+        self.persist_queue_size = persist_queue_size
+        self.batch_size = max(1, batch_size)
+        self.grant_ids: Optional[Dict[Tuple[str, str], int]] = None
+        self.grant_ids_lock = threading.Lock()
         
-        self.supabase: Client = create_client(supabase_url, supabase_key)
+        # Content hashes of discovered grants (grant_id -> hash, None once closed) are read up front too;
+        # a grant whose hash matches is not written at all, so updated_at only moves on real changes.
+        # With close_removed, discovered grants missing from a source crawled completely this run are
+        # recorded as closed, and closed grants seen again are reopened
+        self.close_removed = close_removed
+        self.grant_hashes: Optional[Dict[int, Optional[str]]] = None
+        self.closed_ids: Set[int] = set()
+        self.sync_counts: Dict[str, int] = {}
         
-    async def discover_and_update_grants(self):
-        """Main function to discover grants and update database"""
-        logger.info("Starting grant discovery and database update...")
+        # Stage timings and counters for the whole run go into the discovery report and metrics_path
+        # (.prom for Prometheus text, otherwise JSON); pass MetricsRegistry(enabled=False) to turn them off
+        self.metrics = metrics if metrics is not None else MetricsRegistry()
+        self.metrics_path = metrics_path
         
-        # Run the scraper
-        async with GrantDiscoveryScraper() as scraper:
-            discovered_grants = await scraper.scrape_all_sources()
+        # Discovery runs journal fetched pages and committed batches so an interrupted run can be resumed
+        self.run_journal = run_journal if run_journal is not None else RunJournal()
         
-        logger.info(f"Discovered {len(discovered_grants)} grants")
+    async def discover_and_update_grants(self, resume: bool = False, run_id: Optional[str] = None):
+        """Main function to discover grants and update database; resume continues an interrupted run"""
+        run_id = self.run_journal.start(resume=resume, run_id=run_id)
+        logger.info(f"Starting grant discovery and database update (run {run_id})...")
         
-        # Update database
-        await self.update_grants_database(discovered_grants)
+        # Run the scraper, writing grants to the database as they are discovered. Guideline PDFs are linked
+        # from detail pages, so the crawl follows links past the landing pages as the standalone scraper does
+        async with GrantDiscoveryScraper(fingerprint_store=PageFingerprintStore(), crawl_depth=2,
+                                         max_pages_per_domain=200, domain_health=DomainHealthTracker(),
+                                         metrics=self.metrics, guideline_pdfs=True, pdf_cache=PDFTextCache(),
+                                         run_journal=self.run_journal) as scraper:
+            crawl = CrawlSummary()
+            discovered_grants = await self.persist_stream(scraper.scrape_stream(crawl), crawl)
+        
+        logger.info(f"Discovered {len(discovered_grants)} grants")
         
         # Generate summary report
         await self.generate_discovery_report(discovered_grants)
         
+        if self.metrics_path and self.metrics.enabled:
+            self.metrics.write(self.metrics_path)
+            logger.info(f"Pipeline metrics written to {self.metrics_path}")
+        
+        logger.info(f"Run {run_id} complete: {self.run_journal.stats}")
+        self.run_journal.finish()
         return discovered_grants
     
-    async def update_grants_database(self, grants: List[Grant]):
+    @timed()
+    async def update_grants_database(self, grants: Iterable[Grant]):
         """Update the grants table with discovered grants"""
+        async def iterate():
+            for grant in grants:
+                yield grant
+        
+        await self.persist_stream(iterate())
+    
+    async def persist_stream(self, grants: AsyncIterator[Grant], crawl: Optional[CrawlSummary] = None) -> List[Grant]:
+        """Write grants to the database in batches as they arrive; returns every grant received.
+
+        Removed grants are only closed given the summary of the crawl that produced the stream.
+        """
         logger.info("Updating grants database...")
         
-        new_grants = 0
-        updated_grants = 0
+        self.grant_ids, grant_hashes = await asyncio.gather(self.storage.run(self.prefetch_grant_ids),
+                                                            self.storage.run(self.prefetch_grant_hashes))
+        self.grant_hashes = grant_hashes if self.grant_ids is not None else None
+        # Without the prefetched keys every grant is written on its own, so spread them over the workers
+        batch_size = self.batch_size if self.grant_ids is not None else 1
+        queue: asyncio.Queue = asyncio.Queue(max(1, -(-self.persist_queue_size // batch_size)))
+        # resumed: written by the interrupted attempt of this run, whatever their outcome was then
+        # superseded: rows this run created for copies the stream replaced with another source's
+        counts = {"new": 0, "changed": 0, "unchanged": 0, "resumed": 0, "superseded": 0, "removed": 0, "failed": 0}
+        self.sync_counts = counts
+        received = []
+        existing_keys = set(self.grant_ids) if self.grant_ids is not None else set()
+        # Grants the journaled run already wrote before it was interrupted
+        journaling = self.run_journal.run_id is not None
+        committed = self.run_journal.committed_keys() if journaling else set()
+        if committed:
+            logger.info(f"Resuming: {len(committed)} grants already committed by this run")
         
-        for grant in grants:
-            try:
-                # Check if grant already exists (by title and source)
-                existing = self.supabase.table('grants').select('id').eq('name', grant.title).eq('funder', grant.source).execute()
-                
-                grant_data = {
-                    'name': grant.title,
-                    'funder': grant.source,
-                    'description': grant.summary,
-                    'amount_string': grant.amount,
-                    'due_date': self.parse_date(grant.due_date),
-                    'status': 'potential',
-                    'source_url': grant.url,
-                    'updated_at': datetime.utcnow().isoformat()
-                }
-                
-                if existing.data:
-                    # Update existing grant
-                    self.supabase.table('grants').update(grant_data).eq('id', existing.data[0]['id']).execute()
-                    updated_grants += 1
-                else:
-                    # Insert new grant
-                    grant_data['created_at'] = datetime.utcnow().isoformat()
-                    self.supabase.table('grants').insert(grant_data).execute()
-                    new_grants += 1
-                    
-                # Store additional metadata in a separate table
-                await self.store_grant_metadata(grant, existing.data[0]['id'] if existing.data else None)
-                
-            except Exception as e:
-                logger.error(f"Error updating grant {grant.title}: {str(e)}")
-                continue
+        async def persist_worker():
+            while True:
+                batch = await queue.get()
+                if batch is None:
+                    return
+                # Off the event loop, so the crawl continues while batches are written
+                outcomes = await self.storage.run(self.upsert_batch, batch)
+                for outcome, count in outcomes.items():
+                    counts[outcome] += count
+                    self.metrics.increment("db_grants", count, outcome=outcome)
+                # A batch with failures stays uncommitted, so a resumed run writes it again
+                if journaling and not outcomes.get("failed"):
+                    self.run_journal.record_batch((grant.title, grant.source) for grant in batch)
+        
+        workers = [asyncio.ensure_future(persist_worker()) for _ in range(self.persist_concurrency)]
+        try:
+            batch = []
+            async for grant in grants:
+                received.append(grant)
+                # Everything else goes to upsert_batch, which skips grants whose stored content hash matches;
+                # an unchanged source page says nothing about whether its grants were ever committed
+                if (grant.title, grant.source) in committed:
+                    counts["resumed"] += 1
+                    self.metrics.increment("db_grants", outcome="resumed")
+                    continue
+                batch.append(grant)
+                if len(batch) >= batch_size:
+                    await queue.put(batch)
+                    batch = []
+            if batch:
+                await queue.put(batch)
+            
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+        
+        if crawl is not None and crawl.superseded:
+            superseded = {id(grant) for grant in crawl.superseded}
+            received = [grant for grant in received if id(grant) not in superseded]
+            if self.grant_ids is not None:
+                kept = {(grant.title, grant.source): grant for grant in received}
+                superseded_keys = {(grant.title, grant.source) for grant in crawl.superseded}
+                # Concurrent batches may have written a replaced copy after the kept grant with the same key
+                rewritten = [kept[key] for key in superseded_keys if key in kept]
+                for start in range(0, len(rewritten), self.batch_size):
+                    outcomes = await self.storage.run(self.upsert_batch, rewritten[start:start + self.batch_size])
+                    for outcome, count in outcomes.items():
+                        counts[outcome] += count
+                        self.metrics.increment("db_grants", count, outcome=outcome)
+                # Waiting for the earlier sources would never have written these
+                created = superseded_keys - kept.keys() - existing_keys
+                counts["superseded"] = await self.storage.run(self.delete_grants, created)
+                self.metrics.increment("db_grants", counts["superseded"], outcome="superseded")
+        
+        if self.close_removed and self.grant_hashes is not None and crawl is not None:
+            # A closed grant dropped as another source's duplicate is still listed by its own source
+            with self.grant_ids_lock:
+                reopened = [grant for key, grant in crawl.extracted.items()
+                            if self.grant_ids.get(key) in self.closed_ids]
+            for start in range(0, len(reopened), self.batch_size):
+                outcomes = await self.storage.run(self.upsert_batch, reopened[start:start + self.batch_size])
+                for outcome, count in outcomes.items():
+                    counts[outcome] += count
+                    self.metrics.increment("db_grants", count, outcome=outcome)
+            
+            counts["removed"] = await self.storage.run(self.mark_removed, set(crawl.extracted),
+                                                       crawl.complete_sources())
+            self.metrics.increment("db_grants", counts["removed"], outcome="removed")
+        
+        logger.info(f"Database update complete: {counts['new']} new grants, {counts['changed']} changed grants, "
+                    f"{counts['unchanged']} unchanged grants skipped, {counts['resumed']} already written before "
+                    f"the interruption, {counts['superseded']} superseded copies deleted, {counts['removed']} removed "
+                    f"grants closed, {counts['failed']} failed")
+        return received
+    
+    def select_all(self, table: str, columns: str, order: str, page_size: int = 1000) -> List[Dict]:
+        """Every row of a table, read in pages because PostgREST caps the rows returned by one request"""
+        rows = []
+        start = 0
+        while True:
+            result = self.supabase.table(table).select(columns).order(order) \
+                .range(start, start + page_size - 1).execute()
+            rows.extend(result.data)
+            if len(result.data) < page_size:
+                return rows
+            start += page_size
+    
+    @timed()
+    def prefetch_grant_ids(self, page_size: int = 1000) -> Optional[Dict[Tuple[str, str], int]]:
+        """Map every existing (name, funder) to its id with paged reads; None if the read fails"""
+        try:
+            rows = self.select_all('grants', 'id,name,funder', 'id', page_size)
+        except Exception as e:
+            logger.error(f"Error prefetching grant ids, falling back to per-grant writes: {str(e)}")
+            return None
+        return {(row['name'], row['funder']): row['id'] for row in rows}
+    
+    @timed()
+    def prefetch_grant_hashes(self, page_size: int = 1000) -> Optional[Dict[int, Optional[str]]]:
+        """Map each discovered grant's id to its stored content hash and note closed ones; None if the read fails"""
+        try:
+            rows = self.select_all('grant_metadata', 'grant_id,content_hash,closed_at', 'grant_id', page_size)
+        except Exception as e:
+            # e.g. the content_hash column has not been added yet; every grant is then rewritten
+            logger.error(f"Error prefetching content hashes, change detection disabled: {str(e)}")
+            return None
+        self.closed_ids = {row['grant_id'] for row in rows if row.get('closed_at')}
+        return {row['grant_id']: row.get('content_hash') for row in rows}
+    
+    @timed()
+    def upsert_batch(self, grants: List[Grant]) -> Dict[str, int]:
+        """Upsert a batch of grants and their metadata on the (name, funder) key; returns outcome counts"""
+        if self.grant_ids is None:
+            return dict(Counter(self.upsert_grant(grant) for grant in grants))
+        
+        # A key may appear twice in a batch; the last copy wins, as with one write per grant
+        by_key = {(grant.title, grant.source): grant for grant in grants}
+        hashes = {key: self.content_hash(grant) for key, grant in by_key.items()}
+        with self.grant_ids_lock:
+            known = {key: self.grant_ids.get(key) for key in by_key}
+            stored = {key: self.grant_hashes.get(known[key]) if self.grant_hashes is not None else None
+                      for key in by_key}
+        new = [grant for key, grant in by_key.items() if known[key] is None]
+        # Only grants whose normalized content differs from what was last written are sent
+        existing = [grant for key, grant in by_key.items()
+                    if known[key] is not None and (stored[key] is None or stored[key] != hashes[key])]
+        if not new and not existing:
+            return {"unchanged": len(grants)}
+        now = datetime.utcnow().isoformat()
         
-        logger.info(f"Database update complete: {new_grants} new grants, {updated_grants} updated grants")
+        try:
+            ids = {}
+            # New and existing rows go in separate requests: only new rows set created_at, and
+            # PostgREST requires every row of a bulk request to have the same columns
+            for batch, is_new in ((new, True), (existing, False)):
+                if not batch:
+                    continue
+                rows = [self.grant_row(grant, now, is_new) for grant in batch]
+                result = self.supabase.table('grants').upsert(rows, on_conflict='name,funder').execute()
+                for row in result.data:
+                    ids[(row['name'], row['funder'])] = row['id']
+            
+            metadata = [self.metadata_row(grant, ids[key], hashes[key]) for key, grant in by_key.items() if key in ids]
+            if metadata:
+                self.supabase.table('grant_metadata').upsert(metadata, on_conflict='grant_id').execute()
+        except Exception as e:
+            # e.g. the unique index on grants(name, funder) has not been created yet
+            logger.error(f"Bulk upsert of {len(by_key)} grants failed, writing them one by one: {str(e)}")
+            return dict(Counter(self.upsert_grant(grant) for grant in grants))
+        
+        with self.grant_ids_lock:
+            self.grant_ids.update(ids)
+            if self.grant_hashes is not None:
+                for key, grant_id in ids.items():
+                    self.grant_hashes[grant_id] = hashes[key]
+                    self.closed_ids.discard(grant_id)
+        return {"new": len(new), "changed": len(existing), "unchanged": len(grants) - len(new) - len(existing)}
+    
+    @timed()
+    def mark_removed(self, seen: Set[Tuple[str, str]], sources: Set[str]) -> int:
+        """Record discovered grants no longer listed by a source crawled this run as closed; returns how many"""
+        # Only completely crawled sources count, so a page that failed to load does not close its grants
+        with self.grant_ids_lock:
+            removed = [grant_id for key, grant_id in self.grant_ids.items()
+                       if key[1] in sources and key not in seen and grant_id in self.grant_hashes
+                       and grant_id not in self.closed_ids]
+        if not removed:
+            return 0
+        
+        now = datetime.utcnow().isoformat()
+        try:
+            for start in range(0, len(removed), self.batch_size):
+                # Partial rows: the upsert only touches these columns of the existing metadata
+                rows = [{'grant_id': grant_id, 'urgency': 'Closed', 'closed_at': now, 'content_hash': None}
+                        for grant_id in removed[start:start + self.batch_size]]
+                self.supabase.table('grant_metadata').upsert(rows, on_conflict='grant_id').execute()
+        except Exception as e:
+            logger.error(f"Error closing {len(removed)} removed grants: {str(e)}")
+            return 0
+        
+        with self.grant_ids_lock:
+            for grant_id in removed:
+                self.grant_hashes[grant_id] = None
+                self.closed_ids.add(grant_id)
+        return len(removed)
     
-    async def store_grant_metadata(self, grant: Grant, grant_id: int = None):
+    @timed()
+    def delete_grants(self, keys: Set[Tuple[str, str]]) -> int:
+        """Delete the grants with these (name, funder) keys; returns how many"""
+        with self.grant_ids_lock:
+            deleted = [self.grant_ids[key] for key in keys if key in self.grant_ids]
+        if not deleted:
+            return 0
+        
+        try:
+            for start in range(0, len(deleted), self.batch_size):
+                # Metadata and any other rows referencing a grant go with it (ON DELETE CASCADE)
+                self.supabase.table('grants').delete().in_('id', deleted[start:start + self.batch_size]).execute()
+        except Exception as e:
+            logger.error(f"Error deleting {len(deleted)} superseded grants: {str(e)}")
+            return 0
+        
+        with self.grant_ids_lock:
+            for key in keys:
+                grant_id = self.grant_ids.pop(key, None)
+                if self.grant_hashes is not None:
+                    self.grant_hashes.pop(grant_id, None)
+        return len(deleted)
+    
+    def grant_row(self, grant: Grant, now: str, is_new: bool) -> Dict:
+        """The grants table row for a discovered grant"""
+        row = {
+            'name': grant.title,
+            'funder': grant.source,
+            'description': grant.summary,
+            'amount_string': grant.amount,
+            'due_date': self.parse_date(grant.due_date),
+            'status': 'potential',
+            'source_url': grant.url,
+            'updated_at': now
+        }
+        if is_new:
+            row['created_at'] = now
+        return row
+    
+    def metadata_row(self, grant: Grant, grant_id: int, content_hash: Optional[str] = None) -> Dict:
+        """The grant_metadata row for a discovered grant; writing it reopens a closed grant"""
+        return {
+            'grant_id': grant_id,
+            **self.metadata_fields(grant),
+            'discovery_date': datetime.utcnow().isoformat(),
+            'content_hash': content_hash or self.content_hash(grant),
+            'closed_at': None
+        }
+    
+    def metadata_fields(self, grant: Grant) -> Dict:
+        """The grant_metadata columns that describe the grant itself"""
+        return {
+            'tags': list(grant.tags),
+            'relevance_score': grant.score,
+            'urgency': grant.urgency,
+            'grant_type': grant.grant_type,
+            'eligibility_text': grant.eligibility,
+            'pdf_url': grant.pdf_url,
+            'estimated_eligibility': grant.estimated_eligibility,
+            'recurrence': grant.recurrence,
+            'notes': grant.notes
+        }
+    
+    def content_hash(self, grant: Grant) -> str:
+        """Hash of the grant's row and metadata content with timestamps left out and whitespace normalized"""
+        content = {**self.grant_row(grant, "", is_new=False), **self.metadata_fields(grant)}
+        del content['updated_at']
+        content['tags'] = sorted(content['tags'])
+        normalized = {key: WHITESPACE.sub(' ', value).strip() if isinstance(value, str) else value
+                      for key, value in content.items()}
+        encoded = json.dumps(normalized, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+    
+    @timed()
+    def upsert_grant(self, grant: Grant) -> str:
+        """Insert or update one grant and its metadata one request at a time; returns new, changed or failed"""
+        try:
+            # Check if grant already exists (by title and source)
+            existing = self.supabase.table('grants').select('id').eq('name', grant.title).eq('funder', grant.source).execute()
+            
+            grant_data = self.grant_row(grant, datetime.utcnow().isoformat(), is_new=not existing.data)
+            
+            if existing.data:
+                # Update existing grant
+                self.supabase.table('grants').update(grant_data).eq('id', existing.data[0]['id']).execute()
+                outcome = "changed"
+            else:
+                # Insert new grant
+                self.supabase.table('grants').insert(grant_data).execute()
+                outcome = "new"
+                
+            # Store additional metadata in a separate table
+            self.store_grant_metadata(grant, existing.data[0]['id'] if existing.data else None)
+            return outcome
+            
+        except Exception as e:
+            logger.error(f"Error updating grant {grant.title}: {str(e)}")
+            return "failed"
+    
+    @timed()
+    def store_grant_metadata(self, grant: Grant, grant_id: int = None):
         """Store additional grant metadata like tags, scores, etc."""
         try:
             # Get the grant ID if not provided
@@ -98,19 +429,7 @@ class GrantDiscoveryIntegration:
                 else:
                     return
             
-            metadata = {
-                'grant_id': grant_id,
-                'tags': grant.tags,
-                'relevance_score': grant.score,
-                'urgency': grant.urgency,
-                'grant_type': grant.grant_type,
-                'eligibility_text': grant.eligibility,
-                'pdf_url': grant.pdf_url,
-                'estimated_eligibility': grant.estimated_eligibility,
-                'recurrence': grant.recurrence,
-                'discovery_date': datetime.utcnow().isoformat(),
-                'notes': grant.notes
-            }
+            metadata = self.metadata_row(grant, grant_id)
             
             # Check if metadata already exists
             existing_meta = self.supabase.table('grant_metadata').select('id').eq('grant_id', grant_id).execute()
@@ -125,15 +444,11 @@ class GrantDiscoveryIntegration:
         except Exception as e:
             logger.error(f"Error storing metadata for grant {grant.title}: {str(e)}")
     
-    def parse_date(self, date_string: str) -> str:
-        """Parse date string to ISO format"""
-        if "not specified" in date_string.lower():
-            return None
-        
-        # This would need more robust date parsing
-        # For now, return the original string
-        return date_string
+    def parse_date(self, date_string: str) -> Optional[str]:
+        """Parse date string to ISO format (the deadline for ranges, None for rolling or unknown dates)"""
+        return normalize_date(date_string)
     
+    @timed()
     async def generate_discovery_report(self, grants: List[Grant]):
         """Generate a discovery report for dashboard display"""
         logger.info("Generating discovery report...")
@@ -171,12 +486,16 @@ class GrantDiscoveryIntegration:
                     'tags': g.tags
                 }
                 for g in sorted(grants, key=lambda x: x.score, reverse=True)[:20]
-            ]
+            ],
+            # new/changed/unchanged/removed/failed grant counts from the database sync
+            'database_changes': dict(self.sync_counts),
+            # Where the run spent its time; the report's own timing lands in the metrics file
+            'metrics': self.metrics.summary() if self.metrics.enabled else None
         }
         
         # Store report in database
         try:
-            self.supabase.table('discovery_reports').insert(report).execute()
+            await self.storage.execute(self.supabase.table('discovery_reports').insert(report))
             logger.info("Discovery report stored in database")
         except Exception as e:
             logger.error(f"Error storing discovery report: {str(e)}")
@@ -195,7 +514,8 @@ class GrantDiscoveryIntegration:
         # For demo purposes, we'll log what tables we need
         
         tables_needed = [
-            "grant_metadata - stores tags, scores, and additional grant data",
+            "grant_metadata - stores tags, scores, and additional grant data (unique grant_id)",
+            "grants unique index on (name, funder) - conflict target for bulk upserts",
             "discovery_reports - stores periodic discovery run summaries",
             "grant_tracking - tracks user interactions with discovered grants"
         ]
@@ -203,7 +523,7 @@ class GrantDiscoveryIntegration:
         for table in tables_needed:
             logger.info(f"Table needed: {table}")
 
-async def run_discovery_pipeline():
+async def run_discovery_pipeline(resume: bool = False, run_id: Optional[str] = None):
     """Run the complete grant discovery pipeline"""
     try:
         integration = GrantDiscoveryIntegration()
@@ -212,7 +532,7 @@ async def run_discovery_pipeline():
         await integration.setup_database_tables()
         
         # Run discovery and update
-        grants = await integration.discover_and_update_grants()
+        grants = await integration.discover_and_update_grants(resume=resume, run_id=run_id)
         
         print(f"\n🎉 Grant Discovery Complete!")
         print(f"📊 Total grants discovered: {len(grants)}")
@@ -239,4 +559,9 @@ if __name__ == "__main__":
     # os.environ['SUPABASE_URL'] = 'your-supabase-url'
     # os.environ['SUPABASE_SERVICE_KEY'] = 'your-service-key'
     
-    asyncio.run(run_discovery_pipeline()) 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Discover grants and update the grants database")
+    parser.add_argument("--resume", nargs="?", const="", metavar="RUN_ID",
+                        help="continue an interrupted run (the most recent one unless RUN_ID is given)")
+    args = parser.parse_args()
+    
+    asyncio.run(run_discovery_pipeline(resume=args.resume is not None, run_id=args.resume or None))
\ No newline at end of file
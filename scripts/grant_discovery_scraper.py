@@ -6,44 +6,183 @@ Automatically discovers and extracts grant opportunities from Australian governm
 
 import asyncio
 import aiohttp
-import json
-import csv
+import codecs
+import os
+import time
 import re
 from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
-from typing import List, Dict, Optional, Set
+from typing import AsyncIterator, Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple, Union
 from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
+import hashlib
+import json
 import logging
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
+from rate_limiter import HostRateLimiter
+from grant_model import GRANT_FIELDS, Grant
+from http_cache import HTTPCache
+from http_client import HTTPClientConfig, PoolStats, create_session
+from pipeline_metrics import MetricsRegistry, timed
+from domain_health import (
+    MAX_RETRY_AFTER, RETRY_STATUSES, DomainHealthTracker, backoff_delay, parse_retry_after
+)
+from html_backends import DEFAULT_BACKEND, get_parser_backend
+from keyword_matcher import KeywordMatcher
+from near_duplicates import NearDuplicateGroups, group_near_duplicates
+from page_fingerprints import PageFingerprintStore, page_fingerprint
+from run_journal import RunJournal
+from crawl_frontier import CrawlBudget, CrawlFrontier, CrawlRequest, is_candidate_link, is_pagination_link
+from grant_exporters import export_grants, export_grants_async, load_grants_columnar
+from date_normalization import deadline_urgency
+from streaming_extraction import StreamingCandidateParser, etree as streaming_etree
+from guideline_pdfs import (
+    AMOUNT_CONTEXT, DEADLINE_CONTEXT, DEFAULT_MAX_PDF_PAGES, PDFTextCache, PdfReader, content_hash,
+    extract_pdf_text, find_guideline_pdf, is_pdf_url, sentences_matching
+)
+from field_extraction import (
+    AMOUNT_NOT_SPECIFIED, DATE_NOT_SPECIFIED, ELIGIBILITY_NOT_SPECIFIED, ExtractedFields, extract_fields,
+    scan_amount_and_date, split_sentences, summarize, eligibility_from
+)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+GRANTS_GOV_ITEM_CLASS = re.compile(r'grant|funding|opportunity', re.I)
+GRANTS_GOV_TITLE_CLASS = re.compile(r'title|heading|name', re.I)
+CREATIVE_ITEM_CLASS = re.compile(r'funding|grant|program', re.I)
+CREATIVE_TITLE_CLASS = re.compile(r'title|heading', re.I)
+GENERIC_ITEM_STRING = re.compile(r'grant|funding|application', re.I)
+
+# Frontier priorities: landing pages first, then links by predicted relevance, shallower first
+SEED_PRIORITY = 1000.0
+LISTING_LINK_BONUS = 30.0
+DEPTH_PENALTY = 10.0
+
+READ_CHUNK_BYTES = 64 * 1024
+
+@dataclass
+class StreamedPage:
+    """A listing page parsed incrementally while it downloaded; its body was never held in memory"""
+    grants: List[Grant] = field(default_factory=list)
+    links: List[Tuple[str, str]] = field(default_factory=list)
+
 @dataclass
-class Grant:
-    title: str
-    source: str
-    amount: str
-    due_date: str
-    summary: str
-    eligibility: str
-    tags: List[str]
-    url: str
-    pdf_url: str = ""
-    score: int = 0
-    notes: str = ""
-    grant_type: str = ""
-    open_date: str = ""
-    recurrence: str = ""
-    urgency: str = ""
-    estimated_eligibility: str = ""
+class PageGone:
+    """A page the server answered with a definitive 4xx: it no longer exists, so the crawl missed nothing"""
+    status: int
+
+@dataclass
+class CrawlSummary:
+    """What a crawl_pages run has established so far; finished seeds will yield no more pages"""
+    finished_seeds: Set[int] = field(default_factory=set)
+    # Seeds with a page that failed to load (transport error, 5xx, open circuit) or extract, or with pages
+    # cut by a page budget
+    incomplete_seeds: Set[int] = field(default_factory=set)
+    # Every grant extracted, by (title, source), before duplicates across pages and sources are dropped
+    extracted: Dict[Tuple[str, str], Grant] = field(default_factory=dict)
+    source_seeds: Dict[str, Set[int]] = field(default_factory=dict)
+    # Grants scrape_stream yielded before a seed that finished later supplied the copy kept of their duplicates
+    superseded: List[Grant] = field(default_factory=list)
+
+    def complete_sources(self) -> Set[str]:
+        """Sources whose every seed finished with nothing missed, so a grant they no longer list is gone"""
+        return {source for source, seeds in self.source_seeds.items()
+                if seeds <= self.finished_seeds and not seeds & self.incomplete_seeds}
+
+# Bump when extraction or scoring logic changes so stored page results are not reused
+EXTRACTOR_VERSION = 3
 
 class GrantDiscoveryScraper:
-    def __init__(self):
+    def __init__(self, max_concurrency: int = 5, per_host_rate: float = 1.0, per_host_burst: float = 1.0,
+                 http_cache: Optional[HTTPCache] = None, extraction_workers: int = 0,
+                 offload_min_bytes: int = 64 * 1024, parser_backend: str = DEFAULT_BACKEND,
+                 fuzzy_dedup: bool = False, dedup_threshold: float = 0.7,
+                 fingerprint_store: Optional[PageFingerprintStore] = None, crawl_depth: int = 0,
+                 max_pages_per_domain: int = 50, domain_budgets: Optional[Dict[str, CrawlBudget]] = None,
+                 extract_concurrency: Optional[int] = None, stage_queue_size: int = 32,
+                 http_config: Optional[HTTPClientConfig] = None, domain_health: Optional[DomainHealthTracker] = None,
+                 max_retries: int = 2, retry_backoff: float = 0.5,
+                 max_body_bytes: int = 20 * 1024 * 1024, stream_min_bytes: Optional[int] = 2 * 1024 * 1024,
+                 metrics: Optional[MetricsRegistry] = None, guideline_pdfs: bool = False,
+                 pdf_cache: Optional[PDFTextCache] = None, pdf_workers: int = 2, pdf_concurrency: int = 4,
+                 max_pdf_bytes: int = 15 * 1024 * 1024, max_pdf_pages: int = DEFAULT_MAX_PDF_PAGES,
+                 pdf_timeout: float = 300.0, run_journal: Optional[RunJournal] = None):
         self.session = None
+        
+        # Per-stage timers and counters; disabled unless a registry is passed in
+        self.metrics = metrics if metrics is not None else MetricsRegistry(enabled=False)
+        self.http_config = http_config
+        self.pool_stats = PoolStats()
+        
+        # Idempotent GETs are retried with jittered exponential backoff; the health tracker adds
+        # latency-based timeouts and skips hosts whose circuit breaker is open
+        self.domain_health = domain_health
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        
+        # Bodies are read in chunks and abandoned past max_body_bytes; listing pages growing past
+        # stream_min_bytes are parsed incrementally instead of buffered (needs lxml; None disables).
+        # Incremental parsing runs on stream_pool threads and its fragments are extracted in the
+        # process pool when there is one, so a large listing never blocks the event loop
+        self.max_body_bytes = max_body_bytes
+        self.stream_min_bytes = stream_min_bytes if streaming_etree is not None else None
+        self.stream_pool = None
         self.discovered_grants = []
+        self.http_cache = http_cache
+        
+        # Pages whose normalised content hash is unchanged reuse last run's grants
+        self.fingerprint_store = fingerprint_store
+        
+        # Every extracted page is journaled before its grants are yielded; pages the journal's run
+        # already extracted (before a crash) are replayed from it instead of being fetched again
+        self.run_journal = run_journal
+        
+        # Guideline PDFs linked from detail pages feed eligibility, amount and due date. Up to
+        # pdf_concurrency downloads run at once; text is extracted in a process pool (the extraction
+        # pool when there is one) and cached by content hash. Downloads get pdf_timeout seconds, since a
+        # large PDF takes far longer than the pages the host's timeout is learned from. Needs pypdf
+        self.guideline_pdfs = guideline_pdfs and PdfReader is not None
+        if guideline_pdfs and PdfReader is None:
+            logger.warning("pypdf is not installed; guideline PDFs will not be fetched")
+        self.pdf_cache = pdf_cache
+        self.pdf_workers = max(1, pdf_workers)
+        self.pdf_concurrency = max(1, pdf_concurrency)
+        self.max_pdf_bytes = max_pdf_bytes
+        self.max_pdf_pages = max_pdf_pages
+        self.pdf_timeout = pdf_timeout
+        self.pdf_pool = None
+        self.pdf_semaphore: Optional[asyncio.Semaphore] = None
+        self.pdf_tasks: Dict[str, asyncio.Future] = {}
+        
+        # Parse/extract/score pages in a process pool when extraction_workers > 0;
+        # pages smaller than offload_min_bytes are cheaper to handle in-process
+        self.extraction_workers = extraction_workers
+        self.offload_min_bytes = offload_min_bytes
+        self.process_pool = None
+        
+        # HTML parser used by every extractor ("html.parser", "lxml" or "selectolax")
+        self.parser_backend = parser_backend
+        self.parser = get_parser_backend(parser_backend)
+        
+        # Fuzzy dedup also collapses near-identical listings of the same program across sites
+        self.fuzzy_dedup = fuzzy_dedup
+        self.dedup_threshold = dedup_threshold
+        
+        # Crawl settings: overall cap on in-flight fetches and a token bucket per host
+        self.max_concurrency = max(1, max_concurrency)
+        
+        # Fetched pages wait in a bounded queue for extract_concurrency extract/score workers
+        # (defaults to one per extraction process, or one when extracting in-process)
+        self.extract_concurrency = max(1, extract_concurrency or extraction_workers or 1)
+        self.stage_queue_size = stage_queue_size
+        self.rate_limiter = HostRateLimiter(rate=per_host_rate, burst=per_host_burst)
+        
+        # Follow pagination and detail links up to crawl_depth hops from each landing page,
+        # at most max_pages_per_domain pages per host; domain_budgets overrides both per host
+        self.crawl_budget = CrawlBudget(max_depth=crawl_depth, max_pages=max_pages_per_domain)
+        self.domain_budgets = domain_budgets or {}
         self.priority_domains = [
             "https://www.grants.gov.au",
             "https://business.gov.au/grants-and-programs",
@@ -81,65 +220,228 @@ class GrantDiscoveryScraper:
                           "youth empowerment", "environmental resilience", "creative innovation"],
             "eligibility_types": ["independent companies", "creative collectives", "social enterprises"]
         }
+        
+        # Extra tags added on top of the keyword categories
+        self.tag_rules = {
+            "Documentary": ["documentary", "film", "video"],
+            "Business": ["startup", "entrepreneur", "business"],
+            "Research": ["research", "development", "pilot"]
+        }
+        
+        # Relevance weights, matched ignoring spaces
+        self.focus_area_weights = {
+            "documentary": 25,
+            "digital storytelling": 25,
+            "social impact": 20,
+            "first nations": 25,  # Increased due to established partnerships
+            "youth": 15,
+            "environmental": 15,
+            "creative innovation": 15,
+            "media": 20,
+            "arts": 15
+        }
+        self.eligibility_terms = ["independent", "creative collective", "social enterprise", "nfp", "not-for-profit"]
+        
+        # Built lazily from the vocabularies above; call refresh_keyword_matcher() after changing them
+        self.keyword_matcher: Optional[KeywordMatcher] = None
+
+    SCORING_ATTRIBUTES = ("keywords", "org_profile", "tag_rules", "focus_area_weights", "eligibility_terms")
 
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=30),
-            headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-        )
+        if self.extraction_workers > 0:
+            self.process_pool = ProcessPoolExecutor(
+                max_workers=self.extraction_workers,
+                initializer=_init_extraction_worker,
+                initargs=({name: getattr(self, name) for name in self.SCORING_ATTRIBUTES}, self.parser_backend,
+                          self.metrics.enabled)
+            )
+        if self.stream_min_bytes is not None:
+            self.stream_pool = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="stream")
+        if self.guideline_pdfs:
+            self.pdf_pool = self.process_pool or ProcessPoolExecutor(max_workers=self.pdf_workers)
+            self.pdf_semaphore = asyncio.Semaphore(self.pdf_concurrency)
+        self.session = create_session(self.http_config, self.pool_stats)
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         if self.session:
+            pool = self.pool_stats.as_dict()
+            logger.info(f"HTTP connection pool: {pool}")
+            for name in ("requests", "new_connections", "reused_connections", "queued_for_slot"):
+                self.metrics.increment(f"http_{name}", pool[name])
             await self.session.close()
+        if self.http_cache:
+            self.http_cache.close()
+        if self.domain_health:
+            logger.info(f"Domain health: {self.domain_health.stats}")
+            self.domain_health.close()
+        if self.fingerprint_store:
+            logger.info(f"Page fingerprints: {self.fingerprint_store.stats}")
+            self.fingerprint_store.close()
+        if self.pdf_cache:
+            logger.info(f"Guideline PDF cache: {self.pdf_cache.stats}")
+            self.pdf_cache.close()
+        if self.pdf_pool and self.pdf_pool is not self.process_pool:
+            self.pdf_pool.shutdown()
+        if self.stream_pool:
+            self.stream_pool.shutdown()
+        if self.process_pool:
+            self.process_pool.shutdown()
+
+    @timed()
+    async def fetch_page(self, url: str,
+                         request: Optional[CrawlRequest] = None) -> Union[str, StreamedPage, PageGone, None]:
+        """Fetch a webpage with retries, revalidating against the HTTP cache and skipping failing domains.
+
+        With a crawl request, a listing page larger than stream_min_bytes comes back as a StreamedPage.
+        A definitive 4xx comes back as PageGone; None means the page could not be loaded.
+        """
+        cached = self.http_cache.get(url) if self.http_cache else None
+        if cached and self.http_cache.is_fresh(cached):
+            self.http_cache.record_hit(url)
+            self.metrics.increment("fetch_cache_hits")
+            return cached.body
+        
+        health = self.domain_health
+        if health and health.is_open(url):
+            # A stale copy beats nothing while the domain is cooling down
+            logger.warning(f"Circuit open for {urlparse(url).netloc}, skipping {url}")
+            self.metrics.increment("fetch_circuit_skips")
+            return cached.body if cached else None
+        
+        headers = self.http_cache.conditional_headers(cached) if self.http_cache else {}
+        
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self.metrics.increment("fetch_retries")
+                if health:
+                    health.stats["retries"] += 1
+                await asyncio.sleep(delay)
+            delay = backoff_delay(attempt, self.retry_backoff)
+            
+            await self.rate_limiter.acquire(url)
+            started = time.monotonic()
+            try:
+                async with self.session.get(url, headers=headers, timeout=self.request_timeout(url)) as response:
+                    if response.status == 304 and cached:
+                        self.http_cache.record_hit(url, revalidated=True)
+                        self.metrics.increment("fetch_revalidated")
+                        body = cached.body
+                    elif response.status == 200:
+                        body = await self.read_body(response, url, request)
+                        if isinstance(body, str) and self.http_cache:
+                            self.http_cache.record_miss()
+                            self.http_cache.store(url, body, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+                    elif response.status in RETRY_STATUSES:
+                        logger.warning(f"HTTP {response.status} for {url} (attempt {attempt + 1})")
+                        retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                        if retry_after is not None:
+                            if retry_after > MAX_RETRY_AFTER:
+                                # Not worth waiting for in this run; skip the domain until then
+                                if health:
+                                    health.open_circuit(url, retry_after)
+                                return None
+                            delay = retry_after
+                        continue
+                    else:
+                        logger.warning(f"HTTP {response.status} for {url}")
+                        if health:
+                            health.record_success(url, time.monotonic() - started)  # The host itself is up
+                        return PageGone(response.status) if 400 <= response.status < 500 else None
+                    
+                    if health:
+                        health.record_success(url, time.monotonic() - started)
+                    return body or None
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.warning(f"Error fetching {url} (attempt {attempt + 1}): {str(e) or type(e).__name__}")
+            except Exception as e:
+                logger.error(f"Error fetching {url}: {str(e)}")
+                return None
+        
+        logger.error(f"Giving up on {url} after {self.max_retries + 1} attempts")
+        self.metrics.increment("fetch_failures")
+        if health:
+            health.record_failure(url)
+        return None
 
-    async def fetch_page(self, url: str) -> Optional[str]:
-        """Fetch a webpage with error handling"""
+    async def read_body(self, response: aiohttp.ClientResponse, url: str,
+                        request: Optional[CrawlRequest] = None) -> Union[str, StreamedPage, None]:
+        """Read a response in chunks with incremental decoding, switching to streaming extraction for large listings"""
         try:
-            async with self.session.get(url) as response:
-                if response.status == 200:
-                    return await response.text()
-                else:
-                    logger.warning(f"HTTP {response.status} for {url}")
+            decoder = codecs.getincrementaldecoder(response.charset or 'utf-8')(errors='replace')
+        except LookupError:
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        can_stream = self.stream_min_bytes is not None and request is not None and request.is_listing
+        loop = asyncio.get_running_loop()
+        parts: List[str] = []
+        size = 0
+        streamer = None
+        
+        async for chunk in response.content.iter_chunked(READ_CHUNK_BYTES):
+            size += len(chunk)
+            if size > self.max_body_bytes:
+                logger.warning(f"{url} exceeds {self.max_body_bytes} bytes, "
+                               f"{'keeping what was parsed so far' if streamer else 'skipping it'}")
+                if streamer is None:
                     return None
-        except Exception as e:
-            logger.error(f"Error fetching {url}: {str(e)}")
+                break
+            text = decoder.decode(chunk)
+            if streamer is not None:
+                await loop.run_in_executor(self.stream_pool, streamer.feed, text)
+                continue
+            parts.append(text)
+            if can_stream and size > self.stream_min_bytes:
+                logger.info(f"Streaming large page {url}")
+                self.metrics.increment("pages_streamed")
+                streamer = self.page_streamer(request)
+                await loop.run_in_executor(self.stream_pool, streamer.feed, "".join(parts))
+                parts = []
+        
+        self.metrics.increment("bytes_downloaded", size)
+        tail = decoder.decode(b"", final=True)
+        if streamer is not None:
+            await loop.run_in_executor(self.stream_pool, streamer.feed, tail)
+            return await loop.run_in_executor(self.stream_pool, streamer.finish)
+        return "".join(parts) + tail
+
+    def request_timeout(self, url: str) -> Optional[aiohttp.ClientTimeout]:
+        """Per-request timeout adapted to the host's observed latency (session default without a tracker)"""
+        if not self.domain_health:
             return None
+        session_timeout = self.session.timeout
+        return aiohttp.ClientTimeout(total=self.domain_health.timeout_for(url),
+                                     sock_connect=session_timeout.sock_connect, sock_read=session_timeout.sock_read)
 
-    def extract_grants_from_grants_gov_au(self, html: str, base_url: str) -> List[Grant]:
+    @timed()
+    def extract_grants_from_grants_gov_au(self, html: str, base_url: str, soup=None) -> List[Grant]:
         """Extract grants from grants.gov.au"""
         grants = []
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = soup if soup is not None else self.parser.parse(html)
         
         # Look for grant listings (this would need to be customized based on actual site structure)
-        grant_items = soup.find_all(['div', 'article'], class_=re.compile(r'grant|funding|opportunity', re.I))
+        grant_items = self.parser.find_all(soup, ['div', 'article'], class_pattern=GRANTS_GOV_ITEM_CLASS)
         
         for item in grant_items:
             try:
-                title_elem = item.find(['h1', 'h2', 'h3', 'h4'], class_=re.compile(r'title|heading|name', re.I))
-                title = title_elem.get_text(strip=True) if title_elem else "Unknown Grant"
+                title_elem = self.parser.find(item, ['h1', 'h2', 'h3', 'h4'], class_pattern=GRANTS_GOV_TITLE_CLASS)
+                title = self.parser.get_text(title_elem, strip=True) if title_elem else "Unknown Grant"
                 
                 # Extract other details
-                amount = self.extract_amount(item.get_text())
-                due_date = self.extract_date(item.get_text())
-                summary = self.extract_summary(item.get_text())
-                url = self.extract_url(item, base_url)
+                fields = self.extract_fields(item, title, tags_from_summary=True)
                 
                 grant = Grant(
                     title=title,
                     source="grants.gov.au",
-                    amount=amount,
-                    due_date=due_date,
-                    summary=summary,
-                    eligibility=self.extract_eligibility(item.get_text()),
-                    tags=self.generate_tags(title + " " + summary),
-                    url=url
+                    amount=fields.amount,
+                    due_date=fields.due_date,
+                    summary=fields.summary,
+                    eligibility=fields.eligibility,
+                    tags=fields.tags,
+                    url=self.extract_url(item, base_url)
                 )
                 
                 grant.score = self.calculate_relevance_score(grant)
-                grant.urgency = self.calculate_urgency(due_date)
+                grant.urgency = self.calculate_urgency(grant.due_date)
                 grants.append(grant)
                 
             except Exception as e:
@@ -148,30 +450,32 @@ class GrantDiscoveryScraper:
         
         return grants
 
-    def extract_grants_from_creative_gov_au(self, html: str, base_url: str) -> List[Grant]:
+    @timed()
+    def extract_grants_from_creative_gov_au(self, html: str, base_url: str, soup=None) -> List[Grant]:
         """Extract grants from creative.gov.au"""
         grants = []
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = soup if soup is not None else self.parser.parse(html)
         
         # Creative Australia specific selectors
-        funding_items = soup.find_all(['div', 'section'], class_=re.compile(r'funding|grant|program', re.I))
+        funding_items = self.parser.find_all(soup, ['div', 'section'], class_pattern=CREATIVE_ITEM_CLASS)
         
         for item in funding_items:
             try:
-                title_elem = item.find(['h1', 'h2', 'h3'], class_=re.compile(r'title|heading', re.I))
+                title_elem = self.parser.find(item, ['h1', 'h2', 'h3'], class_pattern=CREATIVE_TITLE_CLASS)
                 if not title_elem:
                     continue
                     
-                title = title_elem.get_text(strip=True)
+                title = self.parser.get_text(title_elem, strip=True)
+                fields = self.extract_fields(item, title)
                 
                 grant = Grant(
                     title=title,
                     source="Creative Australia",
-                    amount=self.extract_amount(item.get_text()),
-                    due_date=self.extract_date(item.get_text()),
-                    summary=self.extract_summary(item.get_text()),
-                    eligibility=self.extract_eligibility(item.get_text()),
-                    tags=self.generate_tags(title + " " + item.get_text()),
+                    amount=fields.amount,
+                    due_date=fields.due_date,
+                    summary=fields.summary,
+                    eligibility=fields.eligibility,
+                    tags=fields.tags,
                     url=self.extract_url(item, base_url),
                     grant_type="Arts & Culture"
                 )
@@ -186,179 +490,582 @@ class GrantDiscoveryScraper:
         
         return grants
 
+    @timed()
+    def extract_fields(self, item, title: str, tags_from_summary: bool = False) -> ExtractedFields:
+        """Extract amount, date, summary, eligibility and tags from an item in a single pass"""
+        return extract_fields(self.parser.get_text(item), title, self.generate_tags, tags_from_summary)
+
     def extract_amount(self, text: str) -> str:
         """Extract funding amount from text"""
-        # Look for currency patterns
-        amount_patterns = [
-            r'\$[\d,]+(?:\.\d{2})?(?:\s*(?:million|mil|k|thousand))?',
-            r'(?:up to|maximum of|max)\s*\$[\d,]+',
-            r'[\d,]+\s*(?:dollars|AUD)',
-        ]
-        
-        for pattern in amount_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return match.group(0).strip()
-        
-        return "Amount not specified"
+        return scan_amount_and_date(text)[0]
 
     def extract_date(self, text: str) -> str:
         """Extract due date from text"""
-        # Look for date patterns
-        date_patterns = [
-            r'\d{1,2}[/-]\d{1,2}[/-]\d{4}',
-            r'\d{4}[/-]\d{1,2}[/-]\d{1,2}',
-            r'\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4}',
-            r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{1,2},?\s+\d{4}',
-        ]
-        
-        for pattern in date_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return match.group(0).strip()
-        
-        return "Date not specified"
+        return scan_amount_and_date(text)[1]
 
     def extract_summary(self, text: str, max_length: int = 200) -> str:
         """Extract a summary from text"""
-        # Clean text
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        # Look for description-like content
-        sentences = re.split(r'[.!?]+', text)
-        summary = ""
-        
-        for sentence in sentences:
-            if len(summary + sentence) <= max_length:
-                summary += sentence.strip() + ". "
-            else:
-                break
-        
-        return summary.strip() or text[:max_length] + "..."
+        return summarize(text, split_sentences(text), max_length)
 
     def extract_eligibility(self, text: str) -> str:
         """Extract eligibility information"""
-        eligibility_keywords = [
-            "eligible", "eligibility", "criteria", "requirements", 
-            "must be", "applicants", "who can apply"
-        ]
-        
-        sentences = re.split(r'[.!?]+', text)
-        eligibility_sentences = []
-        
-        for sentence in sentences:
-            if any(keyword in sentence.lower() for keyword in eligibility_keywords):
-                eligibility_sentences.append(sentence.strip())
-        
-        return ". ".join(eligibility_sentences[:3]) if eligibility_sentences else "Eligibility criteria not specified"
+        return eligibility_from(split_sentences(text))
 
+    @timed()
     def extract_url(self, element, base_url: str) -> str:
         """Extract URL from element"""
-        link = element.find('a', href=True)
-        if link:
-            href = link['href']
+        href = self.parser.link_href(element)
+        if href is not None:
             if href.startswith('http'):
                 return href
             else:
                 return urljoin(base_url, href)
         return base_url
 
+    def refresh_keyword_matcher(self) -> KeywordMatcher:
+        """Compile keywords, tag rules, focus areas and eligibility terms into one matcher"""
+        matcher = KeywordMatcher()
+        for category, keywords in self.keywords.items():
+            for keyword in keywords:
+                matcher.add(keyword, ("category", category))
+        for tag, words in self.tag_rules.items():
+            for word in words:
+                matcher.add(word, ("tag", tag))
+        for area in self.focus_area_weights:
+            matcher.add(area, ("focus", area), ignore_spaces=True)
+        for term in self.eligibility_terms:
+            matcher.add(term, ("eligibility", None))
+        matcher.build()
+        
+        self.keyword_matcher = matcher
+        return matcher
+
+    def match_keywords(self, text: str) -> set:
+        """All keyword hits in lower-cased text, in a single pass"""
+        matcher = self.keyword_matcher or self.refresh_keyword_matcher()
+        return matcher.scan(text.lower())
+
     def generate_tags(self, text: str) -> List[str]:
         """Generate tags based on content"""
         tags = set()
-        text_lower = text.lower()
+        hits = self.match_keywords(text)
         
-        for category, keywords in self.keywords.items():
-            if any(keyword in text_lower for keyword in keywords):
+        for category in self.keywords:
+            if ("category", category) in hits:
                 tags.add(category.replace('_', ' ').title())
         
         # Additional specific tags
-        if any(word in text_lower for word in ['documentary', 'film', 'video']):
-            tags.add('Documentary')
-        if any(word in text_lower for word in ['startup', 'entrepreneur', 'business']):
-            tags.add('Business')
-        if any(word in text_lower for word in ['research', 'development', 'pilot']):
-            tags.add('Research')
+        for tag in self.tag_rules:
+            if ("tag", tag) in hits:
+                tags.add(tag)
         
         return list(tags)
 
+    @timed()
     def calculate_relevance_score(self, grant: Grant) -> int:
         """Calculate relevance score (0-100) based on Shadow Goose Entertainment profile"""
         score = 0
-        text = (grant.title + " " + grant.summary + " " + grant.eligibility).lower()
+        hits = self.match_keywords(grant.title + " " + grant.summary + " " + grant.eligibility)
         
         # Score based on focus areas
-        focus_area_weights = {
-            "documentary": 25,
-            "digital storytelling": 25,
-            "social impact": 20,
-            "first nations": 25,  # Increased due to established partnerships
-            "youth": 15,
-            "environmental": 15,
-            "creative innovation": 15,
-            "media": 20,
-            "arts": 15
-        }
-        
-        for area, weight in focus_area_weights.items():
-            if area.replace(" ", "") in text.replace(" ", ""):
+        for area, weight in self.focus_area_weights.items():
+            if ("focus", area) in hits:
                 score += weight
         
         # Bonus for eligibility match
-        eligibility_terms = ["independent", "creative collective", "social enterprise", "nfp", "not-for-profit"]
-        if any(term in text for term in eligibility_terms):
+        if ("eligibility", None) in hits:
             score += 15
         
         # Cap at 100
         return min(score, 100)
 
     def calculate_urgency(self, due_date: str) -> str:
-        """Calculate urgency based on due date"""
-        if "not specified" in due_date.lower():
-            return "Unknown"
+        """Calculate urgency from the days left until the due date"""
+        return deadline_urgency(due_date)
+
+    def extract_page(self, html: str, domain: str, soup=None) -> List[Grant]:
+        """Parse a page and run the extractor matching its domain"""
+        if "grants.gov.au" in domain:
+            return self.extract_grants_from_grants_gov_au(html, domain, soup)
+        elif "creative.gov.au" in domain:
+            return self.extract_grants_from_creative_gov_au(html, domain, soup)
+        else:
+            # Generic extractor for other sites
+            return self.extract_grants_generic(html, domain, soup)
+
+    @timed()
+    def extract_grant_detail(self, html: str, url: str, soup=None) -> List[Grant]:
+        """Extract the single grant described by a detail page"""
+        soup = soup if soup is not None else self.parser.parse(html)
+        title_elem = self.parser.find(soup, ['h1'])
+        title = self.parser.get_text(title_elem, strip=True) if title_elem else ""
+        if len(title) <= 10:  # Filter out noise
+            return []
         
+        content = self.parser.find(soup, ['main']) or self.parser.find(soup, ['article']) or soup
+        fields = self.extract_fields(content, title)
+        host = urlparse(url).netloc
+        grant = Grant(
+            title=title,
+            source="grants.gov.au" if "grants.gov.au" in host else
+                   "Creative Australia" if "creative.gov.au" in host else host,
+            amount=fields.amount,
+            due_date=fields.due_date,
+            summary=fields.summary,
+            eligibility=fields.eligibility,
+            tags=fields.tags,
+            url=url,
+            # Guideline documents are often linked from a sidebar, so search the whole page
+            pdf_url=find_guideline_pdf(self.parser.links(soup), url)
+        )
+        grant.score = self.calculate_relevance_score(grant)
+        grant.urgency = self.calculate_urgency(grant.due_date)
+        return [grant]
+
+    def streaming_rules(self, url: str) -> Dict:
+        """Candidate rules mirroring extract_page's routing, for StreamingCandidateParser"""
+        if "grants.gov.au" in url:
+            return {"tag_names": ['div', 'article'], "class_pattern": GRANTS_GOV_ITEM_CLASS}
+        elif "creative.gov.au" in url:
+            return {"tag_names": ['div', 'section'], "class_pattern": CREATIVE_ITEM_CLASS}
+        return {"tag_names": ['div', 'article', 'section'], "string_pattern": GENERIC_ITEM_STRING,
+                "max_candidates": 10}
+
+    def page_streamer(self, request: CrawlRequest) -> "PageStreamer":
+        return PageStreamer(self, request)
+
+    @timed()
+    def extract_links(self, soup, page_url: str) -> List[Tuple[str, str]]:
+        """Same-host links that look like grant detail pages or further listing pages"""
+        return self.filter_links(self.parser.links(soup), page_url)
+
+    def filter_links(self, raw_links: Iterable[Tuple[str, str]], page_url: str) -> List[Tuple[str, str]]:
+        host = urlparse(page_url).netloc.lower()
+        links = []
+        for href, text in raw_links:
+            url = urljoin(page_url, href)
+            parts = urlparse(url)
+            # PDFs are fetched as guideline documents, never crawled as pages
+            if (parts.scheme in ('http', 'https') and parts.netloc.lower() == host and not is_pdf_url(url)
+                    and is_candidate_link(url, text)):
+                links.append((url, text))
+        return links
+
+    def process_page(self, html: str, url: str, is_listing: bool = True,
+                     collect_links: bool = False) -> Tuple[List[Grant], List[Tuple[str, str]]]:
+        """Extract grants and, when the crawl goes deeper, outgoing links from one parse of the page"""
+        with self.metrics.timer("parse"):
+            soup = self.parser.parse(html)
+        if is_listing:
+            grants = self.extract_page(html, url, soup)
+        else:
+            grants = self.extract_grant_detail(html, url, soup)
+        links = self.extract_links(soup, url) if collect_links else []
+        return grants, links
+
+    async def run_extraction(self, html: str, url: str, is_listing: bool = True,
+                             collect_links: bool = False) -> Tuple[List[Grant], List[Tuple[str, str]]]:
+        """Process a page, off the event loop when a process pool is configured"""
+        if self.process_pool is None or len(html) < self.offload_min_bytes:
+            return self.process_page(html, url, is_listing, collect_links)
+        
+        loop = asyncio.get_running_loop()
+        grants, links, worker_metrics = await loop.run_in_executor(
+            self.process_pool, _extract_in_worker, html, url, is_listing, collect_links)
+        self.metrics.merge(worker_metrics)
+        return grants, links
+
+    async def fetch_pdf(self, url: str) -> Optional[Tuple[Optional[bytes], Optional[str], Optional[str]]]:
+        """Download a PDF within max_pdf_bytes as (body, ETag, Last-Modified); body is None on 304, None on failure.
+
+        PDF downloads are left out of the host's health record: their latency would inflate its page timeout,
+        and a slow PDF says nothing about whether its pages load.
+        """
+        if self.domain_health and self.domain_health.is_open(url):
+            return None
+        headers = self.pdf_cache.conditional_headers(url) if self.pdf_cache else {}
+        session_timeout = self.session.timeout
+        timeout = aiohttp.ClientTimeout(total=self.pdf_timeout, sock_connect=session_timeout.sock_connect,
+                                        sock_read=session_timeout.sock_read)
+        
+        await self.rate_limiter.acquire(url)
         try:
-            # Try to parse date (this would need more robust date parsing)
-            # For now, return based on keywords
-            if any(word in due_date.lower() for word in ['urgent', 'soon', 'asap']):
-                return "Hot"
-            elif any(word in due_date.lower() for word in ['this month', 'next week']):
-                return "Hot"
-            else:
-                return "Normal"
-        except:
-            return "Unknown"
+            async with self.session.get(url, headers=headers, timeout=timeout) as response:
+                validators = (response.headers.get('ETag'), response.headers.get('Last-Modified'))
+                if response.status == 304:
+                    return (None, *validators)
+                if response.status != 200:
+                    logger.warning(f"HTTP {response.status} for guideline PDF {url}")
+                    return None
+                if response.content_length is not None and response.content_length > self.max_pdf_bytes:
+                    logger.warning(f"Guideline PDF {url} is {response.content_length} bytes, skipping it")
+                    self.metrics.increment("pdfs_too_large")
+                    return None
+                
+                chunks = []
+                size = 0
+                async for chunk in response.content.iter_chunked(READ_CHUNK_BYTES):
+                    size += len(chunk)
+                    if size > self.max_pdf_bytes:
+                        logger.warning(f"Guideline PDF {url} exceeds {self.max_pdf_bytes} bytes, skipping it")
+                        self.metrics.increment("pdfs_too_large")
+                        return None
+                    chunks.append(chunk)
+                data = b"".join(chunks)
+                
+                self.metrics.increment("pdf_bytes_downloaded", size)
+                if b"%PDF" not in data[:1024]:
+                    logger.warning(f"{url} is not a PDF")
+                    return None
+                return (data, *validators)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning(f"Error fetching guideline PDF {url}: {str(e) or type(e).__name__}")
+            return None
 
-    async def scrape_all_sources(self) -> List[Grant]:
-        """Scrape all priority domains"""
-        all_grants = []
+    async def guideline_text(self, url: str) -> str:
+        """Text of a guideline PDF; each URL is downloaded and parsed at most once per run"""
+        task = self.pdf_tasks.get(url)
+        if task is None:
+            task = self.pdf_tasks[url] = asyncio.ensure_future(self.load_guideline_text(url))
+        # Shielded so one cancelled caller does not cancel the download others are waiting on
+        return await asyncio.shield(task)
+
+    @timed()
+    async def load_guideline_text(self, url: str) -> str:
+        """Download a guideline PDF and return its text, parsing it in the pool only if its content hash is new"""
+        async with self.pdf_semaphore:
+            fetched = await self.fetch_pdf(url)
+        if fetched is None:
+            return ""
+        data, etag, last_modified = fetched
+        if data is None:  # 304 Not Modified
+            return (self.pdf_cache.text_for_url(url) if self.pdf_cache else None) or ""
+        
+        digest = content_hash(data)
+        text = self.pdf_cache.text_for_hash(digest) if self.pdf_cache else None
+        if text is not None:
+            self.metrics.increment("pdf_cache_hits")
+            self.pdf_cache.store(url, digest, None, etag, last_modified)
+            return text
+        
+        # Parsing a large PDF takes seconds of CPU, so it never runs on the event loop
+        loop = asyncio.get_running_loop()
+        with self.metrics.timer("extract_pdf_text"):
+            text = await loop.run_in_executor(self.pdf_pool, extract_pdf_text, data, self.max_pdf_pages)
+        self.metrics.increment("pdfs_parsed")
+        if self.pdf_cache:
+            # Unreadable PDFs are cached too (as ""), so they are not re-parsed every run
+            self.pdf_cache.store(url, digest, text, etag, last_modified)
+        return text
+
+    async def enrich_from_guidelines(self, grants: List[Grant]) -> List[Grant]:
+        """Fill eligibility, amount and due date from each grant's guideline PDF, downloading them concurrently"""
+        if not self.guideline_pdfs or self.pdf_pool is None:
+            return grants
+        
+        targets = [grant for grant in grants if grant.pdf_url or is_pdf_url(grant.url)]
+        texts = await asyncio.gather(*(self.guideline_text(grant.pdf_url or grant.url) for grant in targets))
+        for grant, text in zip(targets, texts):
+            if not grant.pdf_url:
+                grant.pdf_url = grant.url
+            if text:
+                self.apply_guideline_text(grant, text)
+        return grants
+
+    def apply_guideline_text(self, grant: Grant, text: str):
+        """Guideline eligibility replaces the listing snippet's; amount and date only fill gaps in the listing"""
+        before = (grant.eligibility, grant.amount, grant.due_date)
+        
+        eligibility = self.extract_eligibility(text)
+        if eligibility != ELIGIBILITY_NOT_SPECIFIED:
+            grant.eligibility = eligibility
         
-        for domain in self.priority_domains:
-            logger.info(f"Scraping {domain}...")
+        sentences = split_sentences(text)
+        if grant.amount == AMOUNT_NOT_SPECIFIED:
+            amount = self.extract_amount(sentences_matching(sentences, AMOUNT_CONTEXT))
+            if amount != AMOUNT_NOT_SPECIFIED:
+                grant.amount = amount
+        if grant.due_date == DATE_NOT_SPECIFIED:
+            due_date = self.extract_date(sentences_matching(sentences, DEADLINE_CONTEXT))
+            if due_date != DATE_NOT_SPECIFIED:
+                grant.due_date = due_date
+        
+        if (grant.eligibility, grant.amount, grant.due_date) != before:
+            grant.score = self.calculate_relevance_score(grant)
+            grant.urgency = self.calculate_urgency(grant.due_date)
+
+    def extraction_signature(self) -> str:
+        """Identifies the extractor configuration that produced stored page results"""
+        profile = {name: getattr(self, name) for name in self.SCORING_ATTRIBUTES}
+        profile.update(version=EXTRACTOR_VERSION, parser_backend=self.parser_backend)
+        return hashlib.sha256(json.dumps(profile, sort_keys=True).encode('utf-8')).hexdigest()
+
+    async def extract_fetched(self, request: CrawlRequest,
+                              html: str) -> Optional[Tuple[List[Grant], List[Tuple[str, str]]]]:
+        """Extract grants and candidate links from a fetched page, reusing stored results if it is unchanged.
+
+        Returns None if extraction failed.
+        """
+        url = request.url
+        try:
+            if self.fingerprint_store:
+                page_hash = page_fingerprint(html)
+                signature = self.extraction_signature()
+                previous = self.fingerprint_store.lookup(url, page_hash, signature)
+                if previous is not None:
+                    stored_grants, links = previous
+                    grants = [Grant.from_dict(data) for data in stored_grants]
+                    # Urgency depends on today's date, not just the page
+                    for grant in grants:
+                        grant.urgency = self.calculate_urgency(grant.due_date)
+                    await self.enrich_from_guidelines(grants)
+                    logger.info(f"Unchanged page, reusing {len(grants)} grants from {url}")
+                    self.metrics.increment("pages_unchanged")
+                    return grants, links
             
-            try:
-                html = await self.fetch_page(domain)
-                if not html:
+            # Links are always stored so a later, deeper crawl can reuse unchanged pages
+            budget = self.domain_budgets.get(urlparse(url).netloc.lower(), self.crawl_budget)
+            collect_links = self.fingerprint_store is not None or request.depth < budget.max_depth
+            grants, links = await self.run_extraction(html, url, request.is_listing, collect_links)
+            # Stored enriched, so a reused page only differs from its stored grants if a PDF changed
+            await self.enrich_from_guidelines(grants)
+            
+            if self.fingerprint_store:
+                self.fingerprint_store.store(url, page_hash, signature, [g.to_dict() for g in grants], links)
+            
+            logger.info(f"Found {len(grants)} grants from {url}")
+            self.metrics.increment("pages_extracted")
+            self.metrics.increment("grants_extracted", len(grants))
+            return grants, links
+            
+        except Exception as e:
+            logger.error(f"Error scraping {url}: {str(e)}")
+            self.metrics.increment("extraction_errors")
+            return None
+
+    def predict_link_relevance(self, url: str, anchor_text: str, is_listing: bool) -> float:
+        """Relevance estimate for an unfetched page from its anchor text and URL path"""
+        words = re.sub(r'[/_\-.?=&]+', ' ', urlparse(url).path) + " " + anchor_text
+        hits = self.match_keywords(words)
+        score = sum(weight for area, weight in self.focus_area_weights.items() if ("focus", area) in hits)
+        if ("eligibility", None) in hits:
+            score += 15
+        # Further listing pages usually hold several grants each
+        return min(score, 100) + (LISTING_LINK_BONUS if is_listing else 0.0)
+
+    def journal_page(self, request: CrawlRequest, grants: List[Grant], links: List[Tuple[str, str]]):
+        if self.run_journal:
+            self.run_journal.record_page(request.url, [grant.to_dict() for grant in grants], links)
+    
+    def enqueue_links(self, frontier: CrawlFrontier, request: CrawlRequest, links: List[Tuple[str, str]]) -> int:
+        """Add a page's outgoing links to the frontier one hop deeper; returns how many were queued"""
+        queued = 0
+        for url, text in links:
+            is_listing = request.is_listing and is_pagination_link(url, text)
+            priority = self.predict_link_relevance(url, text, is_listing) - DEPTH_PENALTY * (request.depth + 1)
+            queued += frontier.push(url, depth=request.depth + 1, priority=priority,
+                                    seed_index=request.seed_index, is_listing=is_listing)
+        return queued
+
+    async def crawl_pages(self, summary: Optional[CrawlSummary] = None, report_finished: bool = False
+                          ) -> AsyncIterator[Tuple[Optional[CrawlRequest], List[Grant]]]:
+        """Crawl from the priority domains, yielding each page's grants as soon as it is extracted.
+
+        Fetch workers (max_concurrency) pull from a priority frontier and hand pages to extract/score
+        workers (extract_concurrency) through bounded queues, so a slow consumer slows the crawl
+        instead of buffering it. A seed is added to summary.finished_seeds once all of its pages
+        have been yielded, and to summary.incomplete_seeds if any of its pages were missed. With
+        report_finished, (None, []) is also yielded each time a seed finishes.
+        """
+        summary = summary if summary is not None else CrawlSummary()
+        frontier = CrawlFrontier(self.crawl_budget, self.domain_budgets)
+        # Pages queued or in flight per seed; a page's links are queued before it is finished, so a
+        # seed at zero is done
+        outstanding: Dict[int, int] = {}
+        for index, domain in enumerate(self.priority_domains):
+            if frontier.push(domain, depth=0, priority=SEED_PRIORITY, seed_index=index):
+                outstanding[index] = 1
+            else:
+                summary.finished_seeds.add(index)
+        
+        fetched: asyncio.Queue = asyncio.Queue(self.stage_queue_size)
+        extracted: asyncio.Queue = asyncio.Queue(self.stage_queue_size)
+        in_flight = 0
+        changed = asyncio.Condition()
+        
+        async def finish_page(request: CrawlRequest):
+            nonlocal in_flight
+            async with changed:
+                in_flight -= 1
+                outstanding[request.seed_index] -= 1
+                seed_done = outstanding[request.seed_index] == 0
+                changed.notify_all()
+            if seed_done:
+                # Queued behind the seed's last page, so the consumer sees every page before this
+                await extracted.put((None, request.seed_index))
+        
+        def enqueue_links(request: CrawlRequest, links: List[Tuple[str, str]]):
+            outstanding[request.seed_index] += self.enqueue_links(frontier, request, links)
+        
+        async def fetch_worker():
+            nonlocal in_flight
+            while True:
+                async with changed:
+                    # An empty frontier only means done once no page in flight can add links
+                    while not frontier and in_flight:
+                        await changed.wait()
+                    if not frontier:
+                        return
+                    request = frontier.pop()
+                    in_flight += 1
+                
+                journaled = self.run_journal.page(request.url) if self.run_journal else None
+                if journaled is not None:
+                    # Extracted before this run was interrupted
+                    try:
+                        stored_grants, links = journaled
+                        enqueue_links(request, links)
+                        self.metrics.increment("pages_replayed")
+                        await extracted.put((request, [Grant.from_dict(data) for data in stored_grants]))
+                    finally:
+                        await finish_page(request)
                     continue
                 
-                # Route to appropriate extractor based on domain
-                if "grants.gov.au" in domain:
-                    grants = self.extract_grants_from_grants_gov_au(html, domain)
-                elif "creative.gov.au" in domain:
-                    grants = self.extract_grants_from_creative_gov_au(html, domain)
+                logger.info(f"Scraping {request.url}...")
+                page = await self.fetch_page(request.url, request)
+                if isinstance(page, StreamedPage):
+                    # Already extracted while downloading; not cached or fingerprinted
+                    try:
+                        grants = await self.enrich_from_guidelines(page.grants)
+                        self.journal_page(request, grants, page.links)
+                        enqueue_links(request, page.links)
+                        await extracted.put((request, grants))
+                    finally:
+                        await finish_page(request)
+                elif isinstance(page, PageGone):
+                    # e.g. a dead detail link; its grant is gone, which removal should record
+                    self.metrics.increment("pages_gone")
+                    await finish_page(request)
+                elif page:
+                    await fetched.put((request, page))
                 else:
-                    # Generic extractor for other sites
-                    grants = self.extract_grants_generic(html, domain)
-                
-                all_grants.extend(grants)
-                logger.info(f"Found {len(grants)} grants from {domain}")
-                
-                # Rate limiting
-                await asyncio.sleep(1)
-                
-            except Exception as e:
-                logger.error(f"Error scraping {domain}: {str(e)}")
-                continue
+                    summary.incomplete_seeds.add(request.seed_index)
+                    await finish_page(request)
+        
+        async def extract_worker():
+            while True:
+                item = await fetched.get()
+                if item is None:
+                    return
+                request, html = item
+                try:
+                    result = await self.extract_fetched(request, html)
+                    if result is None:
+                        # Not journaled, so a resumed run fetches the page again
+                        summary.incomplete_seeds.add(request.seed_index)
+                        continue
+                    grants, links = result
+                    self.journal_page(request, grants, links)
+                    enqueue_links(request, links)
+                    await extracted.put((request, grants))
+                finally:
+                    await finish_page(request)
+        
+        fetchers = [asyncio.ensure_future(fetch_worker()) for _ in range(self.max_concurrency)]
+        extractors = [asyncio.ensure_future(extract_worker()) for _ in range(self.extract_concurrency)]
+        
+        async def run_stages():
+            try:
+                await asyncio.gather(*fetchers)
+                for _ in extractors:
+                    await fetched.put(None)
+                await asyncio.gather(*extractors)
+            finally:
+                await extracted.put(None)
+        
+        stages = asyncio.ensure_future(run_stages())
+        pages = 0
+        try:
+            while True:
+                item = await extracted.get()
+                if item is None:
+                    break
+                request, grants = item
+                if request is None:
+                    summary.finished_seeds.add(grants)
+                    if report_finished:
+                        yield None, []
+                    continue
+                for grant in grants:
+                    summary.extracted[(grant.title, grant.source)] = grant
+                    summary.source_seeds.setdefault(grant.source, set()).add(request.seed_index)
+                pages += 1
+                yield item
+            await stages
+            summary.incomplete_seeds |= frontier.truncated_seeds
+        finally:
+            for task in [stages, *fetchers, *extractors]:
+                task.cancel()
+        
+        logger.info(f"Crawled {pages} pages across {len(frontier.pages_per_domain)} domains")
+        self.metrics.increment("pages_crawled", pages)
+
+    async def scrape_stream(self, summary: Optional[CrawlSummary] = None) -> AsyncIterator[Grant]:
+        """Yield deduplicated grants source by source, as soon as each priority domain's crawl finishes.
+
+        A finished seed's pages are sorted by depth and discovery order like scrape_all_sources, so the copy
+        kept of a duplicate never depends on which page arrived first. Across sources the copy kept is also
+        scrape_all_sources' one: the earliest source's, or the canonical copy of a near-duplicate group. Seeds
+        are not held back behind slower ones, so when a seed finishing later supplies the copy kept, the copy
+        already yielded is added to summary.superseded.
+        """
+        summary = summary if summary is not None else CrawlSummary()
+        group_of = self.duplicate_groups()
+        # The copy kept so far of each group of duplicates, ranked by (seed, depth, sequence, position)
+        kept: Dict[Hashable, Tuple[Tuple[int, int, int, int], Grant]] = {}
+        pending: Dict[int, List[Tuple[int, int, List[Grant]]]] = {}
+        
+        def release(seed_index: int) -> List[Grant]:
+            # By id: a copy this seed replaces with a better one of its own is dropped without being yielded
+            released: Dict[int, Grant] = {}
+            for depth, sequence, grants in sorted(pending.pop(seed_index, []), key=lambda page: page[:2]):
+                for position, grant in enumerate(grants):
+                    with self.metrics.timer("deduplicate_stream"):
+                        group, joined = group_of(grant)
+                        copies = sorted([kept.pop(earlier) for earlier in joined]
+                                        + [((seed_index, depth, sequence, position), grant)], key=lambda copy: copy[0])
+                        # Ties go to the lowest rank, so the winner is the same whatever order seeds finish in
+                        winner = self.choose_canonical([copy for _, copy in copies]) if self.fuzzy_dedup else copies[0][1]
+                        kept[group] = next(copy for copy in copies if copy[1] is winner)
+                    self.metrics.increment("duplicates_dropped", len(copies) - 1)
+                    for _, copy in copies:
+                        if copy is not winner and copy is not grant and released.pop(id(copy), None) is None:
+                            summary.superseded.append(copy)
+                    if winner is grant:
+                        released[id(grant)] = grant
+            return list(released.values())
+        
+        async for request, grants in self.crawl_pages(summary, report_finished=True):
+            if request is not None:
+                pending.setdefault(request.seed_index, []).append((request.depth, request.sequence, grants))
+            for seed_index in sorted(summary.finished_seeds & pending.keys()):
+                for grant in release(seed_index):
+                    yield grant
+        
+        for seed_index in sorted(pending):
+            for grant in release(seed_index):
+                yield grant
+
+    async def scrape_all_sources(self) -> List[Grant]:
+        """Crawl all priority domains and return unique grants sorted by relevance"""
+        # Results are ordered by source position, then depth and discovery order,
+        # so dedup keeps the same winner as a serial crawl
+        results: List[Tuple[int, int, int, List[Grant]]] = []
+        async for request, grants in self.crawl_pages():
+            results.append((request.seed_index, request.depth, request.sequence, grants))
+        
+        results.sort(key=lambda result: result[:3])
+        all_grants = [grant for *_, grants in results for grant in grants]
         
         # Remove duplicates and sort by relevance score
         unique_grants = self.deduplicate_grants(all_grants)
@@ -366,27 +1073,29 @@ class GrantDiscoveryScraper:
         
         return sorted_grants
 
-    def extract_grants_generic(self, html: str, base_url: str) -> List[Grant]:
+    @timed()
+    def extract_grants_generic(self, html: str, base_url: str, soup=None) -> List[Grant]:
         """Generic grant extractor for unknown sites"""
         grants = []
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = soup if soup is not None else self.parser.parse(html)
         
         # Look for common grant-related patterns
-        potential_grants = soup.find_all(['div', 'article', 'section'], 
-                                       string=re.compile(r'grant|funding|application', re.I))
+        potential_grants = self.parser.find_all(soup, ['div', 'article', 'section'],
+                                                string_pattern=GENERIC_ITEM_STRING)
         
         for item in potential_grants[:10]:  # Limit to avoid noise
             try:
                 title = self.extract_title_generic(item)
                 if title and len(title) > 10:  # Filter out noise
+                    fields = self.extract_fields(item, title)
                     grant = Grant(
                         title=title,
                         source=urlparse(base_url).netloc,
-                        amount=self.extract_amount(item.get_text()),
-                        due_date=self.extract_date(item.get_text()),
-                        summary=self.extract_summary(item.get_text()),
-                        eligibility=self.extract_eligibility(item.get_text()),
-                        tags=self.generate_tags(title + " " + item.get_text()),
+                        amount=fields.amount,
+                        due_date=fields.due_date,
+                        summary=fields.summary,
+                        eligibility=fields.eligibility,
+                        tags=fields.tags,
                         url=self.extract_url(item, base_url)
                     )
                     
@@ -398,60 +1107,178 @@ class GrantDiscoveryScraper:
         
         return grants
 
+    @timed()
     def extract_title_generic(self, element) -> str:
         """Extract title from generic element"""
         # Try different heading tags
         for tag in ['h1', 'h2', 'h3', 'h4', 'h5']:
-            title_elem = element.find(tag)
+            title_elem = self.parser.find(element, [tag])
             if title_elem:
-                return title_elem.get_text(strip=True)
+                return self.parser.get_text(title_elem, strip=True)
         
         # Try link text
-        link = element.find('a')
+        link = self.parser.find(element, ['a'])
         if link:
-            return link.get_text(strip=True)
+            return self.parser.get_text(link, strip=True)
         
         return ""
 
+    def title_key(self, grant: Grant) -> str:
+        return re.sub(r'[^\w\s]', '', grant.title.lower()).strip()
+
+    @timed()
     def deduplicate_grants(self, grants: List[Grant]) -> List[Grant]:
         """Remove duplicate grants based on title similarity"""
+        if self.fuzzy_dedup:
+            return self.deduplicate_grants_fuzzy(grants)
+        
         unique_grants = []
         seen_titles = set()
         
         for grant in grants:
             # Simple deduplication based on title
-            title_key = re.sub(r'[^\w\s]', '', grant.title.lower()).strip()
+            title_key = self.title_key(grant)
             if title_key not in seen_titles:
                 seen_titles.add(title_key)
                 unique_grants.append(grant)
         
         return unique_grants
 
-    def export_to_csv(self, grants: List[Grant], filename: str = "australian_grants.csv"):
-        """Export grants to CSV"""
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = ['title', 'source', 'amount', 'due_date', 'summary', 
-                         'eligibility', 'tags', 'url', 'pdf_url', 'score', 'notes']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            
-            writer.writeheader()
-            for grant in grants:
-                row = asdict(grant)
-                row['tags'] = ', '.join(row['tags'])  # Convert list to string
-                writer.writerow(row)
+    def deduplicate_grants_fuzzy(self, grants: List[Grant]) -> List[Grant]:
+        """Collapse near-duplicates found by MinHash/LSH over title, summary and URL host"""
+        texts = [f"{g.title} {g.summary} {urlparse(g.url).netloc}" for g in grants]
+        groups = group_near_duplicates(texts, self.dedup_threshold,
+                                       exact_keys=[self.title_key(g) for g in grants])
+        return [self.choose_canonical([grants[i] for i in group]) for group in groups]
 
-    def export_to_json(self, grants: List[Grant], filename: str = "australian_grants.json"):
-        """Export grants to JSON"""
-        grants_data = [asdict(grant) for grant in grants]
+    def duplicate_groups(self) -> Callable[[Grant], Tuple[Hashable, List[Hashable]]]:
+        """Incremental dedup for streams: returns a function giving a grant's group of duplicates and the
+        groups seen before that it joins (merged into that one)"""
+        if self.fuzzy_dedup:
+            near_duplicates = NearDuplicateGroups(self.dedup_threshold)
+            return lambda g: near_duplicates.add(f"{g.title} {g.summary} {urlparse(g.url).netloc}", self.title_key(g))
+        
+        seen_titles = set()
+        
+        def group_of(grant: Grant) -> Tuple[Hashable, List[Hashable]]:
+            title_key = self.title_key(grant)
+            if title_key in seen_titles:
+                return title_key, [title_key]
+            seen_titles.add(title_key)
+            return title_key, []
         
-        with open(filename, 'w', encoding='utf-8') as jsonfile:
-            json.dump(grants_data, jsonfile, indent=2, ensure_ascii=False)
+        return group_of
+
+    def choose_canonical(self, duplicates: List[Grant]) -> Grant:
+        """Pick the record to keep: highest score, then most fields filled in, then smallest URL and title"""
+        if len(duplicates) == 1:
+            return duplicates[0]
+        
+        def completeness(grant: Grant) -> int:
+            return sum(1 for value in grant.to_tuple()
+                       if value and "not specified" not in str(value).lower())
+        
+        return min(duplicates, key=lambda g: (-g.score, -completeness(g), g.url, g.title))
+
+    CSV_FIELDS = ['title', 'source', 'amount', 'due_date', 'summary',
+                  'eligibility', 'tags', 'url', 'pdf_url', 'score', 'notes']
+
+    def export_to_csv(self, grants: Iterable[Grant], filename: str = "australian_grants.csv"):
+        """Export grants to CSV (gzip/zstd compressed for .csv.gz / .csv.zst)"""
+        return export_grants(grants, filename, fieldnames=self.CSV_FIELDS, output_format="csv")
+
+    def export_to_json(self, grants: Iterable[Grant], filename: str = "australian_grants.json"):
+        """Export grants to JSON"""
+        return export_grants(grants, filename, output_format="json")
+
+    def export_to_ndjson(self, grants: Iterable[Grant], filename: str = "australian_grants.ndjson.gz"):
+        """Export grants as newline-delimited JSON, one grant per line"""
+        return export_grants(grants, filename, output_format="ndjson")
+
+    def export_to_parquet(self, grants: Iterable[Grant], filename: str = "australian_grants.parquet"):
+        """Export grants to a typed Parquet (or .arrow/.feather) file"""
+        return export_grants(grants, filename, fieldnames=list(GRANT_FIELDS))
+
+    def load_grants(self, filename: str = "australian_grants.parquet", columns: Optional[List[str]] = None):
+        """Load a Parquet/Arrow export into a DataFrame, optionally only some columns"""
+        return load_grants_columnar(filename, columns)
+
+    async def export_stream(self, grants: AsyncIterator[Grant], filename: str):
+        """Export grants from an async iterator as they arrive; format follows the filename suffix"""
+        return await export_grants_async(grants, filename, fieldnames=self.CSV_FIELDS)
+
+class PageStreamer:
+    """Runs the scraper's extractor on each candidate fragment of a page parsed incrementally.
+
+    With a process pool, each fed chunk's fragments are extracted there while parsing continues.
+    """
+
+    def __init__(self, scraper: GrantDiscoveryScraper, request: CrawlRequest):
+        self.scraper = scraper
+        self.url = request.url
+        budget = scraper.domain_budgets.get(urlparse(self.url).netloc.lower(), scraper.crawl_budget)
+        self.parser = StreamingCandidateParser(collect_links=request.depth < budget.max_depth,
+                                               **scraper.streaming_rules(self.url))
+        self.grants: List[Grant] = []
+        self.pending: List[Future] = []
+
+    def feed(self, text: str):
+        self._extract(self.parser.feed(text))
+
+    def finish(self) -> StreamedPage:
+        try:
+            self._extract(self.parser.close())
+        except Exception as e:  # A truncated or badly broken page still keeps what was extracted
+            logger.warning(f"Error finishing streamed page {self.url}: {str(e)}")
+        for future in self.pending:
+            grants, worker_metrics = future.result()
+            self.grants.extend(grants)
+            self.scraper.metrics.merge(worker_metrics)
+        links = self.scraper.filter_links(self.parser.links, self.url)
+        logger.info(f"Found {len(self.grants)} grants from {self.url}")
+        return StreamedPage(self.grants, links)
+
+    def _extract(self, fragments: List[str]):
+        if self.scraper.process_pool is not None and fragments:
+            self.pending.append(self.scraper.process_pool.submit(_extract_fragments_in_worker, fragments, self.url))
+            return
+        for fragment in fragments:
+            self.grants.extend(self.scraper.extract_page(fragment, self.url))
+
+# Extraction scraper held by each process-pool worker
+_worker_scraper: Optional[GrantDiscoveryScraper] = None
+
+def _init_extraction_worker(scoring_profile: Dict, parser_backend: str, metrics_enabled: bool = False):
+    """Build the per-process scraper used for offloaded extraction"""
+    global _worker_scraper
+    _worker_scraper = GrantDiscoveryScraper(parser_backend=parser_backend,
+                                            metrics=MetricsRegistry(enabled=metrics_enabled))
+    for name, value in scoring_profile.items():
+        setattr(_worker_scraper, name, value)
+    _worker_scraper.refresh_keyword_matcher()
+
+def _extract_in_worker(html: str, url: str, is_listing: bool, collect_links: bool):
+    """Process a page in a worker; its metrics since the last page travel back to be merged"""
+    grants, links = _worker_scraper.process_page(html, url, is_listing, collect_links)
+    metrics = _worker_scraper.metrics
+    return grants, links, metrics.drain() if metrics.enabled else None
+
+def _extract_fragments_in_worker(fragments: List[str], url: str):
+    """Extract a streamed page's candidate fragments in a worker, returning its metrics as _extract_in_worker does"""
+    grants = [grant for fragment in fragments for grant in _worker_scraper.extract_page(fragment, url)]
+    metrics = _worker_scraper.metrics
+    return grants, metrics.drain() if metrics.enabled else None
 
 async def main():
     """Main execution function"""
     logger.info("Starting Australian Grant Discovery Scraper...")
+    metrics = MetricsRegistry()
     
-    async with GrantDiscoveryScraper() as scraper:
+    async with GrantDiscoveryScraper(http_cache=HTTPCache(), fingerprint_store=PageFingerprintStore(),
+                                     domain_health=DomainHealthTracker(),
+                                     extraction_workers=os.cpu_count() or 1,
+                                     crawl_depth=2, max_pages_per_domain=200, metrics=metrics,
+                                     guideline_pdfs=True, pdf_cache=PDFTextCache()) as scraper:
         grants = await scraper.scrape_all_sources()
         
         logger.info(f"Total grants discovered: {len(grants)}")
@@ -464,6 +1291,10 @@ async def main():
         scraper.export_to_csv(grants, "australian_grants_full.csv")
         scraper.export_to_csv(high_relevance, "australian_grants_high_relevance.csv")
         scraper.export_to_json(grants, "australian_grants.json")
+        scraper.export_to_parquet(grants, "australian_grants_full.parquet")
+        
+        summary = metrics.summary()
+        logger.info(f"Slowest stage: {summary['slowest_stage']} ({summary['stages'].get(summary['slowest_stage'])})")
         
         # Print top 10 grants
         print("\n🏆 TOP 10 MOST RELEVANT GRANTS:")
@@ -474,6 +1305,9 @@ async def main():
             print(f"   Due: {grant.due_date} | Tags: {', '.join(grant.tags)}")
             print(f"   URL: {grant.url}")
             print("-" * 80)
+    
+    # Written after the scraper closes so the connection-pool counters are included
+    metrics.write("discovery_metrics.prom")
 
 if __name__ == "__main__":
     asyncio.run(main()) 
\ No newline at end of file
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Streaming Grant Exporters
+Write grants to CSV, JSON or NDJSON one record at a time, optionally gzip/zstd compressed,
+or to typed Parquet/Arrow files in record batches
+"""
+
+import csv
+import gzip
+import io
+import json
+from typing import AsyncIterable, BinaryIO, Dict, Iterable, List, Optional
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib encoder is used instead
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional; only needed for .zst output
+    zstandard = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional; only needed for Parquet/Arrow output
+    pa = None
+
+from date_normalization import parse_date_text
+from grant_model import GRANT_FIELDS
+
+COMPRESSION_SUFFIXES = {".gz": "gzip", ".zst": "zstd"}
+FORMAT_SUFFIXES = {".csv": "csv", ".json": "json", ".ndjson": "ndjson", ".jsonl": "ndjson",
+                   ".parquet": "parquet", ".arrow": "arrow", ".feather": "arrow"}
+
+# Low-cardinality text columns stored dictionary-encoded in columnar exports
+DICTIONARY_COLUMNS = {"source", "grant_type", "recurrence", "urgency"}
+# Free-text date columns that also get a parsed date32 companion column
+DATE_COLUMNS = {"due_date", "open_date"}
+
+def grant_to_dict(grant) -> Dict:
+    """Shallow field dict for a Grant"""
+    return grant.to_dict()
+
+def encode_json(record: Dict, indent: bool = False) -> bytes:
+    """UTF-8 JSON, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(record, indent=2 if indent else None, ensure_ascii=False,
+                      separators=None if indent else (',', ':')).encode('utf-8')
+
+def detect_format(filename: str) -> Dict[str, Optional[str]]:
+    """Infer output format and compression from suffixes like .ndjson.gz or .csv.zst"""
+    name = filename.lower()
+    compression = None
+    for suffix, codec in COMPRESSION_SUFFIXES.items():
+        if name.endswith(suffix):
+            compression = codec
+            name = name[:-len(suffix)]
+    output_format = next((fmt for suffix, fmt in FORMAT_SUFFIXES.items() if name.endswith(suffix)), None)
+    return {"format": output_format, "compression": compression}
+
+def open_output(filename: str, compression: Optional[str] = None) -> BinaryIO:
+    """Open a binary output stream, compressed as requested"""
+    if compression == "gzip":
+        return gzip.open(filename, 'wb')
+    if compression == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd compression requires the zstandard package")
+        return zstandard.ZstdCompressor().stream_writer(open(filename, 'wb'), closefd=True)
+    if compression:
+        raise ValueError(f"Unsupported compression: {compression}")
+    return open(filename, 'wb')
+
+class GrantWriter:
+    """Base streaming writer: write() one grant at a time, close() to finish the file"""
+
+    def __init__(self, filename: str, compression: Optional[str] = None):
+        self.filename = filename
+        self.stream = open_output(filename, compression)
+        self.count = 0
+
+    def write(self, grant):
+        raise NotImplementedError
+
+    def close(self):
+        self.stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+class CSVGrantWriter(GrantWriter):
+    def __init__(self, filename: str, fieldnames: List[str], compression: Optional[str] = None):
+        super().__init__(filename, compression)
+        self.fieldnames = fieldnames
+        self.tags_column = fieldnames.index('tags') if 'tags' in fieldnames else None
+        self.text = io.TextIOWrapper(self.stream, encoding='utf-8', newline='')
+        self.writer = csv.writer(self.text)
+        self.writer.writerow(fieldnames)
+
+    def write(self, grant):
+        row = grant.to_row(self.fieldnames)
+        if self.tags_column is not None:
+            row[self.tags_column] = ', '.join(row[self.tags_column])  # Convert tags to string
+        self.writer.writerow(row)
+        self.count += 1
+
+    def close(self):
+        self.text.close()
+
+class NDJSONGrantWriter(GrantWriter):
+    def write(self, grant):
+        self.stream.write(encode_json(grant_to_dict(grant)) + b"\n")
+        self.count += 1
+
+class JSONArrayGrantWriter(GrantWriter):
+    """Streams the same indented JSON array that json.dump(..., indent=2) would produce"""
+
+    def write(self, grant):
+        self.stream.write(b"[\n  " if self.count == 0 else b",\n  ")
+        self.stream.write(encode_json(grant_to_dict(grant), indent=True).replace(b"\n", b"\n  "))
+        self.count += 1
+
+    def close(self):
+        self.stream.write(b"[]" if self.count == 0 else b"\n]")
+        super().close()
+
+def parsed_date_column(name: str, text: str):
+    """Parsed companion value: an open date range starts the window, a due date range ends it"""
+    parsed = parse_date_text(text or "")
+    return parsed.start if name == "open_date" else parsed.deadline
+
+def arrow_schema(grant_fields: List[str]):
+    """Typed Arrow schema for Grant fields: list-typed tags, integer score, parsed dates"""
+    columns = []
+    for name in grant_fields:
+        if name == "tags":
+            columns.append(pa.field(name, pa.list_(pa.dictionary(pa.int32(), pa.string()))))
+        elif name == "score":
+            columns.append(pa.field(name, pa.int32()))
+        elif name in DICTIONARY_COLUMNS:
+            columns.append(pa.field(name, pa.dictionary(pa.int32(), pa.string())))
+        else:
+            columns.append(pa.field(name, pa.string()))
+        if name in DATE_COLUMNS:
+            columns.append(pa.field(f"{name}_parsed", pa.date32()))
+    return pa.schema(columns)
+
+class ArrowGrantWriter(GrantWriter):
+    """Buffers grants into record batches and streams them to a Parquet or Arrow IPC file"""
+
+    def __init__(self, filename: str, output_format: str = "parquet", grant_fields: Optional[List[str]] = None,
+                 batch_size: int = 10000):
+        if pa is None:
+            raise RuntimeError("Parquet/Arrow export requires the pyarrow package")
+        self.filename = filename
+        self.output_format = output_format
+        self.batch_size = batch_size
+        self.count = 0
+        self.writer = None
+        # Without explicit fields the schema comes from the first grant written
+        self.grant_fields = list(grant_fields) if grant_fields else None
+        self.schema = arrow_schema(self.grant_fields) if grant_fields else None
+        self.columns: Dict[str, list] = {name: [] for name in self.schema.names} if self.schema else {}
+
+    def write(self, grant):
+        if self.schema is None:
+            self.grant_fields = list(grant.FIELDS)
+            self.schema = arrow_schema(self.grant_fields)
+            self.columns = {name: [] for name in self.schema.names}
+
+        for name, value in zip(self.grant_fields, grant.to_row(self.grant_fields)):
+            self.columns[name].append(value)
+            if name in DATE_COLUMNS:
+                self.columns[f"{name}_parsed"].append(parsed_date_column(name, value))
+        self.count += 1
+
+        if len(self.columns["title"]) >= self.batch_size:
+            self.flush()
+
+    def flush(self, final: bool = False):
+        if self.schema is None or (not self.columns["title"] and (self.writer or not final)):
+            return
+        batch = pa.record_batch([pa.array(self.columns[name], type=self.schema.field(name).type)
+                                 for name in self.schema.names], schema=self.schema)
+        if self.writer is None:
+            if self.output_format == "parquet":
+                self.writer = pq.ParquetWriter(self.filename, self.schema, compression="zstd")
+            else:
+                self.writer = pa.ipc.new_file(self.filename, self.schema)
+        self.writer.write_batch(batch)
+        self.columns = {name: [] for name in self.schema.names}
+
+    def close(self):
+        self.flush(final=True)
+        if self.writer is not None:
+            self.writer.close()
+
+def load_grants_columnar(filename: str, columns: Optional[List[str]] = None):
+    """Load a Parquet/Arrow grant export as a pandas DataFrame, reading only the requested columns"""
+    if pa is None:
+        raise RuntimeError("Loading Parquet/Arrow exports requires the pyarrow package")
+    if detect_format(filename)["format"] == "parquet":
+        table = pq.read_table(filename, columns=columns)
+    else:
+        table = feather.read_table(filename, columns=columns)
+    return table.to_pandas(date_as_object=False)
+
+def make_writer(filename: str, fieldnames: Optional[List[str]] = None, output_format: Optional[str] = None,
+                compression: Optional[str] = None) -> GrantWriter:
+    """Create the writer for a filename; format and compression default to its suffixes"""
+    detected = detect_format(filename)
+    output_format = output_format or detected["format"] or "ndjson"
+    compression = compression or detected["compression"]
+
+    if output_format == "csv":
+        return CSVGrantWriter(filename, fieldnames or list(GRANT_FIELDS), compression)
+    if output_format == "json":
+        return JSONArrayGrantWriter(filename, compression)
+    if output_format == "ndjson":
+        return NDJSONGrantWriter(filename, compression)
+    if output_format in ("parquet", "arrow"):
+        return ArrowGrantWriter(filename, output_format, grant_fields=fieldnames)
+    raise ValueError(f"Unsupported export format: {output_format}")
+
+def export_grants(grants: Iterable, filename: str, **options) -> int:
+    """Write grants from any iterable as they arrive; returns the number written"""
+    with make_writer(filename, **options) as writer:
+        for grant in grants:
+            writer.write(grant)
+    return writer.count
+
+async def export_grants_async(grants: AsyncIterable, filename: str, **options) -> int:
+    """Write grants from an async iterator as they arrive; returns the number written"""
+    with make_writer(filename, **options) as writer:
+        async for grant in grants:
+            writer.write(grant)
+    return writer.count
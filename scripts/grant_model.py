@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Grant Model
+Compact slotted grant record shared by the scraper, the demo generator and the Supabase integration
+"""
+
+from sys import intern
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+GRANT_FIELDS = (
+    "title", "source", "amount", "due_date", "summary", "eligibility", "tags", "url", "pdf_url", "score",
+    "notes", "grant_type", "open_date", "recurrence", "urgency", "estimated_eligibility",
+)
+# Low-cardinality values repeated across thousands of grants share one string object
+INTERNED_FIELDS = ("source", "amount", "due_date", "grant_type", "open_date", "recurrence", "urgency")
+
+def _intern(value):
+    return intern(value) if type(value) is str else value
+
+class Grant:
+    """A grant opportunity.
+
+    Uses __slots__ instead of a per-instance __dict__, interns repeated strings and stores tags as an
+    interned tuple. to_dict/to_row/to_tuple read the slots directly without copying nested values.
+    """
+
+    __slots__ = GRANT_FIELDS
+    FIELDS = GRANT_FIELDS
+
+    def __init__(self, title: str, source: str, amount: str, due_date: str, summary: str, eligibility: str,
+                 tags: Iterable[str], url: str, pdf_url: str = "", score: int = 0, notes: str = "",
+                 grant_type: str = "", open_date: str = "", recurrence: str = "", urgency: str = "",
+                 estimated_eligibility: str = ""):
+        self.title = title
+        self.source = _intern(source)
+        self.amount = _intern(amount)
+        self.due_date = _intern(due_date)
+        self.summary = summary
+        self.eligibility = eligibility
+        self.tags: Tuple[str, ...] = tuple(_intern(tag) for tag in tags)
+        self.url = url
+        self.pdf_url = pdf_url
+        self.score = score
+        self.notes = notes
+        self.grant_type = _intern(grant_type)
+        self.open_date = _intern(open_date)
+        self.recurrence = _intern(recurrence)
+        self.urgency = _intern(urgency)
+        self.estimated_eligibility = estimated_eligibility
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Grant":
+        """Build a grant from a dict of its fields, ignoring unknown keys"""
+        return cls(**{name: data[name] for name in GRANT_FIELDS if name in data})
+
+    def to_dict(self) -> Dict:
+        """Field dict sharing this grant's values (tags stay a tuple)"""
+        return {name: getattr(self, name) for name in GRANT_FIELDS}
+
+    def to_tuple(self) -> tuple:
+        """All field values in GRANT_FIELDS order; also the pickle form"""
+        return tuple(getattr(self, name) for name in GRANT_FIELDS)
+
+    def to_row(self, fieldnames: Sequence[str] = GRANT_FIELDS) -> List:
+        """Values for the requested fields, in order"""
+        return [getattr(self, name) for name in fieldnames]
+
+    def __reduce__(self):
+        return (Grant, self.to_tuple())
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.to_tuple() == other.to_tuple()
+
+    __hash__ = None  # Mutable, like the dataclass it replaces
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in GRANT_FIELDS)
+        return f"Grant({values})"
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Guideline PDF Text
+Finds a grant's guideline PDF among a detail page's links, extracts its text (in a worker process) and caches
+the result by content hash, so an unchanged PDF is only ever parsed once
+"""
+
+import hashlib
+import re
+import sqlite3
+import time
+from io import BytesIO
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # pypdf is optional; without it guideline PDFs are not fetched
+    PdfReader = None
+
+GUIDELINE_HINT = re.compile(r'guideline|guide|eligib|criteria|instructions|program\s+information|funding\s+rules', re.I)
+NOT_GUIDELINE_HINT = re.compile(r'annual\s+report|media\s+release|budget|newsletter|minutes|privacy', re.I)
+
+# Sentences worth scanning for the grant amount and the closing date; other dates in guidelines
+# (publication, version history, project windows) would otherwise win
+AMOUNT_CONTEXT = re.compile(r'grant|funding|up to|maximum|between|available|requested', re.I)
+DEADLINE_CONTEXT = re.compile(r'clos|deadline|due|submit|lodge', re.I)
+WHITESPACE = re.compile(r'\s+')
+
+DEFAULT_MAX_PDF_PAGES = 60
+
+def is_pdf_url(url: str) -> bool:
+    return urlparse(url).path.lower().endswith('.pdf')
+
+def find_guideline_pdf(links: Iterable[Tuple[str, str]], page_url: str) -> str:
+    """Best guideline PDF among a page's (href, text) links, or "" when there is none"""
+    best, best_rank = "", None
+    for position, (href, text) in enumerate(links):
+        url = urljoin(page_url, href)
+        if urlparse(url).scheme not in ('http', 'https') or not is_pdf_url(url):
+            continue
+        label = f"{text} {urlparse(url).path}"
+        if NOT_GUIDELINE_HINT.search(label):
+            continue
+        # Explicit guideline/eligibility documents first, then the first PDF on the page
+        rank = (0 if GUIDELINE_HINT.search(label) else 1, position)
+        if best_rank is None or rank < best_rank:
+            best, best_rank = url, rank
+    return best
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+def extract_pdf_text(data: bytes, max_pages: int = DEFAULT_MAX_PDF_PAGES) -> str:
+    """Plain text of the first max_pages pages, whitespace collapsed; "" if the PDF cannot be read.
+
+    Module-level so it can run in a ProcessPoolExecutor.
+    """
+    if PdfReader is None:
+        return ""
+    try:
+        reader = PdfReader(BytesIO(data))
+        if reader.is_encrypted:
+            reader.decrypt("")
+        pages = []
+        for page in reader.pages[:max_pages]:
+            pages.append(page.extract_text() or "")
+        return WHITESPACE.sub(' ', " ".join(pages)).strip()
+    except Exception:  # Malformed, encrypted or unsupported PDFs are common in the wild
+        return ""
+
+def sentences_matching(sentences: List[str], pattern) -> str:
+    return ". ".join(sentence for sentence in sentences if pattern.search(sentence))
+
+class PDFTextCache:
+    """SQLite-backed map of PDF content hash -> extracted text, plus each URL's validators and last hash"""
+
+    def __init__(self, path: str = ".http_cache/pdf_text.sqlite"):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.stats = {"hits": 0, "misses": 0, "revalidated": 0}
+
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS pdf_text (
+                content_hash TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                stored_at REAL NOT NULL
+            )
+        """)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS pdf_urls (
+                url TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    def text_for_hash(self, digest: str) -> Optional[str]:
+        row = self.conn.execute("SELECT text FROM pdf_text WHERE content_hash = ?", (digest,)).fetchone()
+        if row:
+            self.stats["hits"] += 1
+            return row[0]
+        self.stats["misses"] += 1
+        return None
+
+    def conditional_headers(self, url: str) -> dict:
+        """If-None-Match / If-Modified-Since for a PDF fetched on an earlier run"""
+        row = self.conn.execute("SELECT etag, last_modified FROM pdf_urls WHERE url = ?", (url,)).fetchone()
+        headers = {}
+        if row and row[0]:
+            headers['If-None-Match'] = row[0]
+        if row and row[1]:
+            headers['If-Modified-Since'] = row[1]
+        return headers
+
+    def text_for_url(self, url: str) -> Optional[str]:
+        """Text of the PDF last seen at this URL (after a 304 Not Modified)"""
+        row = self.conn.execute(
+            "SELECT t.text FROM pdf_urls u JOIN pdf_text t ON t.content_hash = u.content_hash WHERE u.url = ?", (url,)
+        ).fetchone()
+        if row:
+            self.stats["revalidated"] += 1
+            return row[0]
+        return None
+
+    def store(self, url: str, digest: str, text: Optional[str], etag: Optional[str] = None,
+              last_modified: Optional[str] = None):
+        """Record the URL's current content hash, and the text when it was just extracted"""
+        now = time.time()
+        if text is not None:
+            self.conn.execute("INSERT OR REPLACE INTO pdf_text (content_hash, text, stored_at) VALUES (?, ?, ?)",
+                              (digest, text, now))
+        self.conn.execute(
+            "INSERT OR REPLACE INTO pdf_urls (url, content_hash, etag, last_modified, fetched_at) VALUES (?, ?, ?, ?, ?)",
+            (url, digest, etag, last_modified, now)
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+HTML Parser Backends
+Lets the grant extractors run unchanged on html.parser, lxml or selectolax (lexbor) trees
+"""
+
+import logging
+from typing import List, Optional, Pattern, Tuple
+from bs4 import BeautifulSoup
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # selectolax is optional
+    LexborHTMLParser = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BACKEND = "html.parser"
+
+class SoupBackend:
+    """BeautifulSoup tree built by html.parser or lxml"""
+
+    def __init__(self, features: str = DEFAULT_BACKEND):
+        self.name = features
+        self.features = features
+
+    def parse(self, html: str):
+        return BeautifulSoup(html, self.features)
+
+    def find_all(self, node, names: List[str], class_pattern: Optional[Pattern] = None,
+                 string_pattern: Optional[Pattern] = None) -> list:
+        """Descendants with one of the tag names, optionally filtered by class or sole string"""
+        filters = {}
+        if class_pattern is not None:
+            filters['class_'] = class_pattern
+        if string_pattern is not None:
+            filters['string'] = string_pattern
+        return node.find_all(names, **filters)
+
+    def find(self, node, names: List[str], class_pattern: Optional[Pattern] = None):
+        if class_pattern is not None:
+            return node.find(names, class_=class_pattern)
+        return node.find(names)
+
+    def get_text(self, node, strip: bool = False) -> str:
+        return node.get_text(strip=strip)
+
+    def link_href(self, node) -> Optional[str]:
+        """href of the first descendant link that has one"""
+        link = node.find('a', href=True)
+        return link['href'] if link else None
+
+    def links(self, node) -> List[Tuple[str, str]]:
+        """(href, stripped anchor text) for every descendant link that has an href"""
+        return [(link['href'], link.get_text(strip=True)) for link in node.find_all('a', href=True)]
+
+class LexborBackend:
+    """selectolax (lexbor) tree, matched with CSS tag selectors and BeautifulSoup-compatible filters"""
+
+    name = "selectolax"
+
+    # BeautifulSoup leaves these strings out of get_text()
+    HIDDEN_TEXT_PARENTS = {'script', 'style', 'template', 'rt', 'rp'}
+    # ...and collapses whitespace-only strings everywhere except inside these
+    PRESERVE_WHITESPACE = {'pre', 'textarea'}
+    ASCII_SPACES = '\x20\x0a\x09\x0c\x0d'
+
+    def parse(self, html: str):
+        return LexborHTMLParser(html).root
+
+    def find_all(self, node, names: List[str], class_pattern: Optional[Pattern] = None,
+                 string_pattern: Optional[Pattern] = None) -> list:
+        matches = []
+        # css() includes the node itself, BeautifulSoup only searches descendants
+        for element in node.css(", ".join(names)):
+            if element.mem_id == node.mem_id:
+                continue
+            if class_pattern is not None and not class_pattern.search(element.attributes.get('class') or ''):
+                continue
+            if string_pattern is not None:
+                string = self._sole_string(element)
+                if string is None or not string_pattern.search(string):
+                    continue
+            matches.append(element)
+        return matches
+
+    def find(self, node, names: List[str], class_pattern: Optional[Pattern] = None):
+        for element in node.css(", ".join(names)):
+            if element.mem_id == node.mem_id:
+                continue
+            if class_pattern is None or class_pattern.search(element.attributes.get('class') or ''):
+                return element
+        return None
+
+    def get_text(self, node, strip: bool = False) -> str:
+        strings = []
+        for child in node.traverse(include_text=True):
+            if child.tag != '-text' or child.parent.tag in self.HIDDEN_TEXT_PARENTS:
+                continue
+            text = self._string_value(child)
+            if strip:
+                text = text.strip()
+                if not text:
+                    continue
+            strings.append(text)
+        return "".join(strings)
+
+    def link_href(self, node) -> Optional[str]:
+        for link in node.css('a'):
+            href = link.attributes.get('href', False)
+            if href is not False:
+                return href or ''
+        return None
+
+    def links(self, node) -> List[Tuple[str, str]]:
+        found = []
+        for link in node.css('a'):
+            href = link.attributes.get('href', False)
+            if href is not False:
+                found.append((href or '', self.get_text(link, strip=True)))
+        return found
+
+    def _string_value(self, text_node) -> str:
+        """Text node content, with whitespace-only runs collapsed the way BeautifulSoup stores them"""
+        text = text_node.text_content
+        if text and not text.strip(self.ASCII_SPACES):
+            parent = text_node.parent
+            while parent is not None:
+                if parent.tag in self.PRESERVE_WHITESPACE:
+                    return text
+                parent = parent.parent
+            return '\n' if '\n' in text else ' '
+        return text
+
+    def _sole_string(self, element) -> Optional[str]:
+        """Equivalent of BeautifulSoup's Tag.string: the text of a single-child chain"""
+        while True:
+            child = element.child
+            if child is None or child.next is not None:
+                return None
+            if child.tag == '-text':
+                return self._string_value(child)
+            if child.tag == '-comment':
+                return child.comment_content
+            element = child
+
+def get_parser_backend(name: str = DEFAULT_BACKEND):
+    """Return the named backend, falling back to html.parser when its library is missing"""
+    if name == "selectolax":
+        if LexborHTMLParser is not None:
+            return LexborBackend()
+        logger.warning("selectolax is not installed, falling back to html.parser")
+    elif name == "lxml":
+        try:
+            import lxml  # noqa: F401
+            return SoupBackend("lxml")
+        except ImportError:
+            logger.warning("lxml is not installed, falling back to html.parser")
+    elif name != DEFAULT_BACKEND:
+        logger.warning(f"Unknown parser backend {name!r}, falling back to html.parser")
+    return SoupBackend(DEFAULT_BACKEND)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+HTTP Response Cache
+Persistent per-URL cache of page bodies with ETag/Last-Modified validators for conditional recrawls
+"""
+
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class CachedResponse:
+    url: str
+    body: str
+    etag: str = ""
+    last_modified: str = ""
+    stored_at: float = 0.0
+
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+class HTTPCache:
+    """SQLite-backed response cache with TTL, age and size-bounded LRU eviction"""
+
+    def __init__(self, path: str = ".http_cache/responses.sqlite", ttl: float = 3600,
+                 max_age: float = 7 * 24 * 3600, max_bytes: int = 200 * 1024 * 1024):
+        # ttl: serve without revalidating; max_age: drop entirely; max_bytes: total body budget
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                body TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+        """)
+        self.conn.commit()
+        self.evict()
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """Return the cached entry for a URL, or None if absent or expired"""
+        row = self.conn.execute(
+            "SELECT body, etag, last_modified, stored_at FROM responses WHERE url = ?", (url,)
+        ).fetchone()
+        if not row:
+            return None
+
+        entry = CachedResponse(url=url, body=row[0], etag=row[1] or "", last_modified=row[2] or "", stored_at=row[3])
+        if entry.age() > self.max_age:
+            self.conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+            self.conn.commit()
+            self.stats["evictions"] += 1
+            return None
+        return entry
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        """Whether an entry can be served without asking the server"""
+        return entry.age() <= self.ttl
+
+    def conditional_headers(self, entry: Optional[CachedResponse]) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for revalidation"""
+        headers = {}
+        if entry:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def record_hit(self, url: str, revalidated: bool = False):
+        """Count a cache hit and refresh the entry's LRU position (and age, if revalidated)"""
+        now = time.time()
+        if revalidated:
+            self.stats["revalidated"] += 1
+            self.conn.execute("UPDATE responses SET accessed_at = ?, stored_at = ? WHERE url = ?", (now, now, url))
+        else:
+            self.stats["hits"] += 1
+            self.conn.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (now, url))
+        self.conn.commit()
+
+    def record_miss(self):
+        self.stats["misses"] += 1
+
+    def store(self, url: str, body: str, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """Save a fresh 200 response"""
+        now = time.time()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO responses (url, body, etag, last_modified, stored_at, accessed_at, size) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (url, body, etag or "", last_modified or "", now, now, len(body.encode('utf-8')))
+        )
+        self.conn.commit()
+        self.stats["stores"] += 1
+        self.evict()
+
+    def evict(self):
+        """Drop entries past max_age, then least-recently-used entries until under max_bytes"""
+        cursor = self.conn.execute("DELETE FROM responses WHERE stored_at < ?", (time.time() - self.max_age,))
+        evicted = cursor.rowcount
+
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total > self.max_bytes:
+            for url, size in self.conn.execute("SELECT url, size FROM responses ORDER BY accessed_at").fetchall():
+                if total <= self.max_bytes:
+                    break
+                self.conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+                total -= size
+                evicted += 1
+
+        self.conn.commit()
+        self.stats["evictions"] += max(evicted, 0)
+
+    def hit_ratio(self) -> float:
+        served = self.stats["hits"] + self.stats["revalidated"]
+        total = served + self.stats["misses"]
+        return served / total if total else 0.0
+
+    def close(self):
+        logger.info(f"HTTP cache stats: {self.stats} (hit ratio {self.hit_ratio():.0%})")
+        self.conn.close()
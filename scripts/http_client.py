@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+HTTP Client Factory
+Builds the tuned aiohttp sessions shared by the scrapers: pooled keep-alive connections, DNS cache,
+split timeouts, compressed transfers and connection-pool statistics
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+import aiohttp
+
+try:
+    import brotli  # noqa: F401  aiohttp decodes br responses when Brotli is installed
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+DEFAULT_USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+                      'Chrome/91.0.4472.124 Safari/537.36')
+
+@dataclass
+class HTTPClientConfig:
+    limit: int = 100  # Open connections across all hosts
+    limit_per_host: int = 4
+    dns_cache_ttl: int = 300
+    keepalive_timeout: float = 30.0
+    connect_timeout: float = 10.0  # TCP + TLS handshake
+    read_timeout: float = 30.0  # Between chunks of the response
+    total_timeout: float = 60.0
+    user_agent: str = DEFAULT_USER_AGENT
+
+class PoolStats:
+    """Connection-pool counters collected through aiohttp request tracing"""
+
+    def __init__(self):
+        self.requests = 0
+        self.new_connections = 0
+        self.reused_connections = 0
+        self.queued = 0
+        self.queued_seconds = 0.0
+        self.connector: Optional[aiohttp.BaseConnector] = None
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        trace = aiohttp.TraceConfig()
+
+        async def on_request_start(session, ctx, params):
+            self.requests += 1
+
+        async def on_queued_start(session, ctx, params):
+            ctx.queued_at = time.monotonic()
+
+        async def on_queued_end(session, ctx, params):
+            self.queued += 1
+            self.queued_seconds += time.monotonic() - ctx.queued_at
+
+        async def on_create_end(session, ctx, params):
+            self.new_connections += 1
+
+        async def on_reuse(session, ctx, params):
+            self.reused_connections += 1
+
+        trace.on_request_start.append(on_request_start)
+        trace.on_connection_queued_start.append(on_queued_start)
+        trace.on_connection_queued_end.append(on_queued_end)
+        trace.on_connection_create_end.append(on_create_end)
+        trace.on_connection_reuseconn.append(on_reuse)
+        return trace
+
+    def open_connections(self) -> int:
+        """Connections currently in use plus idle keep-alive connections held by the pool"""
+        if self.connector is None or self.connector.closed:
+            return 0
+        # aiohttp has no public accessor for pool occupancy
+        idle = sum(len(conns) for conns in getattr(self.connector, '_conns', {}).values())
+        return idle + len(getattr(self.connector, '_acquired', ()))
+
+    @property
+    def reuse_ratio(self) -> float:
+        connections = self.new_connections + self.reused_connections
+        return self.reused_connections / connections if connections else 0.0
+
+    def as_dict(self) -> Dict:
+        return {
+            "requests": self.requests,
+            "open_connections": self.open_connections(),
+            "new_connections": self.new_connections,
+            "reused_connections": self.reused_connections,
+            "reuse_ratio": round(self.reuse_ratio, 3),
+            "queued_for_slot": self.queued,
+            "queued_seconds": round(self.queued_seconds, 3),
+        }
+
+def create_session(config: Optional[HTTPClientConfig] = None,
+                   stats: Optional[PoolStats] = None) -> aiohttp.ClientSession:
+    """Create a pooled keep-alive session; must be called with an event loop running"""
+    config = config or HTTPClientConfig()
+    connector = aiohttp.TCPConnector(
+        limit=config.limit,
+        limit_per_host=config.limit_per_host,
+        ttl_dns_cache=config.dns_cache_ttl,
+        keepalive_timeout=config.keepalive_timeout,
+    )
+    if stats is not None:
+        stats.connector = connector
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=config.total_timeout, sock_connect=config.connect_timeout,
+                                      sock_read=config.read_timeout),
+        headers={'User-Agent': config.user_agent, 'Accept-Encoding': ACCEPT_ENCODING},
+        trace_configs=[stats.trace_config()] if stats is not None else None,
+    )
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Keyword Matcher
+Aho-Corasick automaton that finds every configured keyword in a text with a single left-to-right pass
+"""
+
+from collections import deque
+from typing import Dict, Hashable, List, Set
+
+class KeywordMatcher:
+    """Multi-pattern substring matcher.
+
+    Patterns are matched case-sensitively, exactly like `pattern in text`. Patterns added with
+    ignore_spaces=True are matched against the text with all spaces removed (like
+    `pattern.replace(" ", "") in text.replace(" ", "")`); both kinds are found in the same pass.
+    """
+
+    NORMAL_ROOT = 0
+    SPACELESS_ROOT = 1
+
+    def __init__(self):
+        self.goto: List[Dict[str, int]] = [{}, {}]
+        self.outputs: List[Set[Hashable]] = [set(), set()]
+        self.roots: List[int] = [self.NORMAL_ROOT, self.SPACELESS_ROOT]
+        self.transitions: List[Dict[str, int]] = []
+        self.built = False
+
+    def add(self, pattern: str, payload: Hashable, ignore_spaces: bool = False):
+        """Register a pattern; scan() reports its payload when the pattern occurs"""
+        if ignore_spaces:
+            pattern = pattern.replace(" ", "")
+        root = self.SPACELESS_ROOT if ignore_spaces else self.NORMAL_ROOT
+        state = root
+
+        # An empty pattern occurs in every text
+        for ch in pattern:
+            if ch not in self.goto[state]:
+                self.goto.append({})
+                self.outputs.append(set())
+                self.roots.append(root)
+                self.goto[state][ch] = len(self.goto) - 1
+            state = self.goto[state][ch]
+
+        self.outputs[state].add(payload)
+        self.built = False
+
+    def build(self):
+        """Compute failure links and flatten them into a complete transition table"""
+        fail = [0] * len(self.goto)
+        self.transitions = [dict() for _ in self.goto]
+        queue = deque()
+
+        for root in (self.NORMAL_ROOT, self.SPACELESS_ROOT):
+            fail[root] = root
+            self.transitions[root] = dict(self.goto[root])
+            for child in self.goto[root].values():
+                fail[child] = root
+                queue.append(child)
+
+        # Breadth-first, so a state's failure target is always complete before the state itself
+        while queue:
+            state = queue.popleft()
+            inherited = self.transitions[fail[state]]
+            self.transitions[state] = {**inherited, **self.goto[state]}
+            self.outputs[state] |= self.outputs[fail[state]]
+
+            for ch, child in self.goto[state].items():
+                fail[child] = inherited.get(ch, self.roots[state])
+                queue.append(child)
+
+        # Freeze outputs so the scan loop can skip states without matches cheaply
+        self._output_lists = [tuple(payloads) if payloads else None for payloads in self.outputs]
+        self.built = True
+
+    def scan(self, text: str) -> Set[Hashable]:
+        """Return the payloads of every pattern occurring in the text"""
+        if not self.built:
+            self.build()
+
+        transitions = self.transitions
+        outputs = self._output_lists
+        hits = set(self.outputs[self.NORMAL_ROOT]) | set(self.outputs[self.SPACELESS_ROOT])
+        state = self.NORMAL_ROOT
+        spaceless_state = self.SPACELESS_ROOT
+
+        for ch in text:
+            state = transitions[state].get(ch, self.NORMAL_ROOT)
+            if outputs[state]:
+                hits.update(outputs[state])
+            if ch != ' ':
+                spaceless_state = transitions[spaceless_state].get(ch, self.SPACELESS_ROOT)
+                if outputs[spaceless_state]:
+                    hits.update(outputs[spaceless_state])
+
+        return hits
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Detection
+MinHash signatures with locality-sensitive hashing to find the same grant listed with slightly different wording
+"""
+
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+import numpy as np
+
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+
+def normalize_text(text: str) -> str:
+    """Lower-case, drop punctuation and collapse whitespace"""
+    return " ".join(re.sub(r'[^\w\s]', ' ', text.lower()).split())
+
+def shingle_hashes(text: str, k: int = 4) -> Set[int]:
+    """32-bit hashes of the character k-grams of normalised text (stable across processes)"""
+    text = normalize_text(text)
+    if len(text) <= k:
+        return {zlib.crc32(text.encode('utf-8'))} if text else set()
+    return {zlib.crc32(text[i:i + k].encode('utf-8')) for i in range(len(text) - k + 1)}
+
+def lsh_params(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """Pick bands x rows so the LSH S-curve crosses 50% candidate probability nearest the threshold"""
+    best = None
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        crossover = (1 / bands) ** (1 / rows)
+        if best is None or abs(crossover - threshold) < best[0]:
+            best = (abs(crossover - threshold), bands, rows)
+    return best[1], best[2]
+
+class MinHasher:
+    """Builds fixed-length MinHash signatures with seeded universal hash permutations"""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        rng = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        # a < 2^31 and hashes < 2^32 keep a*h + b inside uint64 without wrapping
+        self.a = rng.randint(1, 1 << 31, size=num_perm, dtype=np.uint64)
+        self.b = rng.randint(0, 1 << 31, size=num_perm, dtype=np.uint64)
+
+    def signature(self, hashes: Iterable[int]) -> np.ndarray:
+        values = np.fromiter(hashes, dtype=np.uint64)
+        if not len(values):
+            return np.full(self.num_perm, MAX_HASH, dtype=np.uint64)
+        permuted = (np.outer(values, self.a) + self.b) % MERSENNE_PRIME & MAX_HASH
+        return permuted.min(axis=0)
+
+def estimated_similarity(first: np.ndarray, second: np.ndarray) -> float:
+    """Estimated Jaccard similarity: the fraction of agreeing signature slots"""
+    return float(np.count_nonzero(first == second)) / len(first)
+
+class LSHIndex:
+    """Banded MinHash index: items sharing any band bucket become candidate near-duplicates"""
+
+    def __init__(self, threshold: float = 0.7, num_perm: int = 128):
+        self.threshold = threshold
+        self.bands, self.rows = lsh_params(threshold, num_perm)
+        self.buckets: List[Dict[bytes, List[Hashable]]] = [defaultdict(list) for _ in range(self.bands)]
+        self.signatures: Dict[Hashable, np.ndarray] = {}
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def query(self, signature: np.ndarray) -> List[Hashable]:
+        """Indexed keys whose estimated similarity to the signature reaches the threshold"""
+        candidates = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            candidates.update(self.buckets[band].get(key, ()))
+        return [key for key in candidates
+                if estimated_similarity(signature, self.signatures[key]) >= self.threshold]
+
+    def insert(self, key: Hashable, signature: np.ndarray):
+        self.signatures[key] = signature
+        for band, band_key in enumerate(self._band_keys(signature)):
+            self.buckets[band][band_key].append(key)
+
+def group_near_duplicates(texts: List[str], threshold: float = 0.7, num_perm: int = 128,
+                          exact_keys: Optional[List[Hashable]] = None) -> List[List[int]]:
+    """Cluster text indices whose MinHash similarity reaches the threshold.
+
+    Items sharing an exact key are always grouped. Groups are transitive and returned in order of
+    their first member; members keep input order.
+    """
+    parent = list(range(len(texts)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i: int, j: int):
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    if exact_keys is not None:
+        first_seen: Dict[Hashable, int] = {}
+        for index, key in enumerate(exact_keys):
+            union(first_seen.setdefault(key, index), index)
+
+    hasher = MinHasher(num_perm)
+    index = LSHIndex(threshold, num_perm)
+    for position, text in enumerate(texts):
+        hashes = shingle_hashes(text)
+        if not hashes:
+            continue
+        signature = hasher.signature(hashes)
+        for match in index.query(signature):
+            union(match, position)
+        index.insert(position, signature)
+
+    groups: Dict[int, List[int]] = defaultdict(list)
+    for position in range(len(texts)):
+        groups[find(position)].append(position)
+    return sorted(groups.values(), key=lambda members: members[0])
+
+class NearDuplicateGroups:
+    """Streaming counterpart of group_near_duplicates: items are added one at a time, and the groups
+    formed do not depend on the order they arrive in"""
+
+    def __init__(self, threshold: float = 0.7, num_perm: int = 128):
+        self.hasher = MinHasher(num_perm)
+        self.index = LSHIndex(threshold, num_perm)
+        self.parent: List[int] = []
+        self.exact_items: Dict[Hashable, int] = {}
+
+    def find(self, item: int) -> int:
+        """The id of the group the item belongs to"""
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def add(self, text: str, exact_key: Optional[Hashable] = None) -> Tuple[int, List[int]]:
+        """Add a text; returns its group and the earlier groups it joined, which are merged into that one"""
+        item = len(self.parent)
+        self.parent.append(item)
+        hashes = shingle_hashes(text)
+        signature = self.hasher.signature(hashes) if hashes else None
+        matches = self.index.query(signature) if signature is not None else []
+        if exact_key is not None:
+            if exact_key in self.exact_items:
+                matches.append(self.exact_items[exact_key])
+            else:
+                self.exact_items[exact_key] = item
+
+        merged = sorted({self.find(match) for match in matches})
+        root = min(merged + [item])
+        for group in merged + [item]:
+            self.parent[group] = root
+        if signature is not None:
+            self.index.insert(item, signature)
+        return root, merged
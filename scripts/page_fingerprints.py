@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Page Fingerprint Store
+Remembers a normalised content hash, the extracted grants and the outgoing links for every crawled URL,
+so unchanged listing pages can skip parsing, extraction and scoring on the next run
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Markup that changes on every request (analytics snippets, build ids, nonces in comments)
+# but never holds listing content; removed before hashing
+VOLATILE_MARKUP = re.compile(r'<script\b.*?</script\s*>|<style\b.*?</style\s*>|<!--.*?-->', re.I | re.S)
+WHITESPACE = re.compile(r'\s+')
+
+def page_fingerprint(html: str) -> str:
+    """SHA-256 of the page with scripts, styles and comments removed and whitespace collapsed"""
+    normalized = WHITESPACE.sub(' ', VOLATILE_MARKUP.sub('', html)).strip()
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+class PageFingerprintStore:
+    """SQLite-backed map of URL -> (page hash, extractor signature, extracted grants, links)"""
+
+    def __init__(self, path: str = ".http_cache/fingerprints.sqlite"):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.stats = {"unchanged": 0, "changed": 0}
+
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS page_fingerprints (
+                url TEXT PRIMARY KEY,
+                page_hash TEXT NOT NULL,
+                extractor_signature TEXT NOT NULL,
+                grants TEXT NOT NULL,
+                links TEXT NOT NULL DEFAULT '[]',
+                updated_at REAL NOT NULL
+            )
+        """)
+        # Stores created before link tracking lack the links column
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(page_fingerprints)")}
+        if "links" not in columns:
+            self.conn.execute("ALTER TABLE page_fingerprints ADD COLUMN links TEXT NOT NULL DEFAULT '[]'")
+        self.conn.commit()
+
+    def lookup(self, url: str, page_hash: str,
+               extractor_signature: str) -> Optional[Tuple[List[Dict], List[Tuple[str, str]]]]:
+        """Previously extracted grant dicts and (href, text) links if the page and extractor are unchanged, else None"""
+        row = self.conn.execute(
+            "SELECT page_hash, extractor_signature, grants, links FROM page_fingerprints WHERE url = ?", (url,)
+        ).fetchone()
+        if row and row[0] == page_hash and row[1] == extractor_signature:
+            self.stats["unchanged"] += 1
+            return json.loads(row[2]), [tuple(link) for link in json.loads(row[3])]
+        self.stats["changed"] += 1
+        return None
+
+    def store(self, url: str, page_hash: str, extractor_signature: str, grants: List[Dict],
+              links: Optional[List[Tuple[str, str]]] = None):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO page_fingerprints "
+            "(url, page_hash, extractor_signature, grants, links, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (url, page_hash, extractor_signature, json.dumps(grants, ensure_ascii=False),
+             json.dumps(links or [], ensure_ascii=False), time.time())
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
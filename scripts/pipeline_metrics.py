@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Pipeline Metrics
+Timers, counters and latency histograms for each stage of a discovery run, exported into the discovery
+report and as JSON or Prometheus text; a disabled registry costs one attribute check per instrumented call
+"""
+
+import asyncio
+import functools
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Upper bounds in seconds, spanning per-item extraction calls up to slow page fetches
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+MetricKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+def _key(name: str, labels: Dict) -> MetricKey:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+class Histogram:
+    """Fixed-bucket histogram; counts are per bucket (not cumulative) so snapshots merge by addition"""
+
+    __slots__ = ("buckets", "counts", "count", "sum", "min", "max")
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+
+    def observe(self, value: float):
+        index = 0
+        for bound in self.buckets:
+            if value <= bound:
+                break
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Estimate from bucket bounds, interpolating linearly within the bucket"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for index, count in enumerate(self.counts):
+            upper = self.buckets[index] if index < len(self.buckets) else self.max
+            if count and seen + count >= rank:
+                estimate = lower + (upper - lower) * (rank - seen) / count
+                return min(max(estimate, self.min), self.max)
+            seen += count
+            lower = upper
+        return self.max
+
+    def as_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "min": round(self.min, 6) if self.count else 0.0,
+            "max": round(self.max, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else 0.0,
+            "p50": round(self.quantile(0.5), 6),
+            "p95": round(self.quantile(0.95), 6),
+            "buckets": list(self.buckets),
+            "bucket_counts": list(self.counts),
+        }
+
+    def merge(self, data: Dict):
+        if tuple(data["buckets"]) != self.buckets:
+            raise ValueError("Cannot merge histograms with different buckets")
+        self.counts = [a + b for a, b in zip(self.counts, data["bucket_counts"])]
+        self.count += data["count"]
+        self.sum += data["sum"]
+        if data["count"]:
+            self.min = min(self.min, data["min"])
+            self.max = max(self.max, data["max"])
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+NULL_TIMER = _NullTimer()
+
+class _Timer:
+    __slots__ = ("registry", "key", "started")
+
+    def __init__(self, registry: "MetricsRegistry", key: MetricKey):
+        self.registry = registry
+        self.key = key
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.registry._observe(self.key, time.perf_counter() - self.started)
+        return False
+
+class MetricsRegistry:
+    """Named counters and duration histograms, optionally labelled; safe to update from worker threads"""
+
+    def __init__(self, enabled: bool = True, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.enabled = enabled
+        self.buckets = buckets
+        self.counters: Dict[MetricKey, float] = {}
+        self.histograms: Dict[MetricKey, Histogram] = {}
+        self.lock = threading.Lock()
+
+    def timer(self, name: str, **labels):
+        """Context manager recording the block's wall time into histogram `name`"""
+        if not self.enabled:
+            return NULL_TIMER
+        return _Timer(self, _key(name, labels))
+
+    def observe(self, name: str, seconds: float, **labels):
+        if self.enabled:
+            self._observe(_key(name, labels), seconds)
+
+    def increment(self, name: str, value: float = 1, **labels):
+        if not self.enabled:
+            return
+        key = _key(name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def _observe(self, key: MetricKey, seconds: float):
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def snapshot(self) -> Dict:
+        with self.lock:
+            return {
+                "counters": [{"name": name, "labels": dict(labels), "value": value}
+                             for (name, labels), value in sorted(self.counters.items())],
+                "histograms": [{"name": name, "labels": dict(labels), **histogram.as_dict()}
+                               for (name, labels), histogram in sorted(self.histograms.items())],
+            }
+
+    def drain(self) -> Dict:
+        """Snapshot and reset, so a worker process can ship only what it recorded since the last call"""
+        snapshot = self.snapshot()
+        with self.lock:
+            self.counters.clear()
+            self.histograms.clear()
+        return snapshot
+
+    def merge(self, snapshot: Dict):
+        """Add a snapshot from another registry (e.g. a process-pool worker) into this one"""
+        if not self.enabled or not snapshot:
+            return
+        with self.lock:
+            for counter in snapshot["counters"]:
+                key = _key(counter["name"], counter["labels"])
+                self.counters[key] = self.counters.get(key, 0) + counter["value"]
+            for data in snapshot["histograms"]:
+                key = _key(data["name"], data["labels"])
+                histogram = self.histograms.get(key)
+                if histogram is None:
+                    histogram = self.histograms[key] = Histogram(tuple(data["buckets"]))
+                histogram.merge(data)
+
+    def summary(self) -> Dict:
+        """Per-stage totals (labels folded together) and counters, slowest stage first, for the discovery report"""
+        stages: Dict[str, Histogram] = {}
+        counters: Dict[str, float] = {}
+        with self.lock:
+            for (name, _), histogram in self.histograms.items():
+                if name not in stages:
+                    stages[name] = Histogram(histogram.buckets)
+                stages[name].merge(histogram.as_dict())
+            for (name, _), value in self.counters.items():
+                counters[name] = counters.get(name, 0) + value
+        ordered = sorted(stages.items(), key=lambda item: -item[1].sum)
+        return {
+            "stages": {
+                name: {"calls": h.count, "total_seconds": round(h.sum, 4), "mean_seconds": round(h.sum / h.count, 6),
+                       "p95_seconds": round(h.quantile(0.95), 6), "max_seconds": round(h.max, 6)}
+                for name, h in ordered
+            },
+            "counters": dict(sorted(counters.items())),
+            "slowest_stage": ordered[0][0] if ordered else None,
+        }
+
+    def to_prometheus(self, prefix: str = "grant_discovery") -> str:
+        """Prometheus text exposition format: counters as _total, timers as _seconds histograms"""
+        lines: List[str] = []
+        snapshot = self.snapshot()
+
+        def label_text(labels: Dict, extra: Optional[Tuple[str, str]] = None) -> str:
+            pairs = list(labels.items()) + ([extra] if extra else [])
+            if not pairs:
+                return ""
+            escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+            return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+        typed = set()
+        for counter in snapshot["counters"]:
+            metric = f"{prefix}_{counter['name']}_total"
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric}{label_text(counter['labels'])} {counter['value']}")
+
+        for data in snapshot["histograms"]:
+            metric = f"{prefix}_{data['name']}_seconds"
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f"# TYPE {metric} histogram")
+            cumulative = 0
+            for bound, count in zip(list(data["buckets"]) + ["+Inf"], data["bucket_counts"]):
+                cumulative += count
+                lines.append(f"{metric}_bucket{label_text(data['labels'], ('le', str(bound)))} {cumulative}")
+            lines.append(f"{metric}_sum{label_text(data['labels'])} {data['sum']}")
+            lines.append(f"{metric}_count{label_text(data['labels'])} {data['count']}")
+
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str):
+        """Write Prometheus text for .prom/.txt paths, otherwise JSON with the summary and full snapshot"""
+        path = Path(path)
+        if path.suffix in ('.prom', '.txt'):
+            path.write_text(self.to_prometheus(), encoding='utf-8')
+        else:
+            path.write_text(json.dumps({"summary": self.summary(), **self.snapshot()}, indent=2), encoding='utf-8')
+
+def timed(name: Optional[str] = None) -> Callable:
+    """Decorator timing a method into its object's `metrics` registry (sync or async); defaults to the method name"""
+    def decorator(method: Callable) -> Callable:
+        metric = name or method.__name__
+
+        if asyncio.iscoroutinefunction(method):
+            @functools.wraps(method)
+            async def async_wrapper(self, *args, **kwargs):
+                metrics = self.metrics
+                if not metrics.enabled:
+                    return await method(self, *args, **kwargs)
+                with _Timer(metrics, (metric, ())):
+                    return await method(self, *args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            metrics = self.metrics
+            if not metrics.enabled:
+                return method(self, *args, **kwargs)
+            with _Timer(metrics, (metric, ())):
+                return method(self, *args, **kwargs)
+        return wrapper
+
+    return decorator
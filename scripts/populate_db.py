@@ -1,10 +1,11 @@
-import os
-import requests
+import asyncio
+import aiohttp
 from bs4 import BeautifulSoup
-from supabase import create_client, Client
 from dotenv import load_dotenv
 from datetime import datetime
 import logging
+from http_client import PoolStats, create_session
+from storage_backends import create_storage
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -13,24 +14,19 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
-# Initialize Supabase client
-supabase_url = os.getenv("SUPABASE_URL")
-supabase_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+# Initialize the storage client (Supabase, or the local SQLite database when GRANT_STORAGE=local)
+supabase = create_storage('SUPABASE_URL', 'SUPABASE_SERVICE_ROLE_KEY')
 
-if not supabase_url or not supabase_key:
-    raise ValueError("Missing Supabase environment variables")
-
-supabase: Client = create_client(supabase_url, supabase_key)
-
-def scrape_grants(url: str) -> list:
+async def scrape_grants(session: aiohttp.ClientSession, url: str) -> list:
     """
     Scrape grant information from the specified URL.
     Modify this function according to the specific website structure.
     """
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
+        async with session.get(url) as response:
+            response.raise_for_status()
+            html = await response.text()
+        soup = BeautifulSoup(html, 'html.parser')
         grants = []
 
         # Example scraping logic - modify according to the target website
@@ -58,7 +54,7 @@ def scrape_grants(url: str) -> list:
             grants.append(grant)
 
         return grants
-    except requests.RequestException as e:
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
         logger.error(f"Error scraping URL {url}: {str(e)}")
         return []
 
@@ -84,6 +80,21 @@ def insert_grants(grants: list) -> None:
     except Exception as e:
         logger.error(f"Error inserting grants: {str(e)}")
 
+async def scrape_all(urls: list) -> list:
+    """
+    Scrape every URL over one pooled keep-alive session.
+    """
+    stats = PoolStats()
+    async with create_session(stats=stats) as session:
+        results = []
+        for url in urls:
+            logger.info(f"Scraping grants from {url}")
+            grants = await scrape_grants(session, url)
+            logger.info(f"Found {len(grants)} grants")
+            results.append(grants)
+        logger.info(f"HTTP connection pool: {stats.as_dict()}")
+    return results
+
 def main():
     # List of URLs to scrape
     urls = [
@@ -91,10 +102,7 @@ def main():
         # Add more URLs as needed
     ]
 
-    for url in urls:
-        logger.info(f"Scraping grants from {url}")
-        grants = scrape_grants(url)
-        logger.info(f"Found {len(grants)} grants")
+    for grants in asyncio.run(scrape_all(urls)):
         insert_grants(grants)
 
 if __name__ == "__main__":
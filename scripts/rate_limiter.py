@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Per-Host Rate Limiting
+Token-bucket throttling so concurrent crawls stay polite to each funding website
+"""
+
+import asyncio
+import time
+from typing import Dict
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """Async token bucket: refills `rate` tokens per second up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        if rate <= 0:
+            raise ValueError("Token bucket rate must be positive")
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self):
+        """Wait until a token is available, then consume it"""
+        async with self._lock:
+            self._refill()
+            while self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+
+class HostRateLimiter:
+    """Keeps one token bucket per host so each site is throttled independently"""
+
+    def __init__(self, rate: float = 1.0, burst: float = 1.0):
+        self.rate = rate
+        self.burst = burst
+        self.buckets: Dict[str, TokenBucket] = {}
+
+    def bucket_for(self, url: str) -> TokenBucket:
+        """Return (creating if needed) the bucket for the URL's host"""
+        host = urlparse(url).netloc.lower()
+        if host not in self.buckets:
+            self.buckets[host] = TokenBucket(self.rate, self.burst)
+        return self.buckets[host]
+
+    async def acquire(self, url: str):
+        """Wait for permission to request the given URL"""
+        await self.bucket_for(url).acquire()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Discovery Run Journal
+Write-ahead record of each run's fetched pages (with their grants and links) and committed database batches,
+so a crashed run can be resumed without re-crawling fetched pages or rewriting committed grants
+"""
+
+import json
+import sqlite3
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+GrantKey = Tuple[str, str]
+
+class RunJournal:
+    """SQLite-backed journal for the current run; start() opens a new run or reopens the last unfinished one"""
+
+    def __init__(self, path: str = ".http_cache/run_journal.sqlite"):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.run_id: Optional[str] = None
+        self.stats = {"pages_recorded": 0, "pages_replayed": 0, "batches_committed": 0}
+
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY,
+                started_at REAL NOT NULL,
+                finished_at REAL
+            )
+        """)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                run_id TEXT NOT NULL,
+                url TEXT NOT NULL,
+                grants TEXT NOT NULL,
+                links TEXT NOT NULL,
+                recorded_at REAL NOT NULL,
+                PRIMARY KEY (run_id, url)
+            )
+        """)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS batches (
+                run_id TEXT NOT NULL,
+                grant_keys TEXT NOT NULL,
+                committed_at REAL NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    def start(self, resume: bool = False, run_id: Optional[str] = None) -> str:
+        """Begin a run; with resume, continue run_id or else the most recent unfinished run if there is one"""
+        if resume:
+            if run_id is None:
+                row = self.conn.execute(
+                    "SELECT run_id FROM runs WHERE finished_at IS NULL ORDER BY started_at DESC LIMIT 1"
+                ).fetchone()
+                run_id = row[0] if row else None
+            elif not self.conn.execute("SELECT 1 FROM runs WHERE run_id = ? AND finished_at IS NULL",
+                                       (run_id,)).fetchone():
+                raise ValueError(f"No unfinished run {run_id} in {self.path}")
+            if run_id is not None:
+                self.run_id = run_id
+                return run_id
+
+        # A fresh run abandons older unfinished ones; their journals could only replay stale pages
+        self.conn.execute("DELETE FROM pages WHERE run_id IN (SELECT run_id FROM runs WHERE finished_at IS NULL)")
+        self.conn.execute("DELETE FROM batches WHERE run_id IN (SELECT run_id FROM runs WHERE finished_at IS NULL)")
+        self.conn.execute("UPDATE runs SET finished_at = ? WHERE finished_at IS NULL", (time.time(),))
+        self.run_id = uuid.uuid4().hex
+        self.conn.execute("INSERT INTO runs (run_id, started_at) VALUES (?, ?)", (self.run_id, time.time()))
+        self.conn.commit()
+        return self.run_id
+
+    def finish(self):
+        """Mark the run complete and drop its pages and batches, which are only needed to resume it"""
+        self.conn.execute("UPDATE runs SET finished_at = ? WHERE run_id = ?", (time.time(), self.run_id))
+        self.conn.execute("DELETE FROM pages WHERE run_id = ?", (self.run_id,))
+        self.conn.execute("DELETE FROM batches WHERE run_id = ?", (self.run_id,))
+        self.conn.commit()
+        self.run_id = None
+
+    def record_page(self, url: str, grants: List[Dict], links: List[Tuple[str, str]]):
+        """Called once a page is extracted, before its grants are handed on for persistence"""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO pages (run_id, url, grants, links, recorded_at) VALUES (?, ?, ?, ?, ?)",
+            (self.run_id, url, json.dumps(grants, ensure_ascii=False), json.dumps(links, ensure_ascii=False),
+             time.time())
+        )
+        self.conn.commit()
+        self.stats["pages_recorded"] += 1
+
+    def page(self, url: str) -> Optional[Tuple[List[Dict], List[Tuple[str, str]]]]:
+        """Grant dicts and (href, text) links of a page this run already extracted, else None"""
+        row = self.conn.execute("SELECT grants, links FROM pages WHERE run_id = ? AND url = ?",
+                                (self.run_id, url)).fetchone()
+        if row is None:
+            return None
+        self.stats["pages_replayed"] += 1
+        return json.loads(row[0]), [tuple(link) for link in json.loads(row[1])]
+
+    def record_batch(self, keys: Iterable[GrantKey]):
+        """Called after a database batch has been written"""
+        self.conn.execute("INSERT INTO batches (run_id, grant_keys, committed_at) VALUES (?, ?, ?)",
+                          (self.run_id, json.dumps([list(key) for key in keys], ensure_ascii=False), time.time()))
+        self.conn.commit()
+        self.stats["batches_committed"] += 1
+
+    def committed_keys(self) -> Set[GrantKey]:
+        """(title, source) of every grant this run has already written"""
+        keys = set()
+        for (data,) in self.conn.execute("SELECT grant_keys FROM batches WHERE run_id = ?", (self.run_id,)):
+            keys.update(tuple(key) for key in json.loads(data))
+        return keys
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Storage Backends
+The query-builder interface the scripts use for the database, backed by Supabase or by a local SQLite file
+built from schema.sql, so the pipeline can run and be load-tested without the hosted service
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    from supabase import create_client
+except ImportError:  # Only needed for the Supabase backend
+    create_client = None
+
+SCHEMA_PATH = Path(__file__).resolve().parent.parent / "schema.sql"
+
+# ISO 8601 like Python's isoformat(), so defaults compare correctly with timestamps written by the scripts
+SQLITE_NOW = "(strftime('%Y-%m-%dT%H:%M:%f', 'now'))"
+
+class StorageBackend:
+    """table(name) returns a query builder with the PostgREST subset the scripts use:
+
+    select / eq / neq / gt / gte / lt / lte / in_ / is_ / not_ / order / limit / range / single, and
+    insert / upsert(on_conflict=...) / update / delete, finished by execute() -> response with .data
+    """
+
+    def table(self, name: str) -> Any:
+        raise NotImplementedError
+
+class SupabaseStorage(StorageBackend):
+    """The hosted database; supabase-py's builders already implement the interface"""
+
+    def __init__(self, url: str, key: str):
+        if create_client is None:
+            raise ImportError("The supabase package is required for the Supabase storage backend")
+        self.client = create_client(url, key)
+
+    def table(self, name: str):
+        return self.client.table(name)
+
+def sqlite_schema(sql: str) -> Tuple[List[str], Dict[str, Set[str]], Dict[str, Set[str]]]:
+    """CREATE TABLE/INDEX statements from the Postgres schema rewritten for SQLite, plus each table's JSONB
+    and BOOLEAN columns (stored as JSON text and 0/1). Extensions, functions, triggers, row level security
+    policies and sample data are Supabase concerns and are left out.
+    """
+    sql = re.sub(r'\$\$.*?\$\$', '', sql, flags=re.S)  # Function bodies contain semicolons
+    sql = re.sub(r'--[^\n]*', '', sql)
+    statements, json_columns, bool_columns = [], {}, {}
+    for statement in (part.strip() for part in sql.split(';')):
+        table = re.match(r'CREATE TABLE IF NOT EXISTS (\w+)', statement, re.I)
+        if table:
+            name = table.group(1)
+            json_columns[name] = set(re.findall(r'^\s*(\w+)\s+JSONB\b', statement, re.M | re.I))
+            bool_columns[name] = set(re.findall(r'^\s*(\w+)\s+BOOLEAN\b', statement, re.M | re.I))
+            statement = re.sub(r'\b(?:BIG)?SERIAL PRIMARY KEY', 'INTEGER PRIMARY KEY AUTOINCREMENT', statement, flags=re.I)
+            # auth.users lives in Supabase's auth schema
+            statement = re.sub(r'\s*REFERENCES auth\.users\(id\)(?: ON DELETE CASCADE)?', '', statement, flags=re.I)
+            statement = re.sub(r'TIMESTAMP WITH TIME ZONE|\bUUID\b|\bJSONB\b', 'TEXT', statement, flags=re.I)
+            statement = re.sub(r'\bBOOLEAN\b', 'INTEGER', statement, flags=re.I)
+            statement = re.sub(r'DEFAULT (?:NOW\(\)|CURRENT_TIMESTAMP)', f'DEFAULT {SQLITE_NOW}', statement, flags=re.I)
+            statement = re.sub(r'DEFAULT FALSE', 'DEFAULT 0', statement, flags=re.I)
+            statement = re.sub(r'DEFAULT TRUE', 'DEFAULT 1', statement, flags=re.I)
+            statements.append(statement)
+        elif re.match(r'CREATE (?:UNIQUE )?INDEX', statement, re.I):
+            statements.append(statement)
+    return statements, json_columns, bool_columns
+
+class LocalResponse:
+    def __init__(self, data: Any):
+        self.data = data
+        self.count = len(data) if isinstance(data, list) else None
+
+class LocalStorage(StorageBackend):
+    """Embedded SQLite database with the grants schema; one connection shared by threads under a lock"""
+
+    def __init__(self, path: str = "local_grants.sqlite", schema_path: Path = SCHEMA_PATH):
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        if path != ":memory:":
+            self.conn.execute("PRAGMA journal_mode = WAL")
+        self.lock = threading.Lock()
+
+        statements, self.json_columns, self.bool_columns = sqlite_schema(Path(schema_path).read_text(encoding='utf-8'))
+        with self.lock, self.conn:
+            for statement in statements:
+                self.conn.execute(statement)
+
+    def table(self, name: str) -> "LocalQuery":
+        if name not in self.json_columns:
+            raise ValueError(f"Unknown table: {name}")
+        return LocalQuery(self, name)
+
+    def encode(self, table: str, row: Dict) -> Dict:
+        encoded = {}
+        for column, value in row.items():
+            if column in self.json_columns[table] or isinstance(value, (dict, list)):
+                value = json.dumps(value) if value is not None else None
+            elif isinstance(value, bool):
+                value = int(value)
+            encoded[column] = value
+        return encoded
+
+    def decode(self, table: str, row: sqlite3.Row) -> Dict:
+        decoded = dict(row)
+        for column in self.json_columns[table]:
+            if decoded.get(column) is not None:
+                decoded[column] = json.loads(decoded[column])
+        for column in self.bool_columns[table]:
+            if decoded.get(column) is not None:
+                decoded[column] = bool(decoded[column])
+        return decoded
+
+    def run(self, table: str, statements: Iterable[Tuple[str, List]]) -> List[Dict]:
+        """Execute statements in one transaction and return the decoded rows they produce"""
+        with self.lock, self.conn:
+            rows = []
+            for sql, params in statements:
+                rows.extend(self.decode(table, row) for row in self.conn.execute(sql, params).fetchall())
+            return rows
+
+    def close(self):
+        self.conn.close()
+
+def quote(column: str) -> str:
+    if not re.fullmatch(r'\w+', column):
+        raise ValueError(f"Invalid column name: {column}")
+    return f'"{column}"'
+
+class LocalQuery:
+    """PostgREST-style builder compiled to SQLite on execute()"""
+
+    OPERATORS = {'eq': '=', 'neq': '!=', 'gt': '>', 'gte': '>=', 'lt': '<', 'lte': '<='}
+
+    def __init__(self, storage: LocalStorage, table: str):
+        self.storage = storage
+        self.table_name = table
+        self.action = 'select'
+        self.columns = '*'
+        self.payload: Any = None
+        self.on_conflict: Optional[str] = None
+        self.conditions: List[str] = []
+        self.params: List[Any] = []
+        self.negate_next = False
+        self.ordering: List[str] = []
+        self.limit_count: Optional[int] = None
+        self.offset = 0
+        self.single_row = False
+
+    # Actions
+    def select(self, columns: str = '*', count: Optional[str] = None) -> "LocalQuery":
+        self.columns = '*' if columns.strip() == '*' else ', '.join(quote(c.strip()) for c in columns.split(','))
+        return self
+
+    def insert(self, rows: Any) -> "LocalQuery":
+        self.action, self.payload = 'insert', rows
+        return self
+
+    def upsert(self, rows: Any, on_conflict: Optional[str] = None) -> "LocalQuery":
+        self.action, self.payload, self.on_conflict = 'upsert', rows, on_conflict or 'id'
+        return self
+
+    def update(self, values: Dict) -> "LocalQuery":
+        self.action, self.payload = 'update', values
+        return self
+
+    def delete(self) -> "LocalQuery":
+        self.action = 'delete'
+        return self
+
+    # Filters
+    @property
+    def not_(self) -> "LocalQuery":
+        self.negate_next = True
+        return self
+
+    def _filter(self, condition: str, params: List[Any]) -> "LocalQuery":
+        if self.negate_next:
+            condition, self.negate_next = f"NOT ({condition})", False
+        self.conditions.append(condition)
+        self.params.extend(params)
+        return self
+
+    def _compare(self, column: str, operator: str, value: Any) -> "LocalQuery":
+        if isinstance(value, bool):
+            value = int(value)
+        return self._filter(f"{quote(column)} {self.OPERATORS[operator]} ?", [value])
+
+    def eq(self, column: str, value: Any) -> "LocalQuery":
+        return self._compare(column, 'eq', value)
+
+    def neq(self, column: str, value: Any) -> "LocalQuery":
+        return self._compare(column, 'neq', value)
+
+    def gt(self, column: str, value: Any) -> "LocalQuery":
+        return self._compare(column, 'gt', value)
+
+    def gte(self, column: str, value: Any) -> "LocalQuery":
+        return self._compare(column, 'gte', value)
+
+    def lt(self, column: str, value: Any) -> "LocalQuery":
+        return self._compare(column, 'lt', value)
+
+    def lte(self, column: str, value: Any) -> "LocalQuery":
+        return self._compare(column, 'lte', value)
+
+    def in_(self, column: str, values: Iterable[Any]) -> "LocalQuery":
+        values = list(values)
+        if not values:
+            return self._filter("0", [])
+        return self._filter(f"{quote(column)} IN ({', '.join('?' * len(values))})", values)
+
+    def is_(self, column: str, value: Any) -> "LocalQuery":
+        literal = {None: 'NULL', 'null': 'NULL', True: 'TRUE', 'true': 'TRUE', False: 'FALSE', 'false': 'FALSE'}[value]
+        return self._filter(f"{quote(column)} IS {literal}", [])
+
+    # Modifiers
+    def order(self, column: str, desc: bool = False) -> "LocalQuery":
+        self.ordering.append(f"{quote(column)} {'DESC' if desc else 'ASC'}")
+        return self
+
+    def limit(self, count: int) -> "LocalQuery":
+        self.limit_count = count
+        return self
+
+    def range(self, start: int, end: int) -> "LocalQuery":
+        self.offset, self.limit_count = start, end - start + 1
+        return self
+
+    def single(self) -> "LocalQuery":
+        self.single_row = True
+        return self
+
+    def _where(self) -> str:
+        return f" WHERE {' AND '.join(self.conditions)}" if self.conditions else ""
+
+    def execute(self) -> LocalResponse:
+        table = quote(self.table_name)
+        if self.action == 'select':
+            sql = f"SELECT {self.columns} FROM {table}{self._where()}"
+            if self.ordering:
+                sql += f" ORDER BY {', '.join(self.ordering)}"
+            if self.limit_count is not None or self.offset:
+                sql += f" LIMIT {self.limit_count if self.limit_count is not None else -1} OFFSET {self.offset}"
+            statements = [(sql, self.params)]
+        elif self.action in ('insert', 'upsert'):
+            rows = self.payload if isinstance(self.payload, list) else [self.payload]
+            statements = [self._insert_statement(self.storage.encode(self.table_name, row)) for row in rows]
+        elif self.action == 'update':
+            values = self.storage.encode(self.table_name, self.payload)
+            assignments = ', '.join(f"{quote(column)} = ?" for column in values)
+            statements = [(f"UPDATE {table} SET {assignments}{self._where()} RETURNING *",
+                           list(values.values()) + self.params)]
+        else:
+            statements = [(f"DELETE FROM {table}{self._where()} RETURNING *", self.params)]
+
+        rows = self.storage.run(self.table_name, statements)
+        if self.single_row:
+            if len(rows) != 1:
+                raise ValueError(f"Expected a single row from {self.table_name}, got {len(rows)}")
+            return LocalResponse(rows[0])
+        return LocalResponse(rows)
+
+    def _insert_statement(self, row: Dict) -> Tuple[str, List]:
+        columns = ', '.join(quote(column) for column in row)
+        sql = f"INSERT INTO {quote(self.table_name)} ({columns}) VALUES ({', '.join('?' * len(row))})"
+        if self.action == 'upsert':
+            target = [column.strip() for column in self.on_conflict.split(',')]
+            # Like PostgREST's merge-duplicates: only the columns sent are overwritten
+            updates = ', '.join(f"{quote(column)} = excluded.{quote(column)}" for column in row if column not in target)
+            sql += f" ON CONFLICT ({', '.join(quote(column) for column in target)}) " \
+                   + (f"DO UPDATE SET {updates}" if updates else "DO NOTHING")
+        return sql + " RETURNING *", list(row.values())
+
+def create_storage(url_env: str = 'SUPABASE_URL', key_env: str = 'SUPABASE_SERVICE_KEY') -> StorageBackend:
+    """Storage chosen by GRANT_STORAGE: "supabase" (default, credentials from url_env/key_env) or "local"
+    (SQLite at GRANT_STORAGE_PATH, default local_grants.sqlite)"""
+    backend = os.getenv('GRANT_STORAGE', 'supabase').lower()
+    if backend == 'local':
+        return LocalStorage(os.getenv('GRANT_STORAGE_PATH', 'local_grants.sqlite'))
+    if backend != 'supabase':
+        raise ValueError(f"Unknown GRANT_STORAGE backend: {backend}")
+
+    url, key = os.getenv(url_env), os.getenv(key_env)
+    if not url or not key:
+        raise ValueError(f"Missing Supabase credentials. Set {url_env} and {key_env} environment variables.")
+    return SupabaseStorage(url, key)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Streaming Candidate Extraction
+Incrementally parses very large listing pages with lxml, emitting each grant candidate element as a
+small HTML fragment and pruning finished markup so memory stays bounded however big the page is
+"""
+
+from typing import List, Optional, Pattern, Tuple
+
+try:
+    from lxml import etree
+except ImportError:  # lxml is optional; without it large pages are buffered up to max_body_bytes
+    etree = None
+
+# Set on elements whose earlier children were pruned, so they are never mistaken for single-child elements
+PRUNED_MARK = "data-stream-pruned"
+
+def _sole_string(element) -> Optional[str]:
+    """BeautifulSoup's Tag.string over an lxml element: the text at the end of a single-child chain"""
+    while True:
+        if element.get(PRUNED_MARK) is not None:
+            return None
+        children = list(element)
+        nodes = (1 if element.text else 0) + len(children) + sum(1 for child in children if child.tail)
+        if nodes != 1:
+            return None
+        if element.text:
+            return element.text
+        element = children[0]
+        if not isinstance(element.tag, str):  # Comment or processing instruction
+            return element.text
+
+class StreamingCandidateParser:
+    """Feed page text in chunks; get back HTML fragments of finished candidate elements.
+
+    A candidate is an element with one of the tag names whose class matches class_pattern, or whose
+    sole string matches string_pattern. Only innermost candidates are emitted: an element that
+    contained an emitted candidate is a listing container, not a listing. Each emitted subtree is
+    cleared, and finished elements outside candidates are dropped once a later sibling completes.
+    """
+
+    def __init__(self, tag_names: List[str], class_pattern: Optional[Pattern] = None,
+                 string_pattern: Optional[Pattern] = None, max_candidates: Optional[int] = None,
+                 collect_links: bool = False):
+        if etree is None:
+            raise RuntimeError("Streaming extraction requires the lxml package")
+        self.tag_names = set(tag_names)
+        self.class_pattern = class_pattern
+        self.string_pattern = string_pattern
+        self.max_candidates = max_candidates
+        self.collect_links = collect_links
+        self.links: List[Tuple[str, str]] = []
+        self.emitted = 0
+        self.parser = etree.HTMLPullParser(events=('start', 'end'))
+        # Open class-matched candidates; their subtrees are kept whole until they end
+        self.open_candidates = []
+        # Open elements that already contain an emitted candidate
+        self.containers = set()
+
+    def is_class_candidate(self, element) -> bool:
+        return (self.class_pattern is not None and element.tag in self.tag_names
+                and bool(self.class_pattern.search(element.get('class') or '')))
+
+    def is_candidate(self, element) -> bool:
+        if self.class_pattern is not None:
+            return self.is_class_candidate(element)
+        if self.string_pattern is not None and element.tag in self.tag_names:
+            string = _sole_string(element)
+            return string is not None and bool(self.string_pattern.search(string))
+        return False
+
+    def feed(self, text: str) -> List[str]:
+        """Parse another chunk; returns fragments for candidates that finished inside it"""
+        self.parser.feed(text)
+        return self._drain()
+
+    def close(self) -> List[str]:
+        self.parser.close()
+        return self._drain()
+
+    def _drain(self) -> List[str]:
+        fragments = []
+        for event, element in self.parser.read_events():
+            if event == 'start':
+                if self.is_class_candidate(element):
+                    self.open_candidates.append(element)
+                continue
+
+            if self.collect_links and element.tag == 'a' and element.get('href') is not None:
+                self.links.append((element.get('href'), "".join(s.strip() for s in element.itertext())))
+
+            if self.open_candidates and self.open_candidates[-1] is element:
+                self.open_candidates.pop()
+            contained_candidate = element in self.containers
+            self.containers.discard(element)
+
+            if not contained_candidate and self.is_candidate(element) and self._below_limit():
+                fragments.append(etree.tostring(element, encoding='unicode', method='html', with_tail=False))
+                self.emitted += 1
+                self._mark_ancestors(element)
+                self._prune(element, clear=True)
+            elif not self.open_candidates:
+                self._prune(element)
+        return fragments
+
+    def _below_limit(self) -> bool:
+        return self.max_candidates is None or self.emitted < self.max_candidates
+
+    def _mark_ancestors(self, element):
+        for ancestor in element.iterancestors():
+            self.containers.add(ancestor)
+
+    def _prune(self, element, clear: bool = False):
+        """Free an element's subtree (when emitted) and the finished siblings before it"""
+        parent = element.getparent()
+        if clear:
+            element.clear()
+            if parent is not None:
+                parent.set(PRUNED_MARK, "")
+        if parent is None or self.open_candidates:
+            return
+        if element.getprevious() is not None:
+            parent.set(PRUNED_MARK, "")
+            while element.getprevious() is not None:
+                del parent[0]